@@ -17,13 +17,19 @@ if BACKEND_DIR not in sys.path:
     sys.path.insert(0, BACKEND_DIR)
 
 # Now these imports should work:
-from app.database import Base
+from app.database import Base, SQLALCHEMY_DATABASE_URL
 from app import models  # noqa: F401  (needed so Alembic sees all tables)
 
+from app import search  # noqa: E402
+
 # This is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
 
+# Same env override the app uses (YB_DATABASE_URL), so migrations hit the same DB
+if os.getenv("YB_DATABASE_URL", "").strip():
+    config.set_main_option("sqlalchemy.url", SQLALCHEMY_DATABASE_URL)
+
 # Interpret the config file for Python logging.
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
@@ -32,12 +38,20 @@ if config.config_file_name is not None:
 target_metadata = Base.metadata
 
 
+def include_object(obj, name, type_, reflected, compare_to):
+    # FTS5 table + shadow tables are managed by app.search, not the models
+    if type_ == "table" and name and name.startswith(search.TABLE):
+        return False
+    return True
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode."""
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         compare_type=True,
         render_as_batch=True,  # helpful for SQLite
@@ -59,12 +73,15 @@ def run_migrations_online() -> None:
         context.configure(
             connection=connection,
             target_metadata=target_metadata,
+            include_object=include_object,
             compare_type=True,
             render_as_batch=True,  # helpful for SQLite
         )
 
         with context.begin_transaction():
             context.run_migrations()
+            # batch migrations recreate tables and lose their search triggers
+            search.restore_triggers(connection)
 
 
 if context.is_offline_mode():
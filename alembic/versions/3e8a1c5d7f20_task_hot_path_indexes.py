@@ -0,0 +1,45 @@
+"""composite indexes for hot task queries
+
+Revision ID: 3e8a1c5d7f20
+Revises: 87d8bfdee3b4
+Create Date: 2026-10-17 09:12:41.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3e8a1c5d7f20'
+down_revision: Union[str, Sequence[str], None] = '87d8bfdee3b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        # dashboard + personal task list
+        batch_op.create_index('ix_tasks_assignee_status_due', ['assigned_user_id', 'status', 'due_date'], unique=False)
+        batch_op.create_index('ix_tasks_assignee_created', ['assigned_user_id', 'created_at'], unique=False)
+        # client tasks tab, onboarding tab + release_onboarding_tasks_if_ready
+        batch_op.create_index('ix_tasks_client_type_status', ['client_id', 'task_type', 'status'], unique=False)
+        # run_recurring duplicate check (recurring_task_id, due_date)
+        batch_op.create_index('ix_tasks_recurring_due', ['recurring_task_id', 'due_date'], unique=False)
+
+    with op.batch_alter_table('task_client_links', schema=None) as batch_op:
+        batch_op.create_index('ix_task_client_links_client_id', ['client_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('task_client_links', schema=None) as batch_op:
+        batch_op.drop_index('ix_task_client_links_client_id')
+
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.drop_index('ix_tasks_recurring_due')
+        batch_op.drop_index('ix_tasks_client_type_status')
+        batch_op.drop_index('ix_tasks_assignee_created')
+        batch_op.drop_index('ix_tasks_assignee_status_due')
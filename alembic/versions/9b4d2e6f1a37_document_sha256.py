@@ -0,0 +1,34 @@
+"""document content hash + size
+
+Revision ID: 9b4d2e6f1a37
+Revises: 3e8a1c5d7f20
+Create Date: 2026-10-17 11:03:27.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b4d2e6f1a37'
+down_revision: Union[str, Sequence[str], None] = '3e8a1c5d7f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('documents', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('sha256', sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column('size_bytes', sa.Integer(), nullable=True))
+        batch_op.create_index('ix_documents_sha256', ['sha256'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('documents', schema=None) as batch_op:
+        batch_op.drop_index('ix_documents_sha256')
+        batch_op.drop_column('size_bytes')
+        batch_op.drop_column('sha256')
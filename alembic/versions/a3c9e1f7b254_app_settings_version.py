@@ -0,0 +1,38 @@
+"""app_settings.version; fold legacy docs_root into docs_root_path
+
+Revision ID: a3c9e1f7b254
+Revises: f1a4d6b8c305
+Create Date: 2026-10-17 19:05:12.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c9e1f7b254'
+down_revision: Union[str, Sequence[str], None] = 'f1a4d6b8c305'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('app_settings', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+
+    # The nightly backup used to read "docs_root" while the app used "docs_root_path".
+    # Keep the old value only where the app's own key was never set.
+    op.execute(
+        "UPDATE app_settings SET key = 'docs_root_path' "
+        "WHERE key = 'docs_root' "
+        "AND NOT EXISTS (SELECT 1 FROM app_settings WHERE key = 'docs_root_path')"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('app_settings', schema=None) as batch_op:
+        batch_op.drop_column('version')
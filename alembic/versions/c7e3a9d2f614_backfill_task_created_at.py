@@ -0,0 +1,38 @@
+"""backfill NULL tasks.created_at
+
+Revision ID: c7e3a9d2f614
+Revises: b6d2f8a4c913
+Create Date: 2026-10-17 23:05:10.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e3a9d2f614'
+down_revision: Union[str, Sequence[str], None] = 'b6d2f8a4c913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The task list keyset sorts on the raw created_at (so the
+    # (assigned_user_id, created_at) index serves the ORDER BY); a NULL there
+    # would fall out of cursor pages. Rows written through the ORM always get
+    # one; older hand-inserted ones fall back to updated_at / due_date.
+    op.execute(
+        sa.text(
+            "UPDATE tasks SET created_at = COALESCE(updated_at, due_date, '1970-01-01 00:00:00.000000') "
+            "WHERE created_at IS NULL"
+        )
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The backfilled values are indistinguishable from real ones; nothing to undo
+    pass
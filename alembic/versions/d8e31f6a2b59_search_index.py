@@ -0,0 +1,126 @@
+"""full-text search index (SQLite FTS5)
+
+Revision ID: d8e31f6a2b59
+Revises: c27f5a9e3d14
+Create Date: 2026-10-17 15:05:12.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8e31f6a2b59'
+down_revision: Union[str, Sequence[str], None] = 'c27f5a9e3d14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copy of app.search's DDL at the time of this migration (the live
+# module may change; this revision must keep producing the same schema).
+
+CREATE_TABLE = """
+CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+    title, body,
+    kind UNINDEXED, ref_id UNINDEXED, client_id UNINDEXED,
+    task_id UNINDEXED, owner_id UNINDEXED,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+)
+"""
+
+COLUMNS = "rowid, kind, ref_id, client_id, task_id, owner_id, title, body"
+
+# kind -> (source table, rowid code, indexed row as a SELECT list over {r},
+#          columns whose UPDATE reindexes the row)
+SOURCES = {
+    "client": (
+        "clients", 1,
+        "{r}.id * 8 + 1, 'client', {r}.id, {r}.id, NULL, NULL, "
+        "coalesce({r}.legal_name, ''), coalesce(coalesce({r}.dba_name, '') || ' ' || coalesce({r}.primary_contact, '') || ' ' || coalesce({r}.email, '') || ' ' || coalesce({r}.cpa, ''), '')",
+        "legal_name, dba_name, primary_contact, email, cpa",
+    ),
+    "contact": (
+        "contacts", 2,
+        "{r}.id * 8 + 2, 'contact', {r}.id, NULL, NULL, NULL, "
+        "coalesce({r}.name, ''), coalesce(coalesce({r}.email, '') || ' ' || coalesce({r}.phone, '') || ' ' || coalesce({r}.notes, ''), '')",
+        "name, email, phone, notes",
+    ),
+    "task": (
+        "tasks", 3,
+        "{r}.id * 8 + 3, 'task', {r}.id, {r}.client_id, {r}.id, {r}.assigned_user_id, "
+        "coalesce({r}.title, ''), coalesce({r}.description, '')",
+        "title, description, client_id, assigned_user_id",
+    ),
+    "task_note": (
+        "task_notes", 4,
+        "{r}.id * 8 + 4, 'task_note', {r}.id, NULL, {r}.task_id, {r}.author_id, "
+        "coalesce('', ''), coalesce({r}.body, '')",
+        "body, task_id",
+    ),
+    "client_note": (
+        "client_notes", 5,
+        "{r}.id * 8 + 5, 'client_note', {r}.id, {r}.client_id, NULL, {r}.created_by_id, "
+        "coalesce('', ''), coalesce({r}.body, '')",
+        "body, client_id",
+    ),
+    "manual_entry": (
+        "client_manual_entries", 6,
+        "{r}.id * 8 + 6, 'manual_entry', {r}.id, {r}.client_id, {r}.task_id, {r}.created_by_id, "
+        "coalesce({r}.title, ''), coalesce({r}.body, '')",
+        "title, body, client_id, task_id",
+    ),
+    "quick_note": (
+        "quick_notes", 7,
+        "{r}.id * 8 + 7, 'quick_note', {r}.id, {r}.client_id, NULL, {r}.created_by_id, "
+        "coalesce('', ''), coalesce({r}.body, '')",
+        "body, client_id",
+    ),
+}
+
+
+def _triggers(kind, table, code, row, watch):
+    new = row.format(r="NEW")
+    return [
+        f"""CREATE TRIGGER IF NOT EXISTS search_index_{kind}_ai AFTER INSERT ON {table} BEGIN
+            INSERT INTO search_index({COLUMNS}) VALUES ({new});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS search_index_{kind}_au AFTER UPDATE OF {watch} ON {table} BEGIN
+            DELETE FROM search_index WHERE rowid = OLD.id * 8 + {code};
+            INSERT INTO search_index({COLUMNS}) VALUES ({new});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS search_index_{kind}_ad AFTER DELETE ON {table} BEGIN
+            DELETE FROM search_index WHERE rowid = OLD.id * 8 + {code};
+        END""",
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != "sqlite":
+        # FTS5 is SQLite-only; /api/search reports itself unavailable elsewhere
+        return
+
+    bind.exec_driver_sql(CREATE_TABLE)
+    for kind, (table, code, row, watch) in SOURCES.items():
+        for stmt in _triggers(kind, table, code, row, watch):
+            bind.exec_driver_sql(stmt)
+
+    # index the rows that already exist
+    bind.exec_driver_sql("DELETE FROM search_index")
+    for kind, (table, code, row, watch) in SOURCES.items():
+        bind.exec_driver_sql(f"INSERT INTO search_index({COLUMNS}) SELECT {row.format(r=table)} FROM {table}")
+    bind.exec_driver_sql("INSERT INTO search_index(search_index) VALUES ('optimize')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != "sqlite":
+        return
+
+    for kind in SOURCES:
+        for suffix in ("ai", "au", "ad"):
+            bind.exec_driver_sql(f"DROP TRIGGER IF EXISTS search_index_{kind}_{suffix}")
+    bind.exec_driver_sql("DROP TABLE IF EXISTS search_index")
@@ -0,0 +1,58 @@
+"""normalized name keys for typeahead lookups
+
+Revision ID: e5b7c2d9a418
+Revises: d8e31f6a2b59
+Create Date: 2026-10-17 16:02:37.000000
+
+"""
+import re
+import unicodedata
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b7c2d9a418'
+down_revision: Union[str, Sequence[str], None] = 'd8e31f6a2b59'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# table -> column the key is derived from
+SOURCES = {"clients": "legal_name", "contacts": "name", "users": "name"}
+
+
+def _name_key(value):
+    # frozen copy of app.models.name_key at the time of this migration
+    if value is None:
+        return None
+    decomposed = unicodedata.normalize("NFKD", value)
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return re.sub(r"\s+", " ", stripped.casefold()).strip()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in SOURCES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('name_key', sa.String(), nullable=True))
+            batch_op.create_index(f'ix_{table}_name_key', ['name_key'], unique=False)
+
+    bind = op.get_bind()
+    for table, source in SOURCES.items():
+        t = sa.table(table, sa.column("id"), sa.column(source), sa.column("name_key"))
+        rows = bind.execute(sa.select(t.c.id, t.c[source])).all()
+        if rows:
+            bind.execute(
+                t.update().where(t.c.id == sa.bindparam("_id")),
+                [{"_id": rid, "name_key": _name_key(name)} for rid, name in rows],
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in reversed(list(SOURCES)):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_index(f'ix_{table}_name_key')
+            batch_op.drop_column('name_key')
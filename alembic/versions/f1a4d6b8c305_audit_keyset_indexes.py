@@ -0,0 +1,33 @@
+"""composite indexes for audit log filters
+
+Revision ID: f1a4d6b8c305
+Revises: e5b7c2d9a418
+Create Date: 2026-10-17 16:48:20.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1a4d6b8c305'
+down_revision: Union[str, Sequence[str], None] = 'e5b7c2d9a418'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('audit_events', schema=None) as batch_op:
+        # entity_type / actor filters walk these in (created_at, id) keyset order
+        batch_op.create_index('ix_audit_events_entity_created', ['entity_type', 'created_at'], unique=False)
+        batch_op.create_index('ix_audit_events_actor_created', ['actor_user_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('audit_events', schema=None) as batch_op:
+        batch_op.drop_index('ix_audit_events_actor_created')
+        batch_op.drop_index('ix_audit_events_entity_created')
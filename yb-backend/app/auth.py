@@ -1,12 +1,14 @@
 # app/auth.py
 import os
+import time
 from datetime import datetime, timedelta
-from typing import Optional
+from functools import lru_cache
+from typing import Optional, Tuple
 
 from fastapi import Depends, HTTPException, status, Request
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, lazyload
 
 from .database import get_db
 from . import models, schemas
@@ -52,7 +54,19 @@ def authenticate_user(db: Session, email: str, password: str) -> Optional[models
     return user
 
 
-async def get_current_user(
+@lru_cache(maxsize=1024)
+def _decode_token(token: str) -> Tuple[Optional[str], Optional[float]]:
+    """
+    Verify the signature once per distinct token and remember (sub, exp).
+    Expiry is checked by the caller on every request, so caching is safe.
+    """
+    payload = jwt.decode(
+        token, SECRET_KEY, algorithms=[ALGORITHM], options={"verify_exp": False}
+    )
+    return payload.get("sub"), payload.get("exp")
+
+
+def get_current_user(
     request: Request,
     db: Session = Depends(get_db),
 ) -> models.User:
@@ -82,14 +96,19 @@ async def get_current_user(
         raise credentials_exception
 
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
+        user_id, exp = _decode_token(token)
     except JWTError:
         raise credentials_exception
+    if user_id is None or (exp is not None and float(exp) <= time.time()):
+        raise credentials_exception
 
-    user = db.query(models.User).get(int(user_id))
+    # Only the user row: manager/direct_reports are loaded lazily if a handler needs them
+    user = (
+        db.query(models.User)
+        .options(lazyload("*"))
+        .filter(models.User.id == int(user_id))
+        .first()
+    )
     if not user or not user.is_active:
         raise credentials_exception
 
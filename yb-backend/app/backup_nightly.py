@@ -1,54 +1,372 @@
 # app/backup_nightly.py
+"""
+Nightly backup: consistent DB snapshot + content-addressed docs.
+
+Layout under YB_BACKUP_DIR:
+
+    blobs/ab/abcdef...gz          one gzip blob per unique file content (sha256)
+    snapshots/20260101_020000/
+        yb_app.db                 online-backup copy of the SQLite DB
+        manifest.json             docs path -> sha256/size/mtime (+ DB hash)
+
+Unchanged files (same size + mtime as last run) are not read at all. Other
+files are hashed first and only compressed when that content isn't stored
+yet, except fresh uploads (documents.sha256 names a blob we don't have),
+which are hashed while they are compressed in a single read.
+
+    python -m app.backup_nightly                 # take a snapshot, then prune
+    python -m app.backup_nightly --keep 30       # keep the newest 30 snapshots
+    python -m app.backup_nightly --verify        # check every manifest entry
+"""
 from __future__ import annotations
 
+import argparse
+import gzip
+import hashlib
+import json
 import os
 import shutil
-import tarfile
+import sqlite3
+import sys
+import tempfile
 from datetime import datetime
 from pathlib import Path
+from typing import Dict, Iterator, List, Optional
 
-from .database import DB_PATH, SessionLocal
 from . import models
+from .database import IS_SQLITE, engine
+from .settings import get_settings
+
+MANIFEST_NAME = "manifest.json"
+DB_SNAPSHOT_NAME = "yb_app.db"
+CHUNK_SIZE = 1024 * 1024
+
+# How many snapshots to keep (blobs only referenced by pruned snapshots go too)
+BACKUP_KEEP = int(os.getenv("YB_BACKUP_KEEP", "14"))
+BACKUP_COMPRESS_LEVEL = int(os.getenv("YB_BACKUP_COMPRESS_LEVEL", "6"))
+
+
+# ---------- layout helpers (shared with app.restore) ----------
+
+def backup_root() -> Path:
+    return Path(os.getenv("YB_BACKUP_DIR", str(Path.home() / "yb_backups"))).expanduser().resolve()
+
+
+def snapshots_dir(root: Path) -> Path:
+    return root / "snapshots"
+
+
+def blob_path(root: Path, sha256: str) -> Path:
+    return root / "blobs" / sha256[:2] / f"{sha256}.gz"
+
+
+def list_snapshots(root: Path) -> List[Path]:
+    """Completed snapshots, oldest first."""
+    d = snapshots_dir(root)
+    if not d.exists():
+        return []
+    return sorted(p for p in d.iterdir() if p.is_dir() and (p / MANIFEST_NAME).exists())
+
+
+def load_manifest(snapshot: Path) -> dict:
+    with (snapshot / MANIFEST_NAME).open("r", encoding="utf-8") as f:
+        return json.load(f)
+
 
-DEFAULT_DOCS_DIR = Path(os.getenv("YECNY_DOCS_ROOT", (Path(__file__).resolve().parents[2] / "docs"))).resolve()
+def sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
 
 
-def _get_docs_root() -> Path:
-    db = SessionLocal()
+# ---------- snapshot ----------
+
+def sqlite_db_path() -> Optional[Path]:
+    if not IS_SQLITE or not engine.url.database:
+        return None
+    return Path(engine.url.database).resolve()
+
+
+def snapshot_db(dest: Path) -> Optional[dict]:
+    """
+    Copy the live DB through SQLite's online backup API, which gives a
+    consistent image even while the API / recurring runner are writing.
+    """
+    src_path = sqlite_db_path()
+    if src_path is None:
+        print("[backup] non-SQLite database, skipping DB snapshot (use the server's dump tool)")
+        return None
+
+    src = sqlite3.connect(str(src_path))
+    dst = sqlite3.connect(str(dest))
     try:
-        setting = (
-            db.query(models.AppSetting)
-            .filter(models.AppSetting.key == "docs_root")
-            .first()
-        )
-        if setting and isinstance(setting.value, str) and setting.value.strip():
-            return Path(setting.value).expanduser().resolve()
-        return DEFAULT_DOCS_DIR
+        src.backup(dst)
     finally:
-        db.close()
+        dst.close()
+        src.close()
+    return {"file": dest.name, "sha256": sha256_file(dest), "size": dest.stat().st_size}
 
 
-def main():
-    backup_root = Path(os.getenv("YB_BACKUP_DIR", str(Path.home() / "yb_backups"))).expanduser().resolve()
-    backup_root.mkdir(parents=True, exist_ok=True)
+def _iter_docs(docs_root: Path) -> Iterator[Path]:
+    for dirpath, _dirnames, filenames in os.walk(docs_root):
+        for name in filenames:
+            # skip in-flight uploads (see storage.save_upload_stream)
+            if name.startswith(".upload-"):
+                continue
+            yield Path(dirpath) / name
+
+
+def _store_blob(
+    root: Path,
+    src: Path,
+    known_sha256: Optional[str] = None,
+    expected_sha256: Optional[str] = None,
+) -> tuple[str, bool]:
+    """
+    Store src as a gzip blob named by its content hash; returns (sha256, stored).
+
+    known_sha256 is trusted (an unchanged file); when its blob exists this is
+    free. expected_sha256 is only a hint (documents.sha256 from the upload):
+    when it names a blob we don't have yet, the content is new and the file
+    is read once, hashed while it is compressed. Otherwise the file is hashed
+    first and compressed only when that content isn't stored yet, so moved,
+    copied or touched files are never recompressed. The blob is always named
+    by the hash actually computed while writing it.
+    """
+    if known_sha256 and blob_path(root, known_sha256).exists():
+        return known_sha256, False
+
+    if not expected_sha256 or blob_path(root, expected_sha256).exists():
+        sha256 = sha256_file(src)
+        if blob_path(root, sha256).exists():
+            return sha256, False
+
+    blobs = root / "blobs"
+    blobs.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=".blob-", dir=blobs)
+    h = hashlib.sha256()
+    try:
+        with os.fdopen(fd, "wb") as raw, gzip.GzipFile(
+            fileobj=raw, mode="wb", compresslevel=BACKUP_COMPRESS_LEVEL, mtime=0
+        ) as gz, src.open("rb") as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                h.update(chunk)
+                gz.write(chunk)
+        sha256 = h.hexdigest()
+        dest = blob_path(root, sha256)
+        if dest.exists():
+            os.unlink(tmp)
+            return sha256, False
+        dest.parent.mkdir(exist_ok=True)
+        os.replace(tmp, dest)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return sha256, True
+
+
+def document_hashes(docs_root: Path) -> Dict[str, tuple]:
+    """docs path -> (sha256, size) recorded at upload, for rows that have one."""
+    table = models.Document.__table__
+    hashes: Dict[str, tuple] = {}
+    with engine.connect() as conn:
+        rows = conn.execute(
+            table.select()
+            .with_only_columns(table.c.stored_path, table.c.sha256, table.c.size_bytes)
+            .where(table.c.sha256.is_not(None))
+        )
+        for stored_path, sha256, size in rows:
+            p = Path(stored_path)
+            if p.is_absolute():
+                try:
+                    p = p.relative_to(docs_root)
+                except ValueError:
+                    continue
+            hashes[p.as_posix()] = (sha256, size)
+    return hashes
+
+
+def snapshot_docs(
+    root: Path,
+    docs_root: Path,
+    previous: Optional[dict],
+    uploads: Optional[Dict[str, tuple]] = None,
+) -> tuple[Dict[str, dict], dict]:
+    prev_files: Dict[str, dict] = (previous or {}).get("files", {})
+    uploads = uploads or {}
+    files: Dict[str, dict] = {}
+    stats = {"files": 0, "bytes": 0, "hashed": 0, "new_blobs": 0, "new_bytes": 0, "vanished": 0}
+
+    if not docs_root.exists():
+        print(f"[backup] docs root {docs_root} does not exist, skipping docs")
+        return files, stats
+
+    for path in _iter_docs(docs_root):
+        rel = path.relative_to(docs_root).as_posix()
+        try:
+            st = path.stat()
+            prev = prev_files.get(rel)
+            known = expected = None
+            if prev and prev["size"] == st.st_size and prev["mtime_ns"] == st.st_mtime_ns:
+                known = prev["sha256"]
+            else:
+                stats["hashed"] += 1
+                upload = uploads.get(rel)
+                if upload and upload[1] == st.st_size:
+                    expected = upload[0]
+
+            sha, stored = _store_blob(root, path, known, expected)
+        except FileNotFoundError:
+            # deleted (or renamed away) between the walk and now
+            stats["vanished"] += 1
+            continue
+        if stored:
+            stats["new_blobs"] += 1
+            stats["new_bytes"] += st.st_size
+
+        files[rel] = {"sha256": sha, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+        stats["files"] += 1
+        stats["bytes"] += st.st_size
+
+    return files, stats
+
+
+def take_snapshot(root: Path) -> Path:
+    root.mkdir(parents=True, exist_ok=True)
+    existing = list_snapshots(root)
+    previous = load_manifest(existing[-1]) if existing else None
 
     ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-    out_dir = backup_root / ts
-    out_dir.mkdir(parents=True, exist_ok=True)
-
-    # 1) DB copy
-    db_src = Path(DB_PATH)
-    db_dst = out_dir / "yb_app.db"
-    shutil.copy2(db_src, db_dst)
-
-    # 2) Docs archive
-    docs_root = _get_docs_root()
-    docs_tar = out_dir / "docs.tar.gz"
-    with tarfile.open(docs_tar, "w:gz") as tar:
-        tar.add(docs_root, arcname="docs")
-
-    print(f"[backup] wrote {db_dst}")
-    print(f"[backup] wrote {docs_tar}")
+    final = snapshots_dir(root) / ts
+    work = snapshots_dir(root) / f".{ts}.partial"
+    if work.exists():
+        shutil.rmtree(work)
+    work.mkdir(parents=True)
+
+    db_info = snapshot_db(work / DB_SNAPSHOT_NAME)
+
+    docs_root = get_settings().docs_root
+    files, stats = snapshot_docs(root, docs_root, previous, document_hashes(docs_root))
+
+    manifest = {
+        "version": 1,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "docs_root": str(docs_root),
+        "db": db_info,
+        "files": files,
+    }
+    with (work / MANIFEST_NAME).open("w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+
+    # A snapshot only becomes visible once it is complete
+    os.replace(work, final)
+
+    print(f"[backup] snapshot {final}")
+    print(
+        f"[backup] files={stats['files']} bytes={stats['bytes']} hashed={stats['hashed']} "
+        f"new_blobs={stats['new_blobs']} new_bytes={stats['new_bytes']} vanished={stats['vanished']}"
+    )
+    return final
+
+
+# ---------- retention ----------
+
+def prune(root: Path, keep: int) -> None:
+    snaps = list_snapshots(root)
+    doomed = snaps[:-keep] if keep > 0 else []
+    for snap in doomed:
+        shutil.rmtree(snap)
+        print(f"[backup] pruned snapshot {snap.name}")
+
+    # leftovers from interrupted runs
+    for partial in snapshots_dir(root).glob(".*.partial"):
+        shutil.rmtree(partial, ignore_errors=True)
+    for tmp in (root / "blobs").glob(".blob-*"):
+        tmp.unlink(missing_ok=True)
+
+    live = set()
+    for snap in list_snapshots(root):
+        live.update(entry["sha256"] for entry in load_manifest(snap)["files"].values())
+
+    removed = 0
+    blobs = root / "blobs"
+    if blobs.exists():
+        for blob in blobs.glob("*/*.gz"):
+            if blob.name[:-3] not in live:
+                blob.unlink()
+                removed += 1
+    if removed:
+        print(f"[backup] removed {removed} unreferenced blobs")
+
+
+# ---------- verify ----------
+
+def _gz_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with gzip.open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def verify(root: Path, snapshot_names: Optional[List[str]] = None) -> int:
+    """Re-hash every blob and DB copy referenced by the manifests. Returns #errors."""
+    snaps = list_snapshots(root)
+    if snapshot_names:
+        snaps = [s for s in snaps if s.name in snapshot_names]
+
+    errors = 0
+    checked: Dict[str, bool] = {}
+    for snap in snaps:
+        manifest = load_manifest(snap)
+
+        db_info = manifest.get("db")
+        if db_info:
+            db_file = snap / db_info["file"]
+            if not db_file.exists() or sha256_file(db_file) != db_info["sha256"]:
+                print(f"[verify] {snap.name}: DB snapshot missing or corrupt")
+                errors += 1
+
+        for rel, entry in manifest["files"].items():
+            sha = entry["sha256"]
+            if sha not in checked:
+                blob = blob_path(root, sha)
+                try:
+                    checked[sha] = blob.exists() and _gz_sha256(blob) == sha
+                except (OSError, EOFError):
+                    checked[sha] = False
+            if not checked[sha]:
+                print(f"[verify] {snap.name}: {rel} -> blob {sha[:12]} missing or corrupt")
+                errors += 1
+
+        print(f"[verify] {snap.name}: {len(manifest['files'])} files checked")
+
+    print(f"[verify] {len(snaps)} snapshots, {len(checked)} blobs, errors={errors}")
+    return errors
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Nightly DB + docs backup")
+    ap.add_argument("--verify", nargs="*", metavar="SNAPSHOT",
+                    help="verify all (or the named) snapshots instead of taking one")
+    ap.add_argument("--keep", type=int, default=BACKUP_KEEP,
+                    help=f"snapshots to keep (default {BACKUP_KEEP}, 0 = keep all)")
+    ap.add_argument("--no-prune", action="store_true")
+    args = ap.parse_args()
+
+    root = backup_root()
+
+    if args.verify is not None:
+        sys.exit(1 if verify(root, args.verify) else 0)
+
+    take_snapshot(root)
+    if not args.no_prune:
+        prune(root, args.keep)
 
 
 if __name__ == "__main__":
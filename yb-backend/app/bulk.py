@@ -0,0 +1,837 @@
+# app/bulk.py
+"""
+Bulk import / export of any table in models.py as CSV, NDJSON or Parquet.
+
+    python -m app.bulk list
+    python -m app.bulk export clients -o clients.csv
+    python -m app.bulk import contacts contacts.ndjson [--key name,email] [--dry-run]
+
+Admin endpoints live in routes_admin_bulk.py. Parquet needs pyarrow, which
+is optional (pip install pyarrow).
+
+Exports stream from a server-side cursor, so memory stays flat. A foreign
+key to a table with a one-column natural key (users.email, clients.legal_name)
+is also written as a readable column: client_id -> client, assigned_user_id
+-> assigned_user. On import those columns win over the raw ids, which is what
+makes a file portable between databases.
+
+Imports run in chunks: a few set-based lookups, then executemany inserts /
+updates, each chunk committed on its own. Rows are matched on the entity's
+natural key (a unique column, a composite primary key or KEYS below) and
+updated in place. Entities without one are insert-only unless key=id is
+asked for, i.e. restoring into the same database. users rows go through
+the same checks as the users API (role, email case, manager).
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import json
+import sys
+from datetime import date, datetime, timezone
+from itertools import groupby, islice
+from typing import IO, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import JSON, Table, UniqueConstraint, func, insert, or_, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from .database import Base, SessionLocal
+from . import models
+from .permissions import clear_principals
+from .routes_users import ALLOWED_ROLES
+
+FORMATS = ("csv", "ndjson", "parquet")
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+EXPORT_BATCH = 1000
+DEFAULT_CHUNK = 500
+
+# Natural keys the schema doesn't declare (no unique constraint on them)
+KEYS: Dict[str, Tuple[str, ...]] = {
+    "clients": ("legal_name",),
+    "contacts": ("name", "email"),
+    "accounts": ("client_id", "name"),
+}
+# Never exported, never imported
+SECRET_COLUMNS = {"users": {"hashed_password"}}
+# Maintained by the app (models.NAME_KEY_SOURCES)
+DERIVED_COLUMNS = {"name_key"}
+# Foreign keys the schema doesn't declare: (table, column) -> referenced table
+LOGICAL_FKS = {("tasks", "client_id"): "clients"}
+# The app must create these rows itself: audit trail, job queue, files on disk, purge workflow,
+# settings (written through app.settings so every worker's cache notices)
+EXPORT_ONLY = {"audit_events", "jobs", "documents", "client_purge_requests", "app_settings"}
+# Cross-process bookkeeping (app/coordination.py): not data, not listed at all
+INTERNAL = {"leases", "cache_generations", "rate_limit_hits"}
+# Writes to these columns change who can see which clients, so every worker's
+# cached principals (permissions.get_principal) must go. None = any column.
+ACCESS_COLUMNS: Dict[str, Optional[set]] = {
+    "client_user_access": None,
+    "clients": {"manager_id", "bookkeeper_id"},
+    "users": {"role", "is_active", "manager_id"},
+}
+
+_TRUE = {"1", "true", "t", "yes", "y"}
+_FALSE = {"0", "false", "f", "no", "n"}
+
+
+class BulkError(ValueError):
+    """Bad request (format, key, entity that can't be imported)."""
+
+
+class UnknownEntity(BulkError):
+    pass
+
+
+class MissingDependency(BulkError):
+    pass
+
+
+# ---------- registry ----------
+
+class Ref(NamedTuple):
+    column: str         # FK column, e.g. "client_id"
+    name: str           # readable column, e.g. "client"
+    table: str          # referenced table
+    target: str         # referenced column (the id)
+    key: str            # referenced natural-key column, e.g. "legal_name"
+
+
+class Entity(NamedTuple):
+    name: str
+    model: type
+    table: Table
+    columns: List[str]          # exported / importable table columns
+    key: Tuple[str, ...]        # natural key; () = insert-only
+    refs: List[Ref]
+    importable: bool
+
+    @property
+    def export_columns(self) -> List[str]:
+        return self.columns + [r.name for r in self.refs]
+
+    @property
+    def surrogate(self) -> Optional[str]:
+        """The auto-assigned id column, if the primary key is one."""
+        pk = list(self.table.primary_key.columns)
+        return pk[0].name if len(pk) == 1 else None
+
+
+def _natural_key(table: Table) -> Tuple[str, ...]:
+    if table.name in KEYS:
+        return KEYS[table.name]
+    for col in table.columns:
+        if col.unique and not col.primary_key:
+            return (col.name,)
+    for cons in table.constraints:
+        if isinstance(cons, UniqueConstraint) and cons.columns:
+            return tuple(c.name for c in cons.columns)
+    pk = [c.name for c in table.primary_key.columns]
+    return tuple(pk) if len(pk) > 1 else ()
+
+
+def _ref_name(column: str) -> str:
+    return column[:-3] if column.endswith("_id") else f"{column}_ref"
+
+
+def _build_entities() -> Dict[str, Entity]:
+    tables = {m.local_table.name: m for m in Base.registry.mappers if m.local_table.name not in INTERNAL}
+    out: Dict[str, Entity] = {}
+    for name in sorted(tables):
+        mapper = tables[name]
+        table = mapper.local_table
+        hidden = SECRET_COLUMNS.get(name, set()) | DERIVED_COLUMNS
+        columns = [c.name for c in table.columns if c.name not in hidden]
+        refs = []
+        for col in table.columns:
+            targets = [(fk.column.table, fk.column.name) for fk in col.foreign_keys]
+            if (name, col.name) in LOGICAL_FKS:
+                targets.append((tables[LOGICAL_FKS[name, col.name]].local_table, "id"))
+            for target, target_col in targets:
+                target_key = _natural_key(target)
+                if len(target_key) == 1 and target.name in tables:
+                    refs.append(Ref(col.name, _ref_name(col.name), target.name, target_col, target_key[0]))
+        assert not {r.name for r in refs} & set(columns), f"ref column clashes with a column in {name}"
+        out[name] = Entity(
+            name=name,
+            model=mapper.class_,
+            table=table,
+            columns=columns,
+            key=_natural_key(table),
+            refs=refs,
+            importable=name not in EXPORT_ONLY,
+        )
+    return out
+
+
+ENTITIES: Dict[str, Entity] = _build_entities()
+
+
+def get_entity(name: str) -> Entity:
+    try:
+        return ENTITIES[name]
+    except KeyError:
+        raise UnknownEntity(f"Unknown entity {name!r}") from None
+
+
+def format_for(filename: Optional[str], default: str = "csv") -> str:
+    ext = (filename or "").rsplit(".", 1)[-1].lower() if "." in (filename or "") else ""
+    ext = {"jsonl": "ndjson", "pq": "parquet"}.get(ext, ext)
+    return ext if ext in FORMATS else default
+
+
+def check_format(fmt: str) -> None:
+    if fmt not in FORMATS:
+        raise BulkError(f"Unknown format {fmt!r} (use one of {', '.join(FORMATS)})")
+    if fmt == "parquet":
+        _pyarrow()
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        raise MissingDependency("Parquet support needs pyarrow (pip install pyarrow)") from None
+    return pyarrow
+
+
+# ---------- values ----------
+
+def _python_type(column) -> type:
+    if isinstance(column.type, JSON):
+        return dict
+    try:
+        return column.type.python_type
+    except NotImplementedError:
+        return str
+
+
+def _naive_utc(dt: datetime) -> datetime:
+    if dt.tzinfo is not None:
+        return dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def _parse(column, value):
+    """One incoming cell -> the column's Python type. Raises ValueError."""
+    py = _python_type(column)
+    if py is dict:
+        return json.loads(value) if isinstance(value, str) else value
+    if not isinstance(value, str):
+        if py is datetime and isinstance(value, datetime):
+            return _naive_utc(value)
+        if py is date and isinstance(value, datetime):
+            return value.date()
+        if py is int and isinstance(value, float) and value.is_integer():
+            return int(value)
+        if py is str:
+            return str(value)
+        return value
+    if py is bool:
+        v = value.strip().lower()
+        if v in _TRUE:
+            return True
+        if v in _FALSE:
+            return False
+        raise ValueError(f"not a boolean: {value!r}")
+    if py is datetime:
+        return _naive_utc(datetime.fromisoformat(value.strip().replace("Z", "+00:00")))
+    if py is date:
+        return date.fromisoformat(value.strip()[:10])
+    if py in (int, float):
+        return py(value.strip())
+    return value
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def _cell(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(",", ":"))
+    return value
+
+
+# ---------- export ----------
+
+def _export_select(ent: Entity):
+    t = ent.table
+    stmt = select(*[t.c[n] for n in ent.columns]).select_from(t)
+    for ref in ent.refs:
+        target = ENTITIES[ref.table].table.alias(f"ref_{ref.name}")
+        stmt = stmt.add_columns(target.c[ref.key].label(ref.name)).outerjoin(
+            target, target.c[ref.target] == t.c[ref.column]
+        )
+    return stmt.order_by(*t.primary_key.columns)
+
+
+def export_batches(ent: Entity, batch_size: int = EXPORT_BATCH) -> Iterator[List[dict]]:
+    """
+    Every row (plus its ref columns) in primary-key order, `batch_size` at a
+    time off one server-side cursor. Uses its own session so a streamed HTTP
+    body can outlive the request's.
+    """
+    db = SessionLocal()
+    try:
+        result = db.execute(
+            _export_select(ent),
+            execution_options={"stream_results": True, "yield_per": batch_size},
+        )
+        for part in result.mappings().partitions():
+            yield [dict(r) for r in part]
+    finally:
+        db.close()
+
+
+def _write_ndjson(ent: Entity, batches: Iterable[List[dict]]) -> Iterator[bytes]:
+    for rows in batches:
+        yield "".join(
+            json.dumps(r, separators=(",", ":"), default=_json_default) + "\n" for r in rows
+        ).encode("utf-8")
+
+
+def _write_csv(ent: Entity, batches: Iterable[List[dict]]) -> Iterator[bytes]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    cols = ent.export_columns
+    writer.writerow(cols)
+    for rows in batches:
+        writer.writerows([_cell(r[c]) for c in cols] for r in rows)
+        yield buf.getvalue().encode("utf-8")
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue().encode("utf-8")
+
+
+class _Sink(io.RawIOBase):
+    """Write-only stream pyarrow can write into; drained after every row group."""
+
+    def __init__(self):
+        self._parts: List[bytes] = []
+        self._pos = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        data = bytes(b)
+        self._parts.append(data)
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def drain(self) -> bytes:
+        out = b"".join(self._parts)
+        self._parts.clear()
+        return out
+
+
+def _arrow_schema(pa, ent: Entity):
+    types = {
+        int: pa.int64(),
+        float: pa.float64(),
+        bool: pa.bool_(),
+        datetime: pa.timestamp("us"),
+        date: pa.date32(),
+    }
+    fields = [
+        pa.field(name, types.get(_python_type(ent.table.c[name]), pa.string()))
+        for name in ent.columns
+    ]
+    fields += [pa.field(r.name, pa.string()) for r in ent.refs]
+    return pa.schema(fields)
+
+
+def _write_parquet(ent: Entity, batches: Iterable[List[dict]]) -> Iterator[bytes]:
+    pa = _pyarrow()
+    import pyarrow.parquet as pq
+
+    schema = _arrow_schema(pa, ent)
+    # JSON columns go out as their text; Parquet has no "any" type
+    json_cols = [n for n in ent.columns if _python_type(ent.table.c[n]) is dict]
+    sink = _Sink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        for rows in batches:
+            for r in rows:
+                for c in json_cols:
+                    if r[c] is not None:
+                        r[c] = json.dumps(r[c], separators=(",", ":"))
+            writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+_WRITERS = {"csv": _write_csv, "ndjson": _write_ndjson, "parquet": _write_parquet}
+
+
+def export(entity: str, fmt: str, batch_size: int = EXPORT_BATCH) -> Iterator[bytes]:
+    """Validates up front, then returns the byte stream of the whole table."""
+    ent = get_entity(entity)
+    check_format(fmt)
+    return _WRITERS[fmt](ent, export_batches(ent, batch_size))
+
+
+# ---------- reading ----------
+
+def read_rows(f: IO[bytes], fmt: str) -> Iterator[Tuple[int, dict]]:
+    """(line / row number, raw row) pairs from a binary file."""
+    check_format(fmt)
+    if fmt == "csv":
+        text = io.TextIOWrapper(f, encoding="utf-8-sig", newline="")
+        reader = csv.DictReader(text)
+        try:
+            for row in reader:
+                yield reader.line_num, {k: v for k, v in row.items() if k is not None}
+        except UnicodeDecodeError:
+            raise BulkError(f"CSV is not UTF-8 (after line {reader.line_num})") from None
+    elif fmt == "ndjson":
+        for n, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            yield n, row if isinstance(row, dict) else {"__invalid__": line[:80].decode("utf-8", "replace")}
+    else:
+        pa = _pyarrow()
+        import pyarrow.parquet as pq
+
+        try:
+            pf = pq.ParquetFile(f)
+        except pa.ArrowException as e:
+            raise BulkError(f"Not a readable Parquet file: {e}") from None
+        n = 0
+        for batch in pf.iter_batches(batch_size=EXPORT_BATCH):
+            for row in batch.to_pylist():
+                n += 1
+                yield n, row
+
+
+# ---------- import ----------
+
+class ImportResult:
+    def __init__(self, entity: str, dry_run: bool):
+        self.entity = entity
+        self.dry_run = dry_run
+        self.created = 0
+        self.updated = 0
+        self.duplicates = 0         # rows superseded by a later row with the same key
+        self.ignored_columns: List[str] = []  # in the file but not in the table
+        self.errors: List[Tuple[int, str]] = []
+        self.access_changed = False  # wrote an ACCESS_COLUMNS column
+
+    def error(self, line: int, message: str) -> None:
+        self.errors.append((line, message))
+
+    def as_dict(self, max_errors: Optional[int] = None) -> dict:
+        errors = sorted(self.errors)
+        if max_errors is not None:
+            errors = errors[:max_errors]
+        return {
+            "entity": self.entity,
+            "dry_run": self.dry_run,
+            "created": self.created,
+            "updated": self.updated,
+            "duplicates": self.duplicates,
+            "failed": len(self.errors),
+            "ignored_columns": self.ignored_columns,
+            "errors": [{"line": line, "error": msg} for line, msg in errors],
+        }
+
+
+class _Row(NamedTuple):
+    line: int
+    values: dict
+
+
+def _note_ignored(ent: Entity, raw: dict, result: ImportResult) -> None:
+    known = set(ent.columns) | {r.name for r in ent.refs} | {"__invalid__"}
+    for name in raw:
+        if name not in known and name not in result.ignored_columns:
+            result.ignored_columns.append(name)
+
+
+def _coerce(ent: Entity, line: int, raw: dict, result: ImportResult) -> Optional[Tuple[_Row, dict]]:
+    """Typed column values + the ref values to resolve, or None (error recorded)."""
+    if "__invalid__" in raw:
+        result.error(line, f"not a JSON object: {raw['__invalid__']}")
+        return None
+    values = {}
+    for name in ent.columns:
+        if name not in raw:
+            continue
+        col = ent.table.c[name]
+        value = raw[name]
+        if value is None or value == "":
+            # blank: clears a nullable column, leaves a required one to its default
+            if col.nullable:
+                values[name] = None
+            continue
+        try:
+            values[name] = _parse(col, value)
+        except (TypeError, ValueError) as e:
+            result.error(line, f"{name}: {e}")
+            return None
+    refs = {r.name: str(raw[r.name]).strip() for r in ent.refs if raw.get(r.name) not in (None, "")}
+    return _Row(line, values), refs
+
+
+def _resolve_refs(db: Session, ent: Entity, rows: List[Tuple[_Row, dict]], result: ImportResult) -> List[_Row]:
+    """Ref columns -> ids (one query per ref), and raw FK ids checked to exist."""
+    ok = [True] * len(rows)
+    for ref in ent.refs:
+        target = ENTITIES[ref.table].table
+        wanted = {refs[ref.name] for _, refs in rows if ref.name in refs}
+        ids: Dict[str, int] = {}
+        if wanted:
+            stmt = (
+                select(target.c[ref.key], target.c[ref.target])
+                .where(target.c[ref.key].in_(wanted))
+                .order_by(target.c[ref.target])
+            )
+            for k, v in db.execute(stmt):
+                ids.setdefault(str(k), v)
+        raw_ids = {
+            row.values[ref.column] for row, refs in rows
+            if ref.name not in refs and row.values.get(ref.column) is not None
+        }
+        known = set()
+        if raw_ids:
+            known = set(db.scalars(select(target.c[ref.target]).where(target.c[ref.target].in_(raw_ids))))
+
+        for i, (row, refs) in enumerate(rows):
+            if ref.name in refs:
+                value = refs[ref.name]
+                if value in ids:
+                    row.values[ref.column] = ids[value]
+                elif ok[i]:
+                    result.error(row.line, f"{ref.name}: no {ref.table} row with {ref.key} {value!r}")
+                    ok[i] = False
+            elif row.values.get(ref.column) is not None and row.values[ref.column] not in known and ok[i]:
+                result.error(row.line, f"{ref.column}: no {ref.table} row with id {row.values[ref.column]}")
+                ok[i] = False
+    return [row for (row, _), good in zip(rows, ok) if good]
+
+
+def _existing(db: Session, ent: Entity, key: Tuple[str, ...], rows: List[_Row]) -> Dict[tuple, dict]:
+    """Natural key -> primary key values of the rows already in the table."""
+    t = ent.table
+    pk = [c.name for c in t.primary_key.columns]
+    first = t.c[key[0]]
+    values = {r.values.get(key[0]) for r in rows}
+    cond = [first.in_([v for v in values if v is not None])]
+    if None in values:
+        cond.append(first.is_(None))
+    cols = list(dict.fromkeys(pk + list(key)))
+    out: Dict[tuple, dict] = {}
+    for r in db.execute(select(*[t.c[c] for c in cols]).where(or_(*cond)).order_by(*t.primary_key.columns)).mappings():
+        out.setdefault(tuple(r[k] for k in key), {c: r[c] for c in pk})
+    return out
+
+
+_placeholder_hash: Optional[str] = None
+
+
+def _new_user_defaults(values: dict) -> None:
+    """Imported users get an unknown password; an admin sets a real one."""
+    global _placeholder_hash
+    if "hashed_password" not in values:
+        if _placeholder_hash is None:
+            import secrets
+            from .auth import get_password_hash
+            _placeholder_hash = get_password_hash(secrets.token_urlsafe(32))
+        values["hashed_password"] = _placeholder_hash
+
+
+def _normalize_user(row: _Row) -> None:
+    v = row.values
+    # like the users API, a blank role / is_active leaves the current value alone
+    for name in ("role", "is_active"):
+        if name in v and v[name] is None:
+            del v[name]
+    for name in ("email", "role"):
+        if isinstance(v.get(name), str):
+            v[name] = v[name].strip().lower()
+    if isinstance(v.get("name"), str):
+        v["name"] = v["name"].strip()
+
+
+def _check_users(
+    db: Session, inserts: List[_Row], updates: List[_Row], result: ImportResult, actor_id: Optional[int]
+) -> Tuple[List[_Row], List[_Row]]:
+    """The rules of PUT /api/users/{id} (routes_users.update_user), per row."""
+    U = models.User
+    current_roles: Dict[int, str] = {}
+    if actor_id is not None and any(r.values.get("id") == actor_id for r in updates):
+        current_roles[actor_id] = (db.get(U, actor_id).role or "").strip().lower()
+    wanted = {r.values["manager_id"] for r in inserts + updates if r.values.get("manager_id") is not None}
+    managers = set()
+    if wanted:
+        managers = set(db.scalars(select(U.id).where(U.id.in_(wanted), func.lower(U.role) == "manager")))
+
+    def problem(row: _Row, uid: Optional[int]) -> Optional[str]:
+        v = row.values
+        role = v.get("role")
+        if role is not None:
+            if role not in ALLOWED_ROLES:
+                return f"role: invalid {role!r} (allowed: {', '.join(sorted(ALLOWED_ROLES))})"
+            if uid is not None and uid == actor_id and role != current_roles.get(uid):
+                return "you cannot change your own role"
+            if role != "bookkeeper":
+                # only bookkeepers can be assigned a manager
+                v["manager_id"] = None
+        if uid is not None and uid == actor_id and v.get("is_active") is False:
+            return "you cannot deactivate your own account"
+        mid = v.get("manager_id")
+        if mid is not None:
+            if mid == uid:
+                return "manager_id: user cannot be their own manager"
+            if mid not in managers:
+                return f"manager_id: user {mid} is not a Manager"
+        return None
+
+    kept: Tuple[List[_Row], List[_Row]] = ([], [])
+    for rows, out, is_update in ((inserts, kept[0], False), (updates, kept[1], True)):
+        for row in rows:
+            msg = problem(row, row.values.get("id") if is_update else None)
+            if msg:
+                result.error(row.line, msg)
+            else:
+                out.append(row)
+    return kept
+
+
+def _execute(db: Session, ent: Entity, inserts: List[_Row], updates: List[_Row], result: ImportResult) -> None:
+    """executemany per column set; on a DB error, redo row by row to find the culprits."""
+    def by_shape(rows):
+        rows = sorted(rows, key=lambda r: sorted(r.values))
+        return [[r.values for r in grp] for _, grp in groupby(rows, key=lambda r: sorted(r.values))]
+
+    try:
+        with db.begin_nested():
+            for group in by_shape(inserts):
+                db.execute(insert(ent.model), group)
+            for group in by_shape(updates):
+                db.execute(update(ent.model), group)
+        result.created += len(inserts)
+        result.updated += len(updates)
+        return
+    except SQLAlchemyError:
+        pass
+
+    for rows, stmt, counter in ((inserts, insert(ent.model), "created"), (updates, update(ent.model), "updated")):
+        for row in rows:
+            try:
+                with db.begin_nested():
+                    db.execute(stmt, [row.values])
+                setattr(result, counter, getattr(result, counter) + 1)
+            except SQLAlchemyError as e:
+                result.error(row.line, str(getattr(e, "orig", e)).splitlines()[0])
+
+
+def _import_chunk(
+    db: Session,
+    ent: Entity,
+    key: Tuple[str, ...],
+    chunk: List[Tuple[int, dict]],
+    result: ImportResult,
+    actor_id: Optional[int] = None,
+) -> None:
+    for _, raw in chunk:
+        _note_ignored(ent, raw, result)
+    coerced = [c for c in (_coerce(ent, line, raw, result) for line, raw in chunk) if c is not None]
+    rows = _resolve_refs(db, ent, coerced, result)
+    if ent.name == "users":
+        for row in rows:
+            _normalize_user(row)
+    surrogate = ent.surrogate
+    name_source = dict((m.__tablename__, src) for m, src in models.NAME_KEY_SOURCES).get(ent.name)
+
+    inserts: List[_Row] = []
+    updates: List[_Row] = []
+    if key:
+        keyed: Dict[tuple, _Row] = {}
+        for row in rows:
+            if all(row.values.get(k) is None for k in key):
+                result.error(row.line, f"missing key ({', '.join(key)})")
+                continue
+            k = tuple(row.values.get(c) for c in key)
+            if k in keyed:
+                result.duplicates += 1
+            keyed[k] = row
+        existing = _existing(db, ent, key, list(keyed.values())) if keyed else {}
+        for k, row in keyed.items():
+            if k in existing:
+                row.values.update(existing[k])
+                updates.append(row)
+            else:
+                inserts.append(row)
+    else:
+        inserts = rows
+
+    if ent.name == "users":
+        inserts, updates = _check_users(db, inserts, updates, result, actor_id)
+
+    for row in inserts:
+        if surrogate and surrogate not in key:
+            row.values.pop(surrogate, None)
+        if ent.name == "users":
+            _new_user_defaults(row.values)
+    if name_source:
+        for row in inserts + updates:
+            if name_source in row.values:
+                row.values["name_key"] = models.name_key(row.values[name_source])
+
+    _execute(db, ent, inserts, updates, result)
+
+    if ent.name in ACCESS_COLUMNS:
+        watched = ACCESS_COLUMNS[ent.name]
+        if any(watched is None or watched & row.values.keys() for row in inserts + updates):
+            result.access_changed = True
+
+
+def import_rows(
+    db: Session,
+    entity: str,
+    rows: Iterable[Tuple[int, dict]],
+    *,
+    key: Optional[Sequence[str]] = None,
+    chunk_size: int = DEFAULT_CHUNK,
+    dry_run: bool = False,
+    actor_id: Optional[int] = None,
+) -> ImportResult:
+    """
+    Upsert (line, raw row) pairs into `entity`, committing every chunk (or
+    rolling it back with dry_run). `key` overrides the natural key; ["id"]
+    matches on ids, for restores into the database the file came from.
+    Cached access (permissions) is cleared after an import that changed it.
+    users rows get the same checks as the users API; `actor_id` (the admin
+    running the import) can't change their own role or deactivate themselves.
+    """
+    ent = get_entity(entity)
+    if not ent.importable:
+        raise BulkError(f"{entity} can be exported but not imported")
+    key = tuple(key) if key else ent.key
+    unknown = [k for k in key if k not in ent.columns]
+    if unknown:
+        raise BulkError(f"Unknown key column(s) for {entity}: {', '.join(unknown)}")
+
+    result = ImportResult(entity, dry_run)
+    it = iter(rows)
+    try:
+        while True:
+            chunk = list(islice(it, max(chunk_size, 1)))
+            if not chunk:
+                break
+            try:
+                _import_chunk(db, ent, key, chunk, result, actor_id)
+            except Exception:
+                db.rollback()
+                raise
+            if dry_run:
+                db.rollback()
+            else:
+                db.commit()
+    finally:
+        # also after a failure: earlier chunks are already committed
+        if result.access_changed and not dry_run:
+            clear_principals()
+    return result
+
+
+# ---------- CLI ----------
+
+def main():
+    ap = argparse.ArgumentParser(description="Bulk import / export of any table")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("list", help="entities with their natural keys and ref columns")
+
+    ep = sub.add_parser("export", help="write a whole table")
+    ep.add_argument("entity")
+    ep.add_argument("-o", "--output", default="-", help="file (default: stdout)")
+    ep.add_argument("--format", choices=FORMATS, default=None, help="default: from the file extension, else csv")
+
+    ip = sub.add_parser("import", help="upsert rows from a file")
+    ip.add_argument("entity")
+    ip.add_argument("path")
+    ip.add_argument("--format", choices=FORMATS, default=None, help="default: from the file extension")
+    ip.add_argument("--key", default=None, help="comma-separated match columns (default: the natural key)")
+    ip.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK)
+    ip.add_argument("--dry-run", action="store_true", help="run every chunk, then roll it back")
+    ip.add_argument("--errors", default=None, help="write failed rows (line, error) to this CSV")
+    args = ap.parse_args()
+
+    try:
+        if args.cmd == "list":
+            for ent in ENTITIES.values():
+                refs = ", ".join(f"{r.name}->{r.table}.{r.key}" for r in ent.refs)
+                flag = "" if ent.importable else "  (export only)"
+                print(f"{ent.name:<28} key=({', '.join(ent.key) or 'insert-only'}){flag}  {refs}")
+            return
+
+        if args.cmd == "export":
+            fmt = args.format or format_for(args.output)
+            out = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+            try:
+                for part in export(args.entity, fmt):
+                    out.write(part)
+            finally:
+                if out is not sys.stdout.buffer:
+                    out.close()
+            return
+
+        fmt = args.format or format_for(args.path)
+        key = [k.strip() for k in args.key.split(",") if k.strip()] if args.key else None
+        db = SessionLocal()
+        try:
+            with open(args.path, "rb") as f:
+                result = import_rows(
+                    db, args.entity, read_rows(f, fmt),
+                    key=key, chunk_size=args.chunk_size, dry_run=args.dry_run,
+                )
+        finally:
+            db.close()
+    except BulkError as e:
+        raise SystemExit(f"[bulk] {e}")
+
+    prefix = "[bulk] DRY RUN: would" if args.dry_run else "[bulk]"
+    print(f"{prefix} create={result.created} update={result.updated} "
+          f"duplicates={result.duplicates} failed={len(result.errors)}")
+    if result.ignored_columns:
+        print(f"[bulk] ignored columns not in {args.entity}: {', '.join(result.ignored_columns)}")
+    if result.errors and args.errors:
+        with open(args.errors, "w", newline="") as f:
+            w = csv.writer(f)
+            w.writerow(["line", "error"])
+            w.writerows(sorted(result.errors))
+        print(f"[bulk] row errors written to {args.errors}")
+    else:
+        for line, msg in sorted(result.errors)[:20]:
+            print(f"[bulk]   line {line}: {msg}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+# app/coordination.py
+"""
+State that has to be shared by every API worker (uvicorn --workers N) and
+every host, kept in the database so one process or many behave the same.
+
+Leases:       with hold_lease("run_recurring", ttl) as held: ...
+              at most one holder at a time; expired leases can be taken over.
+Generations:  bump_generation("principals") after a change; each process's
+              GenerationWatch notices within YB_SHARED_CHECK_SECONDS and drops
+              its cache.
+Rate limits:  RateLimit("login", limit, window) counts hits per key in fixed
+              windows; retry_after() says whether a key is over the limit.
+
+Writes use their own short session and commit right away, so they stick
+whatever the caller's transaction does.
+"""
+from __future__ import annotations
+
+import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Iterator, Optional
+
+from sqlalchemy import delete, or_, select
+from sqlalchemy.orm import Session
+
+from .database import SessionLocal, engine
+from . import models
+
+# How often a process re-reads a shared generation (seconds; 0 = every time)
+SHARED_CHECK_SECONDS = float(os.getenv("YB_SHARED_CHECK_SECONDS", "5"))
+
+
+def _insert(model):
+    """INSERT with on_conflict_do_update() for whichever backend we run on."""
+    if engine.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(model)
+
+
+def process_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+# ---------- leases ----------
+
+def acquire_lease(name: str, holder: str, ttl_seconds: int) -> bool:
+    """Take (or renew) the lease unless someone else holds an unexpired one."""
+    now = datetime.utcnow()
+    L = models.Lease
+    stmt = _insert(L).values(name=name, holder=holder, acquired_at=now, expires_at=now + timedelta(seconds=ttl_seconds))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[L.name],
+        set_={"holder": stmt.excluded.holder, "acquired_at": stmt.excluded.acquired_at,
+              "expires_at": stmt.excluded.expires_at},
+        where=or_(L.expires_at < now, L.holder == holder),
+    )
+    db = SessionLocal()
+    try:
+        db.execute(stmt)
+        db.commit()
+        return db.scalar(select(L.holder).where(L.name == name)) == holder
+    finally:
+        db.close()
+
+
+def release_lease(name: str, holder: str) -> None:
+    db = SessionLocal()
+    try:
+        db.execute(delete(models.Lease).where(models.Lease.name == name, models.Lease.holder == holder))
+        db.commit()
+    finally:
+        db.close()
+
+
+def lease_holder(name: str) -> Optional[str]:
+    db = SessionLocal()
+    try:
+        return db.scalar(
+            select(models.Lease.holder).where(
+                models.Lease.name == name, models.Lease.expires_at >= datetime.utcnow()
+            )
+        )
+    finally:
+        db.close()
+
+
+@contextmanager
+def hold_lease(name: str, ttl_seconds: int, holder: Optional[str] = None) -> Iterator[bool]:
+    """
+    Yields True while this process holds the lease, False if another does.
+    ttl_seconds must outlast the work: a crashed holder blocks others that long.
+    """
+    holder = holder or process_id()
+    held = acquire_lease(name, holder, ttl_seconds)
+    try:
+        yield held
+    finally:
+        if held:
+            release_lease(name, holder)
+
+
+# ---------- generations ----------
+
+def bump_generation(name: str) -> None:
+    CG = models.CacheGeneration
+    stmt = _insert(CG).values(name=name, generation=1)
+    stmt = stmt.on_conflict_do_update(index_elements=[CG.name], set_={"generation": CG.generation + 1})
+    db = SessionLocal()
+    try:
+        db.execute(stmt)
+        db.commit()
+    finally:
+        db.close()
+
+
+class GenerationWatch:
+    """This process's last-seen value of a shared generation, re-read at most every `every` seconds."""
+
+    def __init__(self, name: str, every: float = SHARED_CHECK_SECONDS):
+        self.name = name
+        self.every = every
+        self._seen: Optional[int] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def changed(self, db: Session) -> bool:
+        """True once per change made since the previous check (by any process)."""
+        now = time.monotonic()
+        with self._lock:
+            if self._seen is not None and now - self._checked_at < self.every:
+                return False
+            self._checked_at = now
+        current = db.scalar(
+            select(models.CacheGeneration.generation).where(models.CacheGeneration.name == self.name)
+        ) or 0
+        with self._lock:
+            moved = self._seen is not None and current != self._seen
+            self._seen = current
+        return moved
+
+
+# ---------- rate limits ----------
+
+class RateLimit:
+    """Fixed-window counter: at most `limit` hits per key per `window_seconds`."""
+
+    def __init__(self, name: str, limit: int, window_seconds: int):
+        self.name = name
+        self.limit = limit
+        self.window = max(1, window_seconds)
+
+    def _window(self) -> int:
+        now = int(time.time())
+        return now - now % self.window
+
+    def _key(self, key: str) -> str:
+        return f"{self.name}:{key}"
+
+    def retry_after(self, *keys: str) -> int:
+        """Seconds until every key is below the limit again (0 = go ahead). One read."""
+        if self.limit <= 0 or not keys:
+            return 0
+        start = self._window()
+        R = models.RateLimitHit
+        db = SessionLocal()
+        try:
+            worst = db.scalar(
+                select(R.hits).where(R.key.in_([self._key(k) for k in keys]), R.window_start == start)
+                .order_by(R.hits.desc()).limit(1)
+            )
+        finally:
+            db.close()
+        if worst is None or worst < self.limit:
+            return 0
+        return max(1, start + self.window - int(time.time()))
+
+    def hit(self, *keys: str) -> None:
+        """Count one hit against each key (and sweep out finished windows)."""
+        if self.limit <= 0 or not keys:
+            return
+        keys = tuple(dict.fromkeys(keys))  # one row per key per statement
+        start = self._window()
+        expires = datetime.utcfromtimestamp(start + self.window)
+        R = models.RateLimitHit
+        stmt = _insert(R).values([
+            {"key": self._key(k), "window_start": start, "hits": 1, "expires_at": expires} for k in keys
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[R.key, R.window_start], set_={"hits": R.hits + 1}
+        )
+        db = SessionLocal()
+        try:
+            db.execute(stmt)
+            db.execute(delete(R).where(R.expires_at < datetime.utcnow()))
+            db.commit()
+        finally:
+            db.close()
@@ -1,110 +1,154 @@
 # app/import_accounts.py
+"""
+Import accounts from the "YB Database - Accounts.csv" style export.
+
+    python -m app.import_accounts "YB Database - Accounts.csv" [--dry-run]
+
+Clients are matched in memory by legal name, then DBA name, then (only when
+it is unambiguous) a case-insensitive partial legal name. Accounts a client
+already has are skipped, so re-running the same file adds nothing. Rows that
+could not be imported are written to <csv>.errors.csv.
+"""
 from __future__ import annotations
 
 import argparse
-import re
-from typing import Optional
+from pathlib import Path
+from typing import Dict
 
+import numpy as np
 import pandas as pd
+from sqlalchemy import insert
 
 from .database import SessionLocal
 from . import models
-
-
-def _read_csv(path: str) -> pd.DataFrame:
-    try:
-        return pd.read_csv(path, header=1)
-    except Exception:
-        return pd.read_csv(path, header=0)
-
-
-def _norm(s: Optional[str]) -> str:
-    return (str(s).strip() if s is not None and str(s) != "nan" else "").strip()
-
-
-def _guess_type(name: str) -> Optional[str]:
-    n = name.lower()
-    if "checking" in n:
-        return "checking"
-    if "savings" in n:
-        return "savings"
-    if "credit" in n or " cc" in n or "card" in n or "amex" in n or "visa" in n:
-        return "credit_card"
-    if "loan" in n:
-        return "loan"
-    return None
-
-
-def _last4(name: str) -> Optional[str]:
-    m = re.findall(r"(\d{4})", name)
-    return m[-1] if m else None
-
-
-def _find_client(db, label: str) -> Optional[models.Client]:
-    label = _norm(label)
-    if not label:
-        return None
-    exact = db.query(models.Client).filter(models.Client.legal_name == label).first()
-    if exact:
-        return exact
-    exact2 = db.query(models.Client).filter(models.Client.dba_name == label).first()
-    if exact2:
-        return exact2
-    # fallback: partial match
-    like = db.query(models.Client).filter(models.Client.legal_name.ilike(f"%{label}%")).first()
-    return like
+from .import_utils import (
+    DEFAULT_CHUNK,
+    RowErrors,
+    Timings,
+    chunks,
+    default_errors_path,
+    read_export,
+    records,
+)
+
+COLUMNS = ["Client", "Account"]
+
+
+def _guess_type(names: pd.Series) -> pd.Series:
+    n = names.str.lower()
+    return pd.Series(
+        np.select(
+            [
+                n.str.contains("checking", regex=False),
+                n.str.contains("savings", regex=False),
+                n.str.contains(r"credit| cc|card|amex|visa"),
+                n.str.contains("loan", regex=False),
+            ],
+            ["checking", "savings", "credit_card", "loan"],
+            default=None,
+        ),
+        index=names.index,
+    )
+
+
+def _last4(names: pd.Series) -> pd.Series:
+    # last run of four digits in the name ("Amex 1001 9999" -> "9999")
+    return names.str.findall(r"\d{4}").str[-1]
+
+
+def _match_clients(labels: pd.Series, db) -> pd.DataFrame:
+    """
+    client_id per row (nullable Int64) plus `ambiguous` for partial labels that
+    fit more than one client.
+    """
+    rows = db.query(models.Client.id, models.Client.legal_name, models.Client.dba_name).order_by(models.Client.id).all()
+    clients = pd.DataFrame(rows, columns=["id", "legal_name", "dba_name"])
+    by_legal = clients.drop_duplicates("legal_name").set_index("legal_name")["id"]
+    by_dba = clients.dropna(subset=["dba_name"]).drop_duplicates("dba_name").set_index("dba_name")["id"]
+
+    ids = labels.map(by_legal).fillna(labels.map(by_dba))
+
+    # partial matches are only tried once per distinct leftover label
+    legal_lower = list(zip(clients["id"], clients["legal_name"].str.lower()))
+    partial: Dict[str, int] = {}
+    ambiguous = set()
+    for label in labels[ids.isna() & (labels != "")].unique():
+        needle = label.lower()
+        hits = [cid for cid, legal in legal_lower if needle in legal]
+        if len(hits) == 1:
+            partial[label] = hits[0]
+        elif len(hits) > 1:
+            ambiguous.add(label)
+    ids = ids.fillna(labels.map(partial))
+
+    return pd.DataFrame({"client_id": ids.astype("Int64"), "ambiguous": labels.isin(ambiguous)})
 
 
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("csv_path", help="Path to 'YB Database - Accounts.csv' export")
-    ap.add_argument("--dry-run", action="store_true")
+    ap.add_argument("--dry-run", action="store_true", help="report what would change, write nothing")
+    ap.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK, help="rows per insert batch")
+    ap.add_argument("--errors", default=None, help="error file (default: <csv>.errors.csv)")
     args = ap.parse_args()
 
-    df = _read_csv(args.csv_path).fillna("")
-    db = SessionLocal()
-    created = 0
-    skipped = 0
+    timings = Timings()
+    with timings.phase("read"):
+        df = read_export(args.csv_path, COLUMNS, expect="Client")
+    errors = RowErrors(df)
 
+    db = SessionLocal()
     try:
-        for _, row in df.iterrows():
-            client_label = _norm(row.get("Client", ""))
-            acct_name = _norm(row.get("Account", ""))
-            if not client_label or not acct_name:
-                continue
-
-            client = _find_client(db, client_label)
-            if not client:
-                skipped += 1
-                continue
-
-            existing = (
-                db.query(models.Account)
-                .filter(models.Account.client_id == client.id, models.Account.name == acct_name)
-                .first()
-            )
-            if existing:
-                continue
-
-            account = models.Account(
-                client_id=client.id,
-                name=acct_name,
-                type=_guess_type(acct_name),
-                last4=_last4(acct_name),
-                is_active=True,
-            )
-            db.add(account)
-            created += 1
-
-        if args.dry_run:
-            db.rollback()
-            print(f"[import_accounts] DRY RUN: would create={created} skipped_clients={skipped}")
-        else:
-            db.commit()
-            print(f"[import_accounts] created={created} skipped_clients={skipped}")
+        with timings.phase("preload"):
+            matched = _match_clients(df["Client"], db)
+            have = set(db.query(models.Account.client_id, models.Account.name).all())
+
+        with timings.phase("match"):
+            label, name = df["Client"], df["Account"]
+            incomplete = (label == "") | (name == "")
+            errors.add(incomplete & ((label != "") | (name != "")), "skipped: needs both Client and Account")
+
+            client_id = matched["client_id"]
+            ambiguous = matched["ambiguous"] & ~incomplete
+            errors.add(ambiguous, "skipped: '" + label + "' matches more than one client")
+            unknown = client_id.isna() & ~ambiguous & ~incomplete
+            errors.add(unknown, "skipped: no client matches '" + label + "'")
+
+            ok = ~incomplete & client_id.notna()
+            pairs = pd.MultiIndex.from_arrays([client_id.fillna(0).astype(int), name])
+            existing = ok & pairs.isin(have)
+            repeated = ok & ~existing & pairs.duplicated()
+            errors.add(repeated, "skipped: same account listed again for this client")
+
+            todo = ok & ~existing & ~repeated
+            accounts = pd.DataFrame({
+                "client_id": client_id[todo],
+                "name": name[todo],
+                "type": _guess_type(name[todo]),
+                "last4": _last4(name[todo]),
+                "is_active": True,
+            })
+
+        with timings.phase("write"):
+            if not args.dry_run:
+                for batch in chunks(records(accounts), args.chunk_size):
+                    db.execute(insert(models.Account), batch)
+                    db.commit()
+
+        errors_path = Path(args.errors) if args.errors else default_errors_path(args.csv_path)
+        n_errors = errors.write(errors_path)
     finally:
         db.close()
 
+    prefix = "[import_accounts] DRY RUN: would" if args.dry_run else "[import_accounts]"
+    print(
+        f"{prefix} create={len(accounts)} existing={int(existing.sum())} "
+        f"skipped_clients={int((unknown | ambiguous).sum())} errors={n_errors}"
+    )
+    if n_errors:
+        print(f"[import_accounts] row errors written to {errors_path}")
+    print(f"[import_accounts] {timings.report(len(df))}")
+
 
 if __name__ == "__main__":
     main()
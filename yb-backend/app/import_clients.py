@@ -1,116 +1,229 @@
 # app/import_clients.py
+"""
+Import / refresh clients from the "YB Database - Clients.csv" style export.
+
+    python -m app.import_clients "YB Database - Clients.csv" [--dry-run] [--only-new]
+
+Users and existing clients are loaded once and matched in memory; writes go
+out in chunks, each committed on its own. Re-running the same file is safe:
+unchanged clients are left alone and identical import notes aren't added
+twice. Rows that could not be imported (or were imported with a caveat) are
+written to <csv>.errors.csv.
+"""
 from __future__ import annotations
 
 import argparse
-from typing import Optional
+from pathlib import Path
+from typing import Dict, Tuple
 
 import pandas as pd
+from sqlalchemy import insert, update
 
 from .database import SessionLocal
 from . import models
-
-
-def _read_csv(path: str) -> pd.DataFrame:
-    # Your exports have an extra first row of numbers; header=1 handles that.
-    try:
-        return pd.read_csv(path, header=1)
-    except Exception:
-        return pd.read_csv(path, header=0)
-
-
-def _norm(s: Optional[str]) -> str:
-    return (str(s).strip() if s is not None and str(s) != "nan" else "").strip()
-
-
-def _find_user_id(db, value: str) -> Optional[int]:
-    v = _norm(value)
-    if not v:
-        return None
-
-    if "@" in v:
-        u = db.query(models.User).filter(models.User.email.ilike(v)).first()
-        return u.id if u else None
-
-    u = db.query(models.User).filter(models.User.name.ilike(v)).first()
-    return u.id if u else None
-
+from .import_utils import (
+    DEFAULT_CHUNK,
+    RowErrors,
+    Timings,
+    chunks,
+    default_errors_path,
+    nullable,
+    read_export,
+    records,
+)
+
+EXTRA_FIELDS = ["Bank Feeds", "Payroll", "Locations", "Prepare 1099s", "Drive Link", "EIN"]
+COLUMNS = [
+    "Client", "Legal Name", "Tier", "Billing Frequency", "Primary Contact",
+    "Primary Email", "Primary Phone", "CPA", "Manager", *EXTRA_FIELDS,
+]
+# Client columns the import owns; everything else is left as the app has it
+FIELDS = [
+    "legal_name", "dba_name", "tier", "billing_frequency", "bookkeeping_frequency",
+    "primary_contact", "email", "phone", "cpa", "manager_id",
+]
+NOTE_HEADER = "Imported client details:\n"
+
+
+# ---------- lookups ----------
+
+def _user_maps(db) -> Tuple[Dict[str, int], Dict[str, int]]:
+    """email (lowercased) -> id and name_key -> id; the lowest id wins a tie."""
+    by_email: Dict[str, int] = {}
+    by_name: Dict[str, int] = {}
+    for uid, email, key in (
+        db.query(models.User.id, models.User.email, models.User.name_key).order_by(models.User.id)
+    ):
+        if email:
+            by_email.setdefault(email.lower(), uid)
+        if key:
+            by_name.setdefault(key, uid)
+    return by_email, by_name
+
+
+def _resolve_users(values: pd.Series, by_email: Dict[str, int], by_name: Dict[str, int]) -> pd.Series:
+    """Email or display name -> user id (nullable Int64), case/accent-insensitive."""
+    keys = {v: models.name_key(v) for v in values.unique()}
+    by_mail = values.str.lower().map(by_email)
+    by_key = values.map(keys).map(by_name)
+    ids = by_mail.where(values.str.contains("@", regex=False), by_key)
+    return ids.astype("Int64")
+
+
+def _existing_clients(db) -> pd.DataFrame:
+    """Current clients keyed by legal_name (the lowest id wins a duplicate name)."""
+    cols = [models.Client.id] + [getattr(models.Client, f) for f in FIELDS]
+    rows = db.query(*cols).order_by(models.Client.id).all()
+    cur = pd.DataFrame(rows, columns=["id", *FIELDS])
+    cur["manager_id"] = cur["manager_id"].astype("Int64")
+    return cur.drop_duplicates("legal_name").set_index("legal_name", drop=False)
+
+
+def _note_bodies(df: pd.DataFrame) -> pd.Series:
+    """The "Imported client details" note per row ("" when there's nothing to say)."""
+    body = pd.Series("", index=df.index)
+    for field in EXTRA_FIELDS:
+        val = df[field]
+        body = body + ("\n- " + field + ": " + val).where(val != "", "")
+    return (NOTE_HEADER.rstrip("\n") + body).where(body != "", "")
+
+
+def _comparable(frame: pd.DataFrame) -> pd.DataFrame:
+    return frame.astype(object).where(frame.notna(), "").astype(str)
+
+
+# ---------- main ----------
 
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("csv_path", help="Path to 'YB Database - Clients.csv' export")
-    ap.add_argument("--dry-run", action="store_true")
+    ap.add_argument("--dry-run", action="store_true", help="report what would change, write nothing")
+    ap.add_argument("--only-new", action="store_true",
+                    help="create missing clients only; leave existing ones (and their notes) untouched")
     ap.add_argument("--created-by-email", default=None, help="Optional: who to attribute notes to")
+    ap.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK, help="rows per insert/update batch")
+    ap.add_argument("--errors", default=None, help="error file (default: <csv>.errors.csv)")
     args = ap.parse_args()
 
-    df = _read_csv(args.csv_path).fillna("")
+    timings = Timings()
+    with timings.phase("read"):
+        df = read_export(args.csv_path, COLUMNS, expect="Client")
+    errors = RowErrors(df)
 
     db = SessionLocal()
-    created = 0
-    updated = 0
-    notes = 0
-
-    created_by_id = _find_user_id(db, args.created_by_email) if args.created_by_email else None
-
     try:
-        for _, row in df.iterrows():
-            client_label = _norm(row.get("Client", ""))
-            legal_name = _norm(row.get("Legal Name", "")) or client_label
-            if not legal_name:
-                continue
-
-            existing = db.query(models.Client).filter(models.Client.legal_name == legal_name).first()
-            tier = _norm(row.get("Tier", "")) or None
-            billing_freq = _norm(row.get("Billing Frequency", "")) or None
-
-            payload = {
-                "legal_name": legal_name,
-                "dba_name": client_label if client_label and client_label != legal_name else None,
-                "tier": tier,
-                "billing_frequency": billing_freq,
-                "bookkeeping_frequency": billing_freq,
-                "primary_contact": _norm(row.get("Primary Contact", "")) or None,
-                "email": _norm(row.get("Primary Email", "")) or None,
-                "phone": _norm(row.get("Primary Phone", "")) or None,
-                "cpa": _norm(row.get("CPA", "")) or None,
-                "manager_id": _find_user_id(db, row.get("Manager", "")),
-            }
-
-            if existing:
-                for k, v in payload.items():
-                    setattr(existing, k, v)
-                updated += 1
-                client = existing
+        with timings.phase("preload"):
+            by_email, by_name = _user_maps(db)
+            current = _existing_clients(db)
+            existing_notes = set(
+                db.query(models.ClientNote.client_id, models.ClientNote.body)
+                .filter(models.ClientNote.body.startswith(NOTE_HEADER.rstrip("\n")))
+                .all()
+            )
+
+        created_by_id = None
+        if args.created_by_email:
+            created_by_id = _resolve_users(pd.Series([args.created_by_email]), by_email, by_name).iloc[0]
+            if pd.isna(created_by_id):
+                raise SystemExit(f"[import_clients] no user matches {args.created_by_email!r}")
+            created_by_id = int(created_by_id)
+
+        with timings.phase("match"):
+            label = df["Client"]
+            legal = df["Legal Name"].where(df["Legal Name"] != "", label)
+            data_cols = [c for c in df.columns if c in COLUMNS]
+            blank = legal == ""
+            errors.add(blank & (df[data_cols] != "").any(axis=1), "skipped: no Client / Legal Name")
+
+            billing = nullable(df["Billing Frequency"])
+            payload = pd.DataFrame({
+                "legal_name": legal,
+                "dba_name": label.where((label != "") & (label != legal)),
+                "tier": nullable(df["Tier"]),
+                "billing_frequency": billing,
+                "bookkeeping_frequency": billing,
+                "primary_contact": nullable(df["Primary Contact"]),
+                "email": nullable(df["Primary Email"]),
+                "phone": nullable(df["Primary Phone"]),
+                "cpa": nullable(df["CPA"]),
+                "manager_id": _resolve_users(df["Manager"], by_email, by_name),
+            })
+            unknown_mgr = (df["Manager"] != "") & payload["manager_id"].isna() & ~blank
+            errors.add(unknown_mgr, "imported without a manager: no user matches '" + df["Manager"] + "'")
+
+            # the same client twice in one file: the last row wins (as a re-import would)
+            dup = payload["legal_name"].duplicated(keep="last") & ~blank
+            errors.add(dup, "skipped: Legal Name appears again further down")
+
+            payload["note"] = _note_bodies(df)
+            payload = payload[~blank & ~dup]
+            payload["id"] = payload["legal_name"].map(current["id"]).astype("Int64")
+
+            new = payload[payload["id"].isna()]
+            old = payload[payload["id"].notna()]
+            if args.only_new:
+                skipped, old = len(old), old.iloc[0:0]
             else:
-                client = models.Client(**payload)
-                db.add(client)
-                db.flush()
-                created += 1
-
-            # Optional: capture extra operational info into a client note
-            extra_fields = {
-                "Bank Feeds": _norm(row.get("Bank Feeds", "")),
-                "Payroll": _norm(row.get("Payroll", "")),
-                "Locations": _norm(row.get("Locations", "")),
-                "Prepare 1099s": _norm(row.get("Prepare 1099s", "")),
-                "Drive Link": _norm(row.get("Drive Link", "")),
-                "EIN": _norm(row.get("EIN", "")),
-            }
-            extra_fields = {k: v for k, v in extra_fields.items() if v}
-
-            if extra_fields:
-                body = "Imported client details:\n" + "\n".join([f"- {k}: {v}" for k, v in extra_fields.items()])
-                db.add(models.ClientNote(client_id=client.id, created_by_id=created_by_id, body=body, pinned=False))
-                notes += 1
-
-        if args.dry_run:
-            db.rollback()
-            print(f"[import_clients] DRY RUN: would create={created} update={updated} notes={notes}")
-        else:
-            db.commit()
-            print(f"[import_clients] created={created} updated={updated} notes={notes}")
+                skipped = 0
+                before = _comparable(current.loc[old["legal_name"], FIELDS].set_index(old.index))
+                changed = (_comparable(old[FIELDS]) != before).any(axis=1)
+                note_pairs = pd.MultiIndex.from_arrays([old["id"].astype(int), old["note"]])
+                note_new = (old["note"] != "") & ~note_pairs.isin(existing_notes)
+                old = old.assign(changed=changed, note_new=note_new)
+
+        n_created = len(new)
+        n_updated = int(old["changed"].sum()) if len(old) else 0
+        n_unchanged = len(old) - n_updated
+        n_notes = int((new["note"] != "").sum()) + (int(old["note_new"].sum()) if len(old) else 0)
+
+        with timings.phase("write"):
+            if not args.dry_run:
+                for batch in chunks(records(new), args.chunk_size):
+                    rows = [{f: r[f] for f in FIELDS} for r in batch]
+                    for r in rows:
+                        r["name_key"] = models.name_key(r["legal_name"])
+                    ids = db.scalars(
+                        insert(models.Client).returning(models.Client.id, sort_by_parameter_order=True),
+                        rows,
+                    ).all()
+                    notes = [
+                        {"client_id": cid, "created_by_id": created_by_id, "body": r["note"], "pinned": False}
+                        for cid, r in zip(ids, batch)
+                        if r["note"]
+                    ]
+                    if notes:
+                        db.execute(insert(models.ClientNote), notes)
+                    db.commit()
+
+                if len(old):
+                    todo = old[old["changed"] | old["note_new"]]
+                    for batch in chunks(records(todo), args.chunk_size):
+                        rows = [{"id": r["id"], **{f: r[f] for f in FIELDS}} for r in batch if r["changed"]]
+                        if rows:
+                            db.execute(update(models.Client), rows)
+                        notes = [
+                            {"client_id": r["id"], "created_by_id": created_by_id, "body": r["note"], "pinned": False}
+                            for r in batch
+                            if r["note_new"]
+                        ]
+                        if notes:
+                            db.execute(insert(models.ClientNote), notes)
+                        db.commit()
+
+        errors_path = Path(args.errors) if args.errors else default_errors_path(args.csv_path)
+        n_errors = errors.write(errors_path)
     finally:
         db.close()
 
+    prefix = "[import_clients] DRY RUN: would" if args.dry_run else "[import_clients]"
+    print(
+        f"{prefix} create={n_created} update={n_updated} unchanged={n_unchanged} "
+        f"skipped_existing={skipped} notes={n_notes} errors={n_errors}"
+    )
+    if n_errors:
+        print(f"[import_clients] row errors written to {errors_path}")
+    print(f"[import_clients] {timings.report(len(df))}")
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,125 @@
+# app/import_utils.py
+"""
+Shared plumbing for the CSV importers (import_clients.py / import_accounts.py):
+reading the spreadsheet exports, chunked writes, phase timings and the
+per-row error file.
+"""
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import pandas as pd
+
+DEFAULT_CHUNK = 500
+
+# 1-based line number in the source file, carried through to the error file
+LINE_COL = "_line"
+ERROR_COL = "_error"
+
+
+def read_export(path: str, columns: Sequence[str], expect: str) -> pd.DataFrame:
+    """
+    Every cell as stripped text ("" when blank), with all of `columns` present.
+
+    Our exports have an extra first row of numbers above the real header; the
+    header row is whichever of the first two contains `expect`.
+    """
+    df = pd.read_csv(path, header=0, dtype=str, keep_default_na=False)
+    header = 0
+    if expect not in [str(c).strip() for c in df.columns]:
+        df = pd.read_csv(path, header=1, dtype=str, keep_default_na=False)
+        header = 1
+
+    df.columns = [str(c).strip() for c in df.columns]
+    df = df.apply(lambda col: col.str.strip())
+    for c in columns:
+        if c not in df.columns:
+            df[c] = ""
+    df[LINE_COL] = df.index + header + 2
+    return df
+
+
+def nullable(s: pd.Series) -> pd.Series:
+    """Blank strings -> missing."""
+    return s.where(s != "")
+
+
+def records(frame: pd.DataFrame) -> List[dict]:
+    """Row dicts for executemany, with NaN / <NA> turned into None."""
+    return frame.astype(object).where(frame.notna(), None).to_dict("records")
+
+
+def chunks(rows: List[dict], size: int) -> Iterator[List[dict]]:
+    for i in range(0, len(rows), max(size, 1)):
+        yield rows[i:i + size]
+
+
+class Timings:
+    """Wall time per phase, printed at the end of a run."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - t0
+
+    def report(self, rows: int) -> str:
+        total = time.perf_counter() - self.started
+        parts = ", ".join(f"{name} {secs:.2f}s" for name, secs in self.phases.items())
+        rate = f" ({rows / total:,.0f} rows/s)" if total > 0 else ""
+        return f"{parts}; total {total:.2f}s for {rows} rows{rate}"
+
+
+class RowErrors:
+    """
+    Collects a reason per failing source row. Rows that were still imported
+    (e.g. an unknown manager) are recorded too; the reason says so.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self.reasons: List[pd.Series] = []
+
+    def add(self, mask: pd.Series, reason) -> None:
+        """`reason` is a string or a per-row Series of strings."""
+        if not mask.any():
+            return
+        if isinstance(reason, pd.Series):
+            self.reasons.append(reason[mask])
+        else:
+            self.reasons.append(pd.Series(reason, index=self.df.index[mask]))
+
+    def __len__(self) -> int:
+        return len(set().union(*(r.index for r in self.reasons)))
+
+    def write(self, path: Optional[Path]) -> int:
+        """
+        Failing rows (line, reason, then the original columns) to `path`.
+        A clean run removes an error file left over from an earlier one.
+        """
+        if path is None:
+            return len(self)
+        if not self.reasons:
+            path.unlink(missing_ok=True)
+            return 0
+        reasons = pd.concat(self.reasons)
+        reasons = reasons.groupby(level=0).agg("; ".join)
+        out = self.df.loc[reasons.index].copy()
+        out.insert(0, ERROR_COL, reasons)
+        out.insert(0, LINE_COL, out.pop(LINE_COL))
+        out.sort_values(LINE_COL).to_csv(path, index=False)
+        return len(out)
+
+
+def default_errors_path(csv_path: str) -> Path:
+    p = Path(csv_path)
+    return p.with_name(p.stem + ".errors.csv")
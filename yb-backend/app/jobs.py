@@ -0,0 +1,327 @@
+# app/jobs.py
+"""
+Tiny persistent job queue on top of the `jobs` table.
+
+API side:   enqueue(db, "client.provision", {...}, client_id=..., dedupe_key=...)
+            then commit together with whatever created the work.
+Worker:     python -m app.jobs            (loop; see deploy/yb-jobs.service)
+            python -m app.jobs --once     (drain what is due, then exit)
+
+Handlers are registered with @job_handler(kind) (see app/provisioning.py,
+app/purge.py) and must be idempotent: a job can run again after a crash or
+a retry. They get the payload plus "job_id", for report_progress().
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import socket
+import time
+import traceback
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from .database import SessionLocal
+from . import models
+
+log = logging.getLogger("yb.jobs")
+
+JobHandler = Callable[[Session, Dict[str, Any]], Optional[Dict[str, Any]]]
+HANDLERS: Dict[str, JobHandler] = {}
+
+# Run jobs right after enqueue's commit instead of in the worker (dev / single-process)
+JOBS_INLINE = os.getenv("YB_JOBS_INLINE", "").strip().lower() in ("1", "true", "yes")
+POLL_SECONDS = float(os.getenv("YB_JOBS_POLL_SECONDS", "1.0"))
+# A running job whose worker died is re-queued this long after its last
+# heartbeat (claim, or report_progress)
+LEASE_SECONDS = int(os.getenv("YB_JOBS_LEASE_SECONDS", "600"))
+RETRY_BASE_SECONDS = 10
+
+# Response header endpoints use to hand back the id of the job they queued
+JOB_ID_HEADER = "X-Job-Id"
+
+# job id -> locked_by, for the jobs this process is running right now
+_RUNNING: Dict[int, str] = {}
+
+
+def job_handler(kind: str):
+    def _register(fn: JobHandler) -> JobHandler:
+        HANDLERS[kind] = fn
+        return fn
+    return _register
+
+
+def _load_handlers() -> None:
+    # Handlers live next to the code they call; importing registers them
+    from . import provisioning, purge  # noqa: F401
+
+
+# ---------- API side ----------
+
+def enqueue(
+    db: Session,
+    kind: str,
+    payload: Optional[Dict[str, Any]] = None,
+    *,
+    client_id: Optional[int] = None,
+    created_by_id: Optional[int] = None,
+    dedupe_key: Optional[str] = None,
+    max_attempts: int = 3,
+) -> models.Job:
+    """
+    Add a job to the current transaction (caller commits). With a dedupe_key,
+    a queued / running job for that key is returned instead of adding a new
+    one. A finished job gives its key up: keys are built from ids SQLite can
+    hand out again.
+    """
+    if dedupe_key:
+        existing = db.query(models.Job).filter(models.Job.dedupe_key == dedupe_key).first()
+        if existing and existing.status in ("queued", "running"):
+            return existing
+        if existing:
+            existing.dedupe_key = None
+            db.flush()
+
+    job = models.Job(
+        kind=kind,
+        payload=payload or {},
+        status="queued",
+        attempts=0,
+        max_attempts=max_attempts,
+        dedupe_key=dedupe_key,
+        client_id=client_id,
+        created_by_id=created_by_id,
+        run_after=datetime.utcnow(),
+    )
+    db.add(job)
+    db.flush()
+    return job
+
+
+# Kinds whose handlers live in app/provisioning.py
+CLIENT_PROVISION = "client.provision"
+INTAKE_PROVISION = "intake.provision"
+
+
+def enqueue_client_provisioning(
+    db: Session,
+    client: models.Client,
+    created_by_user_id: Optional[int],
+    intake_id: Optional[int] = None,
+) -> models.Job:
+    """Queue recurring rules / onboarding tasks (and intake accounts) for a new client."""
+    kind = INTAKE_PROVISION if intake_id else CLIENT_PROVISION
+    return enqueue(
+        db,
+        kind,
+        {"client_id": client.id, "intake_id": intake_id, "created_by_user_id": created_by_user_id},
+        client_id=client.id,
+        created_by_id=created_by_user_id,
+        dedupe_key=f"{kind}:{client.id}",
+    )
+
+
+def run_inline_if_enabled(job_id: int) -> None:
+    """Call after the enqueueing transaction committed."""
+    if JOBS_INLINE:
+        run_job(job_id, worker_id=f"inline:{_worker_id()}")
+
+
+# ---------- worker side ----------
+
+def report_progress(job_id: Optional[int], progress: Dict[str, Any]) -> bool:
+    """
+    Store interim numbers in job.result while the handler runs, and refresh
+    locked_at: a job that keeps reporting is never re-queued as stale, however
+    long it runs. Uses its own session so the handler's transaction isn't
+    committed early.
+
+    Only touches the job while this worker still holds it; returns False once
+    it doesn't (it went stale and another worker claimed it).
+    """
+    if job_id is None:
+        return True
+    db = SessionLocal()
+    try:
+        n = (
+            db.query(models.Job)
+            .filter(
+                models.Job.id == job_id,
+                models.Job.status == "running",
+                models.Job.locked_by == _RUNNING.get(job_id, _worker_id()),
+            )
+            .update(
+                {models.Job.result: dict(progress), models.Job.locked_at: datetime.utcnow()},
+                synchronize_session=False,
+            )
+        )
+        db.commit()
+        return n == 1
+    finally:
+        db.close()
+
+
+def _worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _requeue_stale(db: Session) -> int:
+    cutoff = datetime.utcnow() - timedelta(seconds=LEASE_SECONDS)
+    n = (
+        db.query(models.Job)
+        .filter(models.Job.status == "running", models.Job.locked_at < cutoff)
+        .update(
+            {models.Job.status: "queued", models.Job.locked_by: None, models.Job.locked_at: None},
+            synchronize_session=False,
+        )
+    )
+    db.commit()
+    return n
+
+
+def _claim(db: Session, job_id: int, worker_id: str, now: datetime) -> bool:
+    """queued -> running for worker_id, only if the job is still queued (caller commits)."""
+    return bool(
+        db.query(models.Job)
+        .filter(models.Job.id == job_id, models.Job.status == "queued")
+        .update(
+            {
+                models.Job.status: "running",
+                models.Job.locked_by: worker_id,
+                models.Job.locked_at: now,
+                models.Job.started_at: now,
+                models.Job.attempts: models.Job.attempts + 1,
+            },
+            synchronize_session=False,
+        )
+    )
+
+
+def claim_next(db: Session, worker_id: str) -> Optional[int]:
+    """
+    Atomically move the oldest due job to 'running'. The conditional UPDATE
+    means two workers can never claim the same row.
+    """
+    now = datetime.utcnow()
+    while True:
+        row = (
+            db.query(models.Job.id)
+            .filter(models.Job.status == "queued", models.Job.run_after <= now)
+            .order_by(models.Job.run_after.asc(), models.Job.id.asc())
+            .first()
+        )
+        if not row:
+            return None
+        claimed = _claim(db, row.id, worker_id, now)
+        db.commit()
+        if claimed:
+            return row.id
+        # someone else got it; try the next one
+
+
+def run_job(job_id: int, worker_id: Optional[str] = None) -> str:
+    """
+    Run one job in its own session. Returns the resulting status.
+
+    Runs the job only if this caller holds it: either claim_next() gave it to
+    worker_id, or it is still queued and the same conditional claim succeeds
+    here (inline path). Anything else is someone else's run and is left alone.
+    """
+    _load_handlers()
+    worker_id = worker_id or _worker_id()
+    held = False
+    db = SessionLocal()
+    try:
+        job = db.get(models.Job, job_id)
+        if job is None:
+            return "missing"
+        if job.status == "queued":
+            claimed = _claim(db, job_id, worker_id, datetime.utcnow())
+            db.commit()
+            db.refresh(job)
+            if not claimed:
+                return job.status
+        elif job.status != "running" or job.locked_by != worker_id or job_id in _RUNNING:
+            return job.status
+
+        handler = HANDLERS.get(job.kind)
+        _RUNNING[job.id] = worker_id
+        held = True
+        try:
+            if handler is None:
+                raise RuntimeError(f"No handler for job kind {job.kind!r}")
+            result = handler(db, dict(job.payload or {}, job_id=job.id))
+            db.commit()
+        except Exception:
+            db.rollback()
+            job = db.get(models.Job, job_id)
+            job.last_error = traceback.format_exc()[-4000:]
+            job.locked_by = None
+            job.locked_at = None
+            if job.attempts >= job.max_attempts:
+                job.status = "failed"
+                job.finished_at = datetime.utcnow()
+            else:
+                job.status = "queued"
+                job.run_after = datetime.utcnow() + timedelta(
+                    seconds=RETRY_BASE_SECONDS * 2 ** (job.attempts - 1)
+                )
+            db.commit()
+            log.warning("job %s (%s) attempt %s failed", job.id, job.kind, job.attempts)
+            return job.status
+
+        job = db.get(models.Job, job_id)
+        job.status = "succeeded"
+        job.result = result or None
+        job.last_error = None
+        job.locked_by = None
+        job.locked_at = None
+        job.finished_at = datetime.utcnow()
+        db.commit()
+        return job.status
+    finally:
+        if held:
+            _RUNNING.pop(job_id, None)
+        db.close()
+
+
+def work(once: bool = False, poll: float = POLL_SECONDS) -> int:
+    """Worker loop. Returns the number of jobs processed (useful with once=True)."""
+    _load_handlers()
+    worker_id = _worker_id()
+    processed = 0
+    db = SessionLocal()
+    try:
+        _requeue_stale(db)
+        while True:
+            job_id = claim_next(db, worker_id)
+            if job_id is None:
+                if once:
+                    return processed
+                time.sleep(poll)
+                _requeue_stale(db)
+                continue
+            status = run_job(job_id, worker_id)
+            processed += 1
+            log.info("job %s -> %s", job_id, status)
+    finally:
+        db.close()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Background job worker")
+    ap.add_argument("--once", action="store_true", help="process due jobs, then exit")
+    ap.add_argument("--poll", type=float, default=POLL_SECONDS, help="idle poll interval (seconds)")
+    args = ap.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="[jobs] %(message)s")
+    n = work(once=args.once, poll=args.poll)
+    if args.once:
+        print(f"[jobs] processed={n}")
+
+
+if __name__ == "__main__":
+    main()
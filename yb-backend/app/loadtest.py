@@ -0,0 +1,241 @@
+# app/loadtest.py
+"""
+Closed-loop load test for the API: C client threads hammer a few endpoints
+for a fixed time and report throughput and latency. Stdlib only.
+
+Against a running server:
+
+    python -m app.loadtest --url http://127.0.0.1:8000 --email me@x.com --password ...
+
+Worker scaling (starts `uvicorn --workers N` on a spare port for each N, with
+this process's environment, i.e. the same DB / .env; stops it afterwards):
+
+    python -m app.loadtest --spawn 1,2,4 --email me@x.com --password ... --json
+
+Endpoints: tasks (GET /api/tasks/?limit=50), clients (GET /api/clients/?limit=50),
+dashboard (GET /api/tasks/my-dashboard), login (POST /api/auth/login: bcrypt, i.e. pure CPU). Read-only except login.
+"""
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from statistics import median
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote, urlsplit
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+ENDPOINTS = {
+    "tasks": ("GET", "/api/tasks/?limit=50"),
+    "clients": ("GET", "/api/clients/?limit=50"),
+    "dashboard": ("GET", "/api/tasks/my-dashboard"),
+    "login": ("POST", "/api/auth/login?email={email}&password={password}"),
+}
+
+
+class _Conn:
+    """One keep-alive connection per thread, reopened after errors."""
+
+    def __init__(self, url: str):
+        parts = urlsplit(url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.conn: Optional[http.client.HTTPConnection] = None
+
+    def request(
+        self, method: str, path: str, headers: Dict[str, str], body: Optional[bytes] = None
+    ) -> Tuple[int, bytes]:
+        reused = self.conn is not None
+        if self.conn is None:
+            self.conn = http.client.HTTPConnection(self.host, self.port, timeout=30)
+        try:
+            self.conn.request(method, path, body=body, headers=headers)
+            resp = self.conn.getresponse()
+            return resp.status, resp.read()
+        except (OSError, http.client.HTTPException) as e:
+            self.conn.close()
+            self.conn = None
+            # A worker shutting down (reload) closes idle keep-alive connections;
+            # like a browser, retry once on a fresh one
+            if reused and isinstance(e, (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)):
+                return self.request(method, path, headers, body)
+            raise
+
+
+def login(url: str, email: str, password: str) -> str:
+    status, body = _Conn(url).request(
+        "POST", ENDPOINTS["login"][1].format(email=quote(email), password=quote(password)), {}
+    )
+    if status != 200:
+        raise SystemExit(f"[loadtest] login failed: HTTP {status} {body[:200]!r}")
+    return json.loads(body)["access_token"]
+
+
+def _pct(sorted_ms: List[float], p: float) -> float:
+    if not sorted_ms:
+        return 0.0
+    return sorted_ms[min(len(sorted_ms) - 1, int(p * len(sorted_ms)))]
+
+
+def run_load(
+    url: str,
+    token: str,
+    endpoints: List[str],
+    concurrency: int,
+    duration: float,
+    email: str = "",
+    password: str = "",
+) -> dict:
+    headers = {"Authorization": f"Bearer {token}"}
+    paths = [
+        (name, ENDPOINTS[name][0], ENDPOINTS[name][1].format(email=quote(email), password=quote(password)))
+        for name in endpoints
+    ]
+    samples: Dict[str, List[float]] = {name: [] for name in endpoints}
+    errors: Dict[str, int] = {name: 0 for name in endpoints}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client(offset: int):
+        conn = _Conn(url)
+        local = {name: [] for name in endpoints}
+        local_err = {name: 0 for name in endpoints}
+        i = offset
+        while time.perf_counter() < deadline:
+            name, method, path = paths[i % len(paths)]
+            i += 1
+            t0 = time.perf_counter()
+            try:
+                status, _ = conn.request(method, path, headers)
+            except (OSError, http.client.HTTPException):
+                status = 0
+            if status == 200:
+                local[name].append((time.perf_counter() - t0) * 1000)
+            else:
+                local_err[name] += 1
+        with lock:
+            for name in endpoints:
+                samples[name].extend(local[name])
+                errors[name] += local_err[name]
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(concurrency)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    out = {"concurrency": concurrency, "seconds": round(elapsed, 1), "endpoints": {}}
+    total = 0
+    for name in endpoints:
+        ms = sorted(samples[name])
+        total += len(ms)
+        out["endpoints"][name] = {
+            "ok": len(ms),
+            "errors": errors[name],
+            "rps": round(len(ms) / elapsed, 1),
+            "p50_ms": round(median(ms), 1) if ms else 0.0,
+            "p95_ms": round(_pct(ms, 0.95), 1),
+            "p99_ms": round(_pct(ms, 0.99), 1),
+        }
+    out["rps"] = round(total / elapsed, 1)
+    return out
+
+
+# ---------- spawned servers ----------
+
+def _wait_ready(url: str, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            status, _ = _Conn(url).request("GET", "/openapi.json", {})
+            if status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.3)
+    raise SystemExit(f"[loadtest] server at {url} did not come up")
+
+
+def spawn_server(workers: int, port: int, stderr=None) -> subprocess.Popen:
+    return subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers), "--log-level", "warning",
+        ],
+        cwd=BACKEND_DIR,
+        env=dict(os.environ),
+        stderr=stderr,
+    )
+
+
+def stop_server(proc: subprocess.Popen) -> None:
+    proc.terminate()
+    try:
+        proc.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="API load test (throughput / latency per endpoint)")
+    ap.add_argument("--url", default="http://127.0.0.1:8000", help="server to test (ignored with --spawn)")
+    ap.add_argument("--spawn", default=None, help="comma-separated worker counts to start and test, e.g. 1,2,4")
+    ap.add_argument("--port", type=int, default=8765, help="port for --spawn servers")
+    ap.add_argument("--email", required=True)
+    ap.add_argument("--password", required=True)
+    ap.add_argument("--endpoints", default="tasks,clients", help=f"comma-separated: {', '.join(ENDPOINTS)}")
+    ap.add_argument("--concurrency", type=int, default=16, help="client threads")
+    ap.add_argument("--duration", type=float, default=15.0, help="seconds per run")
+    ap.add_argument("--warmup", type=float, default=2.0, help="seconds of unmeasured load first")
+    ap.add_argument("--json", action="store_true", help="print results as JSON")
+    args = ap.parse_args()
+
+    endpoints = [e.strip() for e in args.endpoints.split(",") if e.strip()]
+    unknown = set(endpoints) - set(ENDPOINTS)
+    if unknown:
+        raise SystemExit(f"[loadtest] unknown endpoints: {', '.join(sorted(unknown))}")
+
+    def measure(url: str) -> dict:
+        token = login(url, args.email, args.password)
+        if args.warmup > 0:
+            run_load(url, token, endpoints, args.concurrency, args.warmup, args.email, args.password)
+        return run_load(url, token, endpoints, args.concurrency, args.duration, args.email, args.password)
+
+    results = []
+    if args.spawn:
+        for workers in [int(n) for n in args.spawn.split(",") if n.strip()]:
+            url = f"http://127.0.0.1:{args.port}"
+            proc = spawn_server(workers, args.port)
+            try:
+                _wait_ready(url)
+                results.append({"workers": workers, **measure(url)})
+            finally:
+                stop_server(proc)
+    else:
+        results.append({"workers": None, **measure(args.url)})
+
+    if args.json:
+        print(json.dumps(results, indent=1))
+        return
+    base = results[0]["rps"] or 1
+    for r in results:
+        label = f"workers={r['workers']}" if r["workers"] is not None else args.url
+        per = " ".join(
+            f"{name}={e['rps']}/s p50={e['p50_ms']}ms p95={e['p95_ms']}ms p99={e['p99_ms']}ms err={e['errors']}"
+            for name, e in r["endpoints"].items()
+        )
+        print(f"[loadtest] {label} c={r['concurrency']} total={r['rps']}/s (x{r['rps'] / base:.2f}) {per}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,8 @@
 # app/main.py
 import os
+from contextlib import asynccontextmanager
+
+import anyio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
@@ -8,6 +11,9 @@ from pathlib import Path
 load_dotenv(Path(__file__).resolve().parents[2] / ".env")
 
 from .database import Base, engine
+from .jobs import JOB_ID_HEADER
+from .pagination import NEXT_CURSOR_HEADER
+from .settings import load_settings
 from . import (
     routes_auth,
     routes_tasks,
@@ -23,14 +29,31 @@ from . import (
     routes_client_links,
     routes_client_manual,
     routes_quick_notes,
+    routes_jobs,
+    routes_search,
+    routes_lookup,
 )
 from .routes_client_notes import router as client_notes_router
 from .routes_clientOnboarding import router as client_onboarding_router
 from .routes_admin_settings import router as admin_settings_router
 from .routes_admin_audit import router as admin_audit_router
+from .routes_admin_bulk import router as admin_bulk_router
 # Base.metadata.create_all(bind=engine)
 
-app = FastAPI(title="Yecny Bookkeeping OS API")
+# DB-bound route handlers are plain `def` so FastAPI runs them in the
+# threadpool instead of blocking the event loop with sync Session calls.
+THREADPOOL_SIZE = int(os.getenv("YB_THREADPOOL_SIZE", "40"))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    # Warm the settings cache (docs root, flags) before the first request
+    await anyio.to_thread.run_sync(load_settings)
+    yield
+
+
+app = FastAPI(title="Yecny Bookkeeping OS API", lifespan=lifespan)
 
 origins_env = os.getenv("YB_CORS_ORIGINS", "").strip()
 origins = [o.strip() for o in origins_env.split(",") if o.strip()] if origins_env else [
@@ -45,6 +68,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, JOB_ID_HEADER],
 )
 
 # Key lines: these create /api/auth/... and /api/tasks/...
@@ -62,10 +86,14 @@ app.include_router(client_notes_router, prefix="/api")
 app.include_router(client_onboarding_router, prefix="/api")
 app.include_router(admin_settings_router, prefix="/api")
 app.include_router(admin_audit_router, prefix="/api")
+app.include_router(admin_bulk_router, prefix="/api")
 app.include_router(routes_recurring_templates.router, prefix="/api")
 app.include_router(routes_client_manual.router, prefix="/api")
 app.include_router(routes_client_links.router, prefix="/api")
 app.include_router(routes_quick_notes.router, prefix="/api")
+app.include_router(routes_jobs.router, prefix="/api")
+app.include_router(routes_search.router, prefix="/api")
+app.include_router(routes_lookup.router, prefix="/api")
 @app.get("/api/health")
 async def health():
     return {"status": "ok"}
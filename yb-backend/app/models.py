@@ -13,9 +13,12 @@ from sqlalchemy import (
     UniqueConstraint,
     JSON,
     Index,
+    event,
 )
 from sqlalchemy.orm import relationship
 from datetime import datetime, date
+import re
+import unicodedata
 from .database import Base
 
 
@@ -25,6 +28,7 @@ class User(Base):
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String, unique=True, index=True, nullable=False)
     name = Column(String, nullable=False)
+    name_key = Column(String, nullable=True, index=True)  # see name_key(); typeahead lookups
     hashed_password = Column(String, nullable=False)
     role = Column(String, default="bookkeeper")  # admin/manager/bookkeeper/client
     is_active = Column(Boolean, default=True)
@@ -64,6 +68,7 @@ class Contact(Base):
 
     # Display fields
     name = Column(String, nullable=False)
+    name_key = Column(String, nullable=True, index=True)  # see name_key(); typeahead lookups
     email = Column(String, nullable=True)
     phone = Column(String, nullable=True)
 
@@ -89,6 +94,7 @@ class Client(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     legal_name = Column(String, nullable=False)
+    name_key = Column(String, nullable=True, index=True)  # see name_key(); typeahead lookups
     dba_name = Column(String, nullable=True)
     tax_id = Column(String, nullable=True)  # EIN or SSN
     tier = Column(String, nullable=True)  # monthly / quarterly / annual / etc.
@@ -104,11 +110,12 @@ class Client(Base):
     bookkeeper_id = Column(Integer, ForeignKey("users.id"), nullable=True)
 
 
+    # Loaded lazily: ClientOut never renders these, and list/permission queries
+    # should not drag every note along. Use selectinload() where they are needed.
     notes = relationship(
         "ClientNote",
         back_populates="client",
         cascade="all, delete-orphan",
-        lazy="selectin",
     )
 
     #link to a Contact record for primary contact
@@ -133,7 +140,6 @@ class Client(Base):
     "ClientManualEntry",
     back_populates="client",
     cascade="all, delete-orphan",
-    lazy="selectin",
 )
 class Account(Base):
     __tablename__ = "accounts"
@@ -196,6 +202,10 @@ class Document(Base):
     stored_filename = Column(String, nullable=False)  # just "MMDDYY.ext"
     stored_path = Column(String, nullable=False)      # full relative path from root
 
+    # Filled in while the upload streams to disk (NULL for older rows)
+    sha256 = Column(String(64), nullable=True, index=True)
+    size_bytes = Column(Integer, nullable=True)
+
     uploaded_by = Column(Integer, ForeignKey("users.id"), nullable=False)
     uploaded_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
@@ -537,6 +547,13 @@ class Task(Base):
         links = getattr(self, "client_links", []) or []
         return [l.client_id for l in links]
 
+# Hot task access paths: dashboard / personal list, client tabs + onboarding
+# release, and the recurring runner's duplicate check.
+Index("ix_tasks_assignee_status_due", Task.assigned_user_id, Task.status, Task.due_date)
+Index("ix_tasks_assignee_created", Task.assigned_user_id, Task.created_at)
+Index("ix_tasks_client_type_status", Task.client_id, Task.task_type, Task.status)
+Index("ix_tasks_recurring_due", Task.recurring_task_id, Task.due_date)
+
 class TaskSubtask(Base):
     __tablename__ = "task_subtasks"
 
@@ -602,6 +619,9 @@ class TaskClientLink(Base):
     client = relationship("Client")
     completed_by = relationship("User", foreign_keys=[completed_by_id], lazy="joined")
 
+# PK is (task_id, client_id); client tab queries look links up by client_id
+Index("ix_task_client_links_client_id", TaskClientLink.client_id)
+
 
 # ----------- Client <-> Client links (Related entities) -----------
 class ClientLink(Base):
@@ -678,6 +698,9 @@ class AppSetting(Base):
     # Store JSON (string, number, bool, list, dict)
     value = Column(JSON, nullable=False)
 
+    # Bumped on every write; workers compare sum(version) to spot changes (app.settings)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     updated_by_id = Column(Integer, ForeignKey("users.id"), nullable=True)
 
@@ -709,4 +732,104 @@ class AuditEvent(Base):
     actor = relationship("User", foreign_keys=[actor_user_id])
 
 Index("ix_audit_events_client_created", AuditEvent.client_id, AuditEvent.created_at)
-Index("ix_audit_events_action_created", AuditEvent.action, AuditEvent.created_at)
\ No newline at end of file
+Index("ix_audit_events_action_created", AuditEvent.action, AuditEvent.created_at)
+Index("ix_audit_events_entity_created", AuditEvent.entity_type, AuditEvent.created_at)
+Index("ix_audit_events_actor_created", AuditEvent.actor_user_id, AuditEvent.created_at)
+
+class Job(Base):
+    """
+    Persistent background job (see app/jobs.py). Rows are claimed by the
+    worker process; the API only enqueues and reports status.
+    """
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    kind = Column(String, nullable=False, index=True)  # e.g. "client.provision"
+    payload = Column(JSON, nullable=True)
+
+    # queued -> running -> succeeded | failed (failed only after max_attempts)
+    status = Column(String, nullable=False, default="queued")
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+
+    # Enqueueing the same key twice returns the existing job
+    dedupe_key = Column(String, nullable=True, unique=True)
+
+    client_id = Column(Integer, ForeignKey("clients.id"), nullable=True, index=True)
+    created_by_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+
+    run_after = Column(DateTime, default=datetime.utcnow, nullable=False)
+    locked_by = Column(String, nullable=True)
+    locked_at = Column(DateTime, nullable=True)
+
+    result = Column(JSON, nullable=True)
+    last_error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+Index("ix_jobs_status_run_after", Job.status, Job.run_after)
+
+
+# ---------- Cross-process coordination (app/coordination.py) ----------
+
+class Lease(Base):
+    """Named lock with an expiry; at most one holder (e.g. the recurring runner)."""
+    __tablename__ = "leases"
+
+    name = Column(String, primary_key=True)
+    holder = Column(String, nullable=False)  # "<host>:<pid>"
+    acquired_at = Column(DateTime, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+
+
+class CacheGeneration(Base):
+    """Counter bumped whenever a per-process cache must be dropped everywhere."""
+    __tablename__ = "cache_generations"
+
+    name = Column(String, primary_key=True)  # e.g. "principals"
+    generation = Column(Integer, nullable=False, default=0)
+
+
+class RateLimitHit(Base):
+    """Hits per key in one fixed window (window_start = epoch seconds)."""
+    __tablename__ = "rate_limit_hits"
+
+    key = Column(String, primary_key=True)  # e.g. "login:ip:10.0.0.5"
+    window_start = Column(Integer, primary_key=True)
+    hits = Column(Integer, nullable=False, default=0)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+
+# ---------- Typeahead name keys ----------
+
+_WS = re.compile(r"\s+")
+
+
+def name_key(value: str | None) -> str | None:
+    """
+    Normalized, sortable form of a display name: accents stripped, casefolded,
+    whitespace collapsed. "  Zoë  Smith" -> "zoe smith". Prefix lookups are
+    then a plain B-tree range scan on the indexed name_key column.
+    """
+    if value is None:
+        return None
+    decomposed = unicodedata.normalize("NFKD", value)
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return _WS.sub(" ", stripped.casefold()).strip()
+
+
+def _keep_name_key(source: str):
+    def _listener(mapper, connection, target):
+        target.name_key = name_key(getattr(target, source))
+    return _listener
+
+
+# model -> the column its name_key is derived from
+NAME_KEY_SOURCES = ((Client, "legal_name"), (Contact, "name"), (User, "name"))
+
+for _model, _source in NAME_KEY_SOURCES:
+    event.listen(_model, "before_insert", _keep_name_key(_source))
+    event.listen(_model, "before_update", _keep_name_key(_source))
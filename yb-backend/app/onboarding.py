@@ -178,13 +178,14 @@ def release_onboarding_tasks_if_ready(
     db: Session,
     client_id: int,
     created_by_user_id: Optional[int] = None,
+    commit: bool = True,
 ) -> int:
     """
     If ALL admin onboarding tasks for this client are completed,
     release blocked onboarding tasks:
       - status: 'blocked' -> 'new'
       - assigned_user_id set based on template role + client staffing
-    Returns number of tasks released.
+    Returns number of tasks released. commit=False leaves committing to the caller.
     """
     client = db.query(Client).filter(Client.id == client_id).first()
     if not client:
@@ -226,15 +227,17 @@ def release_onboarding_tasks_if_ready(
         .order_by(Task.id.asc())
         .all()
     )
+    template_ids = {t.template_task_id for t in blocked_tasks if t.template_task_id}
+    templates = {}
+    if template_ids:
+        templates = {
+            tmpl.id: tmpl
+            for tmpl in db.query(OnboardingTemplateTask).filter(OnboardingTemplateTask.id.in_(template_ids))
+        }
+
     released = 0
     for t in blocked_tasks:
-        tmpl = (
-            db.query(OnboardingTemplateTask)
-            .filter(OnboardingTemplateTask.id == t.template_task_id)
-            .first()
-            if t.template_task_id
-            else None
-        )
+        tmpl = templates.get(t.template_task_id)
         if not tmpl:
             continue
 
@@ -255,7 +258,7 @@ def release_onboarding_tasks_if_ready(
 
 
 
-    if released > 0:
+    if released > 0 and commit:
         db.commit()
 
     return released
\ No newline at end of file
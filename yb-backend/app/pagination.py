@@ -0,0 +1,148 @@
+# app/pagination.py
+from __future__ import annotations
+
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import and_, func, literal, or_
+from sqlalchemy.types import Date, DateTime
+
+# Header carrying the cursor for the next page (absent on the last page)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+MAX_PAGE_SIZE = 500
+
+# Sort key: (attribute name, descending?, value to sort NULLs as)
+SortKey = Tuple[str, bool, Any]
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps(jsonable_encoder(list(values)), separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, n_keys: int) -> List[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, list) or len(values) != n_keys:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def parse_fields(fields: Optional[str], model, hidden: Iterable[str] = ()) -> Optional[List[str]]:
+    """
+    Parse a comma-separated `fields=` projection against the model's columns.
+    Returns None when no projection was requested. `id` is always included.
+    Columns in `hidden` are treated as unknown.
+    """
+    if not fields:
+        return None
+    cols = set(model.__table__.columns.keys()) - set(hidden)
+    wanted = list(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [f for f in wanted if f not in cols]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    if "id" not in wanted:
+        wanted.insert(0, "id")
+    return wanted
+
+
+def _sort_expr(model, key: SortKey):
+    name, _desc, null_as = key
+    col = getattr(model, name)
+    if null_as is None:
+        return col
+    return func.coalesce(col, literal(null_as, type_=col.type))
+
+
+def _coerce(value: Any, expr) -> Any:
+    # JSON round-trips dates as ISO strings; turn them back into the column type
+    if isinstance(value, str):
+        if isinstance(expr.type, DateTime):
+            return datetime.fromisoformat(value)
+        if isinstance(expr.type, Date):
+            return date.fromisoformat(value)
+    return value
+
+
+def after_keyset(exprs, order: Sequence[SortKey], values: List[Any]):
+    """
+    Lexicographic "strictly after" predicate for the keyset. The redundant
+    bound on the first key gives the planner an index range to start from;
+    the OR alone would make every page rescan from the top.
+    """
+    clauses = []
+    for i, (expr, key) in enumerate(zip(exprs, order)):
+        desc = key[1]
+        prefix = [exprs[j] == values[j] for j in range(i)]
+        step = expr < values[i] if desc else expr > values[i]
+        clauses.append(and_(*prefix, step))
+    first_bound = exprs[0] <= values[0] if order[0][1] else exprs[0] >= values[0]
+    return and_(first_bound, or_(*clauses))
+
+
+def paginate(
+    query,
+    model,
+    order: Sequence[SortKey],
+    *,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+    response: Optional[Response] = None,
+):
+    """
+    Order `query` by the keyset `order` and, if `limit`/`cursor` is given, return
+    one page of it. The next page's cursor is sent in the X-Next-Cursor header.
+
+    Without limit/cursor the full list is returned (backwards-compatible).
+    With `fields` (from parse_fields) only those columns are selected and a
+    JSONResponse of plain dicts is returned instead of ORM rows.
+    """
+    exprs = [_sort_expr(model, key) for key in order]
+    query = query.order_by(*[e.desc() if key[1] else e.asc() for e, key in zip(exprs, order)])
+
+    if cursor:
+        values = decode_cursor(cursor, len(order))
+        values = [_coerce(v, e) for v, e in zip(values, exprs)]
+        query = query.filter(after_keyset(exprs, order, values))
+
+    if fields is not None:
+        selected = list(dict.fromkeys(list(fields) + [key[0] for key in order]))
+        query = query.with_entities(*[getattr(model, name) for name in selected])
+
+    paged = limit is not None or cursor is not None
+    if paged:
+        limit = max(1, min(limit or MAX_PAGE_SIZE, MAX_PAGE_SIZE))
+        rows = query.limit(limit + 1).all()
+    else:
+        rows = query.all()
+
+    next_cursor = None
+    if paged and len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(
+            [
+                getattr(last, name) if getattr(last, name) is not None else null_as
+                for name, _desc, null_as in order
+            ]
+        )
+
+    if fields is not None:
+        body: List[Dict[str, Any]] = [{name: getattr(r, name) for name in fields} for r in rows]
+        out = JSONResponse(jsonable_encoder(body))
+        if next_cursor:
+            out.headers[NEXT_CURSOR_HEADER] = next_cursor
+        return out
+
+    if next_cursor and response is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return rows
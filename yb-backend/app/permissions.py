@@ -1,7 +1,14 @@
 # app/permissions.py
+import os
+import threading
+import time
+from typing import Dict, FrozenSet, Optional, Tuple
+
 from fastapi import HTTPException, status
+from sqlalchemy import literal, select, union_all
 from sqlalchemy.orm import Session
 from . import models
+from .coordination import GenerationWatch, bump_generation
 
 def _role(user: models.User) -> str:
     return (user.role or "").strip().lower()
@@ -12,35 +19,140 @@ def is_manager(user): return _role(user) == "manager"
 def is_bookkeeper(user): return _role(user) == "bookkeeper"
 def is_client(user): return _role(user) == "client"
 
+
+# ---------- Principal (who the caller is + which clients they can reach) ----------
+
+class Principal:
+    """
+    Snapshot of a user's access, built with one query and reused by every
+    permission check in the request.
+    """
+
+    __slots__ = ("user_id", "role", "is_global", "client_ids", "upload_client_ids")
+
+    def __init__(
+        self,
+        user_id: int,
+        role: str,
+        is_global: bool,
+        client_ids: FrozenSet[int] = frozenset(),
+        upload_client_ids: FrozenSet[int] = frozenset(),
+    ):
+        self.user_id = user_id
+        self.role = role
+        self.is_global = is_global
+        self.client_ids = client_ids
+        self.upload_client_ids = upload_client_ids
+
+    def can_access(self, client_id: int) -> bool:
+        return self.is_global or client_id in self.client_ids
+
+    def can_upload(self, client_id: int) -> bool:
+        if self.is_global:
+            return True
+        if self.role == "client":
+            return client_id in self.upload_client_ids
+        return client_id in self.client_ids
+
+
+# Short-lived, per-process cache so back-to-back requests from the same user
+# skip the access query. Call invalidate_principals() / clear_principals()
+# (after the commit) whenever client assignments, ClientUserAccess rows or a
+# user's role/active flag change. Either one also bumps the shared "principals"
+# generation, so other workers drop their caches within YB_SHARED_CHECK_SECONDS.
+PRINCIPAL_CACHE_TTL = float(os.getenv("YB_PRINCIPAL_CACHE_TTL", "30"))
+
+_principal_cache: Dict[int, Tuple[float, Principal]] = {}
+_principal_lock = threading.Lock()
+_principal_generation = GenerationWatch("principals")
+
+
+def invalidate_principals(*user_ids: Optional[int]) -> None:
+    """Drop cached principals for these users (None entries are ignored)."""
+    with _principal_lock:
+        for uid in user_ids:
+            if uid is not None:
+                _principal_cache.pop(uid, None)
+    bump_generation("principals")
+
+
+def clear_principals() -> None:
+    with _principal_lock:
+        _principal_cache.clear()
+    bump_generation("principals")
+
+
+def _build_principal(db: Session, user: models.User) -> Principal:
+    role = _role(user)
+    if role in ("owner", "admin"):
+        return Principal(user.id, role, True)
+
+    # Staff access by assignment + portal/shared access via join table, one query
+    parts = [
+        select(
+            models.ClientUserAccess.client_id,
+            models.ClientUserAccess.can_upload_docs,
+        ).where(models.ClientUserAccess.user_id == user.id)
+    ]
+    if role == "manager":
+        parts.append(
+            select(models.Client.id, literal(False)).where(models.Client.manager_id == user.id)
+        )
+    if role == "bookkeeper":
+        parts.append(
+            select(models.Client.id, literal(False)).where(models.Client.bookkeeper_id == user.id)
+        )
+
+    client_ids = set()
+    upload_ids = set()
+    for client_id, can_upload in db.execute(union_all(*parts)).all():
+        client_ids.add(client_id)
+        if can_upload:
+            upload_ids.add(client_id)
+
+    return Principal(user.id, role, False, frozenset(client_ids), frozenset(upload_ids))
+
+
+def get_principal(db: Session, user: models.User) -> Principal:
+    """
+    Principal for `user`, built at most once per request (it is kept on the
+    request's User instance) and shared across requests for a few seconds.
+    """
+    principal = user.__dict__.get("_yb_principal")
+    if principal is not None:
+        return principal
+
+    if _principal_generation.changed(db):
+        # another process changed someone's access
+        with _principal_lock:
+            _principal_cache.clear()
+
+    now = time.monotonic()
+    with _principal_lock:
+        hit = _principal_cache.get(user.id)
+    if hit and hit[0] > now and hit[1].role == _role(user):
+        principal = hit[1]
+    else:
+        principal = _build_principal(db, user)
+        with _principal_lock:
+            _principal_cache[user.id] = (now + PRINCIPAL_CACHE_TTL, principal)
+
+    user.__dict__["_yb_principal"] = principal
+    return principal
+
+
+# ---------- Permission helpers ----------
+
 def assert_client_access(db: Session, user: models.User, client_id: int) -> models.Client:
     """
     Throws 403 if user cannot access this client.
     Returns the Client row if allowed.
     """
-    client = db.query(models.Client).get(client_id)
+    client = db.get(models.Client, client_id)
     if not client:
         raise HTTPException(status_code=404, detail="Client not found")
 
-    # Global access
-    if is_owner(user) or is_admin(user):
-        return client
-
-    # Staff access by assignment (simple and effective)
-    if is_manager(user) and client.manager_id == user.id:
-        return client
-    if is_bookkeeper(user) and client.bookkeeper_id == user.id:
-        return client
-
-    # Portal users (or shared access) via join table
-    link = (
-        db.query(models.ClientUserAccess)
-        .filter(
-            models.ClientUserAccess.client_id == client_id,
-            models.ClientUserAccess.user_id == user.id,
-        )
-        .first()
-    )
-    if link:
+    if get_principal(db, user).can_access(client_id):
         return client
 
     raise HTTPException(
@@ -52,23 +164,14 @@ def assert_client_upload_allowed(db: Session, user: models.User, client_id: int)
     # Owner/Admin already covered by assert_client_access
     assert_client_access(db, user, client_id)
 
-    if is_owner(user) or is_admin(user):
-        return
-
-    link = (
-        db.query(models.ClientUserAccess)
-        .filter(
-            models.ClientUserAccess.client_id == client_id,
-            models.ClientUserAccess.user_id == user.id,
-        )
-        .first()
-    )
-    if is_client(user) and (not link or not link.can_upload_docs):
+    if not get_principal(db, user).can_upload(client_id):
         raise HTTPException(status_code=403, detail="Upload not allowed")
 
 def can_view_task(db: Session, user: models.User, task: models.Task) -> bool:
+    principal = get_principal(db, user)
+
     # Owner/Admin can see all
-    if is_owner(user) or is_admin(user):
+    if principal.is_global:
         return True
 
     # Assigned user can see
@@ -77,29 +180,12 @@ def can_view_task(db: Session, user: models.User, task: models.Task) -> bool:
 
     # Single-client task: allow if user can access that client
     task_client_id = getattr(task, "client_id", None)
-    if task_client_id:
-        try:
-            assert_client_access(db, user, int(task_client_id))
-            return True
-        except HTTPException:
-            pass
+    if task_client_id and principal.can_access(int(task_client_id)):
+        return True
 
     # Intercompany: allow if user can access ANY linked client
     if bool(getattr(task, "is_intercompany", False)):
-        try:
-            links = (
-                db.query(models.TaskClientLink)
-                .filter(models.TaskClientLink.task_id == task.id)
-                .all()
-            )
-        except Exception:
-            links = []
-
-        for link in links:
-            try:
-                assert_client_access(db, user, int(link.client_id))
-                return True
-            except HTTPException:
-                continue
-
-    return False
\ No newline at end of file
+        links = getattr(task, "client_links", None) or []
+        return any(principal.can_access(int(link.client_id)) for link in links)
+
+    return False
@@ -0,0 +1,79 @@
+# app/provisioning.py
+"""
+Per-client provisioning, run by the job worker (app/jobs.py) instead of
+inside the create-client / convert-intake requests.
+
+Every step is safe to repeat: rules are matched by (client, name), onboarding
+tasks by template id, account shells by type.
+"""
+from typing import Any, Dict
+
+from sqlalchemy.orm import Session
+
+from . import models
+from .accounts_seed import seed_default_accounts_for_client
+from .jobs import CLIENT_PROVISION, INTAKE_PROVISION, job_handler
+from .onboarding import create_onboarding_tasks_for_client
+from .routes_clients import create_default_recurring_tasks_for_client
+from .routes_intake import (
+    create_accounts_from_intake,
+    create_custom_recurring_tasks_from_intake,
+    seed_onboarding_account_shells,
+)
+
+
+def _load_client(db: Session, payload: Dict[str, Any]) -> models.Client:
+    client = db.get(models.Client, payload["client_id"])
+    if client is None:
+        raise LookupError(f"Client {payload['client_id']} not found")
+    return client
+
+
+def _count(db: Session, model, client_id: int) -> int:
+    return db.query(model).filter(model.client_id == client_id).count()
+
+
+@job_handler(CLIENT_PROVISION)
+def provision_client(db: Session, payload: Dict[str, Any]) -> Dict[str, Any]:
+    client = _load_client(db, payload)
+    created_by = payload.get("created_by_user_id")
+
+    # 1) default recurring rules + first tasks (commits)
+    create_default_recurring_tasks_for_client(db, client, created_by_user_id=created_by)
+
+    # 2) onboarding tasks from templates
+    onboarding = create_onboarding_tasks_for_client(db=db, client=client, created_by_user_id=created_by)
+    db.commit()
+
+    return {
+        "recurring_rules": _count(db, models.RecurringTask, client.id),
+        "onboarding_created": len(onboarding),
+    }
+
+
+@job_handler(INTAKE_PROVISION)
+def provision_client_from_intake(db: Session, payload: Dict[str, Any]) -> Dict[str, Any]:
+    client = _load_client(db, payload)
+    created_by = payload.get("created_by_user_id")
+    intake = db.get(models.ClientIntake, payload["intake_id"]) if payload.get("intake_id") else None
+
+    # Accounts first, in one transaction with the shells. Intake accounts are
+    # only created while the client has none, so a retry can't duplicate them.
+    if intake is not None and _count(db, models.Account, client.id) == 0:
+        create_accounts_from_intake(db, client, intake)
+        db.flush()
+    seed_onboarding_account_shells(db, client)
+    seed_default_accounts_for_client(db, client.id)
+
+    # create_default_recurring_tasks_for_client commits the above as well
+    create_default_recurring_tasks_for_client(db, client, created_by_user_id=created_by)
+    if intake is not None:
+        create_custom_recurring_tasks_from_intake(db, client, intake, created_by_user_id=created_by)
+    onboarding = create_onboarding_tasks_for_client(db=db, client=client, created_by_user_id=created_by)
+    db.commit()
+
+    return {
+        "accounts": _count(db, models.Account, client.id),
+        "recurring_rules": _count(db, models.RecurringTask, client.id),
+        "onboarding_created": len(onboarding),
+    }
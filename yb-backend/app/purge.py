@@ -0,0 +1,242 @@
+# app/purge.py
+"""
+Client purge, in two phases.
+
+1. purge_client_rows(): set-based DELETEs over every client-scoped table,
+   all in the caller's transaction (one statement per table, however much
+   history the client has). The search index follows through its triggers.
+2. The "client.purge_files" job (app/jobs.py worker) removes the client's
+   document folders from disk, reporting progress in job.result.
+
+Audit events are kept: they are the record that the purge happened.
+"""
+from __future__ import annotations
+
+import os
+import time
+from collections import Counter
+from pathlib import Path, PurePath
+from typing import Any, Dict, Optional
+
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.orm import Session
+
+from . import models
+from .jobs import enqueue, job_handler, report_progress
+from .storage import get_docs_root
+
+CLIENT_PURGE_FILES = "client.purge_files"
+
+# Write job.result at most this often while deleting
+PROGRESS_EVERY_FILES = 500
+PROGRESS_EVERY_SECONDS = 2.0
+
+
+# ---------- DB phase ----------
+
+def _delete(db: Session, model, *where) -> int:
+    return db.execute(delete(model).where(*where).execution_options(synchronize_session=False)).rowcount
+
+
+def purge_client_rows(db: Session, client_id: int) -> Dict[str, int]:
+    """
+    Delete the client and everything hanging off it. Children go before
+    parents so this also holds with YB_SQLITE_FOREIGN_KEYS=ON. Returns rows
+    deleted per table. Caller commits.
+    """
+    M = models
+    task_ids = select(M.Task.id).where(M.Task.client_id == client_id).scalar_subquery()
+    intake_ids = select(M.ClientIntake.id).where(M.ClientIntake.client_id == client_id).scalar_subquery()
+
+    counts: Dict[str, int] = {}
+    counts["task_subtasks"] = _delete(db, M.TaskSubtask, M.TaskSubtask.task_id.in_(task_ids))
+    counts["task_notes"] = _delete(db, M.TaskNote, M.TaskNote.task_id.in_(task_ids))
+    counts["task_client_links"] = _delete(
+        db, M.TaskClientLink,
+        or_(M.TaskClientLink.client_id == client_id, M.TaskClientLink.task_id.in_(task_ids)),
+    )
+    counts["client_manual_entries"] = _delete(db, M.ClientManualEntry, M.ClientManualEntry.client_id == client_id)
+    # other clients' manual entries may point at one of this client's tasks
+    db.execute(
+        update(M.ClientManualEntry)
+        .where(M.ClientManualEntry.task_id.in_(task_ids))
+        .values(task_id=None)
+        .execution_options(synchronize_session=False)
+    )
+    counts["tasks"] = _delete(db, M.Task, M.Task.client_id == client_id)
+    counts["recurring_tasks"] = _delete(db, M.RecurringTask, M.RecurringTask.client_id == client_id)
+    counts["documents"] = _delete(db, M.Document, M.Document.client_id == client_id)
+    counts["accounts"] = _delete(db, M.Account, M.Account.client_id == client_id)
+    counts["client_notes"] = _delete(db, M.ClientNote, M.ClientNote.client_id == client_id)
+    counts["quick_notes"] = _delete(db, M.QuickNote, M.QuickNote.client_id == client_id)
+    counts["client_links"] = _delete(
+        db, M.ClientLink,
+        or_(M.ClientLink.client_id == client_id, M.ClientLink.related_client_id == client_id),
+    )
+    counts["client_user_access"] = _delete(db, M.ClientUserAccess, M.ClientUserAccess.client_id == client_id)
+    counts["intake_owners"] = _delete(db, M.IntakeOwner, M.IntakeOwner.intake_id.in_(intake_ids))
+    counts["client_intake"] = _delete(db, M.ClientIntake, M.ClientIntake.client_id == client_id)
+
+    # Queued work for the client is moot; finished / running jobs stay as history.
+    # Their dedupe keys ("client.provision:<id>") go: the id can be handed to
+    # the next client created.
+    counts["jobs"] = _delete(db, M.Job, M.Job.client_id == client_id, M.Job.status == "queued")
+    db.execute(
+        update(M.Job)
+        .where(M.Job.client_id == client_id)
+        .values(client_id=None, dedupe_key=None)
+        .execution_options(synchronize_session=False)
+    )
+
+    counts["client_purge_requests"] = _delete(
+        db, M.ClientPurgeRequest, M.ClientPurgeRequest.client_id == client_id
+    )
+    counts["clients"] = _delete(db, M.Client, M.Client.id == client_id)
+    return {k: v for k, v in counts.items() if v}
+
+
+# ---------- file phase ----------
+
+def _top_dir(stored_path: str, root: Path) -> Optional[str]:
+    """First path component under the docs root ("Acme LLC/Statements/..." -> "Acme LLC")."""
+    p = PurePath(stored_path)
+    if p.is_absolute():
+        try:
+            p = p.relative_to(root)
+        except ValueError:
+            return None  # outside the docs root: never touched
+    return p.parts[0] if len(p.parts) > 1 else None
+
+
+def plan_file_cleanup(db: Session, client_id: int) -> Dict[str, Any]:
+    """
+    Job payload for the client's files. Call before purge_client_rows()
+    (it reads the document rows).
+
+    A top-level folder is removed wholesale unless some other client's
+    documents live in it too (two legal names can sanitize to the same
+    folder name); then only this client's files are listed.
+    """
+    root = get_docs_root(db)
+    D = models.Document
+    paths = [p for (p,) in db.query(D.stored_path).filter(D.client_id == client_id).yield_per(1000)]
+
+    tops = Counter(t for t in (_top_dir(p, root) for p in paths) if t)
+    shared = {
+        top for top in tops
+        if db.query(D.id)
+        .filter(
+            D.client_id != client_id,
+            or_(
+                D.stored_path.startswith(top + "/", autoescape=True),
+                D.stored_path.startswith(str(root / top) + "/", autoescape=True),
+            ),
+        )
+        .first()
+    }
+    files = [p for p in paths if _top_dir(p, root) in shared or _top_dir(p, root) is None]
+    return {
+        "client_id": client_id,
+        "dirs": sorted(set(tops) - shared),
+        "files": files,
+        "expected_files": len(paths),
+    }
+
+
+def enqueue_file_cleanup(db: Session, plan: Dict[str, Any], created_by_id: Optional[int]) -> models.Job:
+    # client_id stays off the job row: the client is gone by the time it runs
+    return enqueue(db, CLIENT_PURGE_FILES, plan, created_by_id=created_by_id)
+
+
+def _under(path: Path, root: Path) -> bool:
+    try:
+        path.relative_to(root)
+    except ValueError:
+        return False
+    return path != root
+
+
+class _Progress:
+    def __init__(self, job_id: Optional[int], expected: int):
+        self.job_id = job_id
+        self.stats = {"expected_files": expected, "removed_files": 0, "removed_dirs": 0, "missing": 0}
+        self._since = 0
+        self._last = time.monotonic()
+
+    def file_removed(self) -> None:
+        self.stats["removed_files"] += 1
+        self._since += 1
+        if self._since >= PROGRESS_EVERY_FILES or time.monotonic() - self._last >= PROGRESS_EVERY_SECONDS:
+            self.flush()
+
+    def flush(self) -> None:
+        report_progress(self.job_id, self.stats)
+        self._since = 0
+        self._last = time.monotonic()
+
+
+def _remove_tree(top: Path, progress: _Progress) -> None:
+    """Bottom-up walk; symlinks are unlinked, never followed."""
+    if top.is_symlink() or top.is_file():
+        top.unlink()
+        progress.file_removed()
+        return
+    for dirpath, dirnames, filenames in os.walk(top, topdown=False):
+        for name in filenames:
+            try:
+                os.unlink(os.path.join(dirpath, name))
+            except FileNotFoundError:
+                continue
+            progress.file_removed()
+        for name in dirnames:
+            p = os.path.join(dirpath, name)
+            if os.path.islink(p):
+                os.unlink(p)
+            else:
+                os.rmdir(p)
+                progress.stats["removed_dirs"] += 1
+    os.rmdir(top)
+    progress.stats["removed_dirs"] += 1
+
+
+def _remove_empty_parents(d: Path, root: Path) -> None:
+    while _under(d, root):
+        try:
+            d.rmdir()  # only if empty
+        except OSError:
+            return
+        d = d.parent
+
+
+@job_handler(CLIENT_PURGE_FILES)
+def purge_client_files(db: Session, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Safe to re-run: files already gone are skipped (listed ones count as missing)."""
+    root = get_docs_root(db)
+    progress = _Progress(payload.get("job_id"), payload.get("expected_files", 0))
+
+    for name in payload.get("dirs", []):
+        if name in ("", ".", "..") or os.sep in name or (os.altsep and os.altsep in name):
+            raise RuntimeError(f"Refusing to delete {name!r}: not a folder directly under the docs root")
+        top = root / name
+        if not top.exists() and not top.is_symlink():
+            continue
+        _remove_tree(top, progress)
+
+    parents = set()
+    for stored in payload.get("files", []):
+        p = Path(stored)
+        path = (p if p.is_absolute() else root / p).resolve()
+        if not _under(path, root):
+            raise RuntimeError(f"Refusing to delete outside docs root: {path}")
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            progress.stats["missing"] += 1
+            continue
+        progress.file_removed()
+        parents.add(path.parent)
+
+    for d in sorted(parents, key=lambda p: len(p.parts), reverse=True):
+        _remove_empty_parents(d, root)
+
+    return {"client_id": payload.get("client_id"), **progress.stats}
@@ -1,15 +1,35 @@
 # app/recurring_utils.py
 from __future__ import annotations
 
+import calendar
 from datetime import date, timedelta
-from typing import Optional
+from functools import lru_cache
+from typing import Iterator, NamedTuple, Optional, Tuple
 
 
+# ---------- calendar tables (memoized) ----------
+
+@lru_cache(maxsize=4096)
 def last_day_of_month(year: int, month: int) -> int:
-    if month == 12:
-        return 31
-    next_month = date(year, month + 1, 1)
-    return (next_month - timedelta(days=1)).day
+    return calendar.monthrange(year, month)[1]
+
+
+@lru_cache(maxsize=16384)
+def nth_weekday(year: int, month: int, weekday: int, week_of_month: int) -> date:
+    """
+    The `week_of_month`-th `weekday` (0=Mon..6=Sun) of the month, e.g. 2nd Tuesday.
+    week_of_month <= 0 means the last one; a 5th that doesn't exist clamps to the last.
+    """
+    if week_of_month > 0:
+        first = date(year, month, 1)
+        offset = (weekday - first.weekday()) % 7
+        candidate = first + timedelta(days=offset + 7 * (week_of_month - 1))
+        if candidate.month == month:
+            return candidate
+
+    last_date = date(year, month, last_day_of_month(year, month))
+    back = (last_date.weekday() - weekday) % 7
+    return last_date - timedelta(days=back)
 
 
 def _add_months(d: date, months: int) -> tuple[int, int]:
@@ -20,6 +40,46 @@ def _add_months(d: date, months: int) -> tuple[int, int]:
     return y, m
 
 
+_SCHEDULE_STEP = {"monthly": 1, "quarterly": 3, "annual": 12}
+
+
+def _step_months(schedule_type: Optional[str]) -> int:
+    # unknown schedule types behave like monthly
+    return _SCHEDULE_STEP.get((schedule_type or "").strip().lower(), 1)
+
+
+def _occurrence_in_month(
+    year: int,
+    month: int,
+    day_of_month: Optional[int],
+    weekday: Optional[int],
+    week_of_month: Optional[int],
+    fallback_day: int,
+) -> date:
+    """Where a rule lands inside one month."""
+    # 1) Day-of-month rule
+    if day_of_month:
+        dom = max(1, min(int(day_of_month), 31))
+        return date(year, month, min(dom, last_day_of_month(year, month)))
+
+    # 2) Weekday-of-month rule: e.g. 2nd Tuesday, last Friday
+    if weekday is not None and week_of_month:
+        return nth_weekday(year, month, int(weekday), int(week_of_month))
+
+    # 3) Fallback: same day-of-month as the reference date
+    return date(year, month, min(fallback_day, last_day_of_month(year, month)))
+
+
+def client_schedule_type(bookkeeping_frequency: Optional[str]) -> str:
+    """Map a client's bookkeeping frequency to a rule schedule_type."""
+    freq = (bookkeeping_frequency or "").lower()
+    if "quarter" in freq:
+        return "quarterly"
+    if "annual" in freq or "year" in freq:
+        return "annual"
+    return "monthly"
+
+
 def advance_next_run(
     schedule_type: str,
     current_next_run: date,
@@ -36,52 +96,12 @@ def advance_next_run(
       - Either use day_of_month OR (weekday + week_of_month). If neither is provided,
         fallback to same day-of-month as current_next_run.
     """
-    st = (schedule_type or "").strip().lower()
-    if st == "monthly":
-        months_to_add = 1
-    elif st == "quarterly":
-        months_to_add = 3
-    elif st == "annual":
-        months_to_add = 12
-    else:
-        months_to_add = 1
-
-    year, month = _add_months(current_next_run, months_to_add)
+    year, month = _add_months(current_next_run, _step_months(schedule_type))
+    return _occurrence_in_month(
+        year, month, day_of_month, weekday, week_of_month, current_next_run.day
+    )
 
-    # 1) Day-of-month rule
-    if day_of_month:
-        dom = int(day_of_month)
-        dom = max(1, min(dom, 31))
-        day = min(dom, last_day_of_month(year, month))
-        return date(year, month, day)
 
-    # 2) Weekday-of-month rule: e.g. 2nd Tuesday, last Friday
-    if weekday is not None and week_of_month:
-        wd = int(weekday)
-        wom = int(week_of_month)
-
-        if wom > 0:
-            first = date(year, month, 1)
-            offset = (wd - first.weekday()) % 7
-            first_occurrence = first + timedelta(days=offset)
-            candidate = first_occurrence + timedelta(weeks=wom - 1)
-            # Guard: if we somehow jumped to next month, clamp to last occurrence in month
-            if candidate.month != month:
-                last_dom = last_day_of_month(year, month)
-                last_date = date(year, month, last_dom)
-                back = (last_date.weekday() - wd) % 7
-                return last_date - timedelta(days=back)
-            return candidate
-        else:
-            # last occurrence
-            last_dom = last_day_of_month(year, month)
-            last_date = date(year, month, last_dom)
-            back = (last_date.weekday() - wd) % 7
-            return last_date - timedelta(days=back)
-
-    # 3) Fallback: same day-of-month as current
-    day = min(current_next_run.day, last_day_of_month(year, month))
-    return date(year, month, day)
 def next_run_from(
     schedule_type: str,
     from_date: date,
@@ -96,59 +116,66 @@ def next_run_from(
 
     Then use advance_next_run() to move to the next cycle after that.
     """
-    st = (schedule_type or "").strip().lower()
-    if st == "monthly":
-        step = 1
-    elif st == "quarterly":
-        step = 3
-    elif st == "annual":
-        step = 12
-    else:
-        step = 1
-
-    def occurrence_in_month(y: int, m: int) -> date:
-        # day-of-month
-        if day_of_month:
-            dom = max(1, min(int(day_of_month), 31))
-            d = min(dom, last_day_of_month(y, m))
-            return date(y, m, d)
-
-        # weekday-of-month
-        if weekday is not None and week_of_month:
-            wd = int(weekday)
-            wom = int(week_of_month)
-
-            if wom > 0:
-                first = date(y, m, 1)
-                offset = (wd - first.weekday()) % 7
-                first_occurrence = first + timedelta(days=offset)
-                candidate = first_occurrence + timedelta(weeks=wom - 1)
-                if candidate.month != m:
-                    # clamp to last occurrence
-                    last_dom = last_day_of_month(y, m)
-                    last_date = date(y, m, last_dom)
-                    back = (last_date.weekday() - wd) % 7
-                    return last_date - timedelta(days=back)
-                return candidate
-            else:
-                # last occurrence
-                last_dom = last_day_of_month(y, m)
-                last_date = date(y, m, last_dom)
-                back = (last_date.weekday() - wd) % 7
-                return last_date - timedelta(days=back)
-
-        # fallback = same day-of-month as from_date
-        d = min(from_date.day, last_day_of_month(y, m))
-        return date(y, m, d)
-    # try in the current month first
-    candidate = occurrence_in_month(from_date.year, from_date.month)
-    if candidate >= from_date:
-        return candidate
+    step = _step_months(schedule_type)
 
-    # otherwise jump ahead by the schedule step until we're >= from_date
-    y, m = _add_months(from_date, step)
+    # try in the current month first
+    y, m = from_date.year, from_date.month
     while True:
-        candidate = occurrence_in_month(y, m)
+        candidate = _occurrence_in_month(y, m, day_of_month, weekday, week_of_month, from_date.day)
         if candidate >= from_date:
             return candidate
+        # otherwise jump ahead by the schedule step until we're >= from_date
         y, m = _add_months(date(y, m, 1), step)
+
+
+# ---------- occurrence generator ----------
+
+class RuleSpec(NamedTuple):
+    """Anything with these attributes works as a rule (RecurringTask rows included)."""
+    schedule_type: str
+    day_of_month: Optional[int] = None
+    weekday: Optional[int] = None
+    week_of_month: Optional[int] = None
+    next_run: Optional[date] = None
+
+
+def occurrences(rule, start: date, end: date) -> Iterator[date]:
+    """
+    Yield the rule's run dates falling in [start, end], in order.
+
+    Walks from rule.next_run (the cycle the rule is currently on) with
+    advance_next_run, so the dates match what run_recurring will materialize.
+    Rules without a next_run start at their first run on/after `start`.
+    """
+    kw = dict(
+        day_of_month=rule.day_of_month,
+        weekday=rule.weekday,
+        week_of_month=rule.week_of_month,
+    )
+    d = getattr(rule, "next_run", None) or next_run_from(rule.schedule_type, start, **kw)
+    while d <= end:
+        if d >= start:
+            yield d
+        nxt = advance_next_run(rule.schedule_type, d, **kw)
+        if nxt <= d:  # misconfigured rule, don't spin
+            return
+        d = nxt
+
+
+@lru_cache(maxsize=4096)
+def occurrences_between(
+    schedule_type: str,
+    first: date,
+    end: date,
+    day_of_month: Optional[int] = None,
+    weekday: Optional[int] = None,
+    week_of_month: Optional[int] = None,
+) -> Tuple[date, ...]:
+    """
+    All run dates from `first` (a rule's next_run) through `end`, inclusive.
+
+    Memoized: most rules share a handful of (schedule, day, next_run) shapes,
+    so a forecast over hundreds of clients only walks each shape once.
+    """
+    spec = RuleSpec(schedule_type, day_of_month, weekday, week_of_month, first)
+    return tuple(occurrences(spec, first, end))
@@ -0,0 +1,241 @@
+# app/restore.py
+"""
+Restore the DB and docs tree from a backup_nightly snapshot.
+
+Stop yb-backend (and the timers) before restoring over the live DB.
+
+    python -m app.restore list
+    python -m app.restore restore latest --dry-run
+    python -m app.restore restore 20260101_020000 --force
+    python -m app.restore restore --at "2026-01-01 12:00" --docs-dest /tmp/docs --no-db
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from .backup_nightly import (
+    CHUNK_SIZE,
+    backup_root,
+    blob_path,
+    list_snapshots,
+    load_manifest,
+    sha256_file,
+    sqlite_db_path,
+)
+from .storage import FILE_MODE
+
+RESTORE_WORKERS = int(os.getenv("YB_RESTORE_WORKERS", str(min(8, (os.cpu_count() or 1) * 2))))
+
+
+def _snapshot_time(snapshot: Path) -> datetime:
+    return datetime.strptime(snapshot.name, "%Y%m%d_%H%M%S")
+
+
+def pick_snapshot(root: Path, name: Optional[str], at: Optional[str]) -> Path:
+    snaps = list_snapshots(root)
+    if not snaps:
+        raise SystemExit(f"[restore] no snapshots under {root}")
+
+    if at:
+        when = datetime.fromisoformat(at)
+        eligible = [s for s in snaps if _snapshot_time(s) <= when]
+        if not eligible:
+            raise SystemExit(f"[restore] no snapshot at or before {at}")
+        return eligible[-1]
+
+    if not name or name == "latest":
+        return snaps[-1]
+
+    for s in snaps:
+        if s.name == name:
+            return s
+    raise SystemExit(f"[restore] snapshot {name} not found")
+
+
+def cmd_list(root: Path) -> None:
+    snaps = list_snapshots(root)
+    if not snaps:
+        print(f"[restore] no snapshots under {root}")
+        return
+    for snap in snaps:
+        m = load_manifest(snap)
+        total = sum(e["size"] for e in m["files"].values())
+        db = "db" if m.get("db") else "no-db"
+        print(f"{snap.name}  {m['created_at']}  files={len(m['files'])}  bytes={total}  {db}")
+
+
+# ---------- workers ----------
+
+def _restore_file(root: Path, dest: Path, entry: dict) -> tuple[str, int]:
+    """
+    Decompress one blob to dest, hashing on the way. Returns (outcome, bytes).
+    Files already present with the right content are left alone, so an
+    interrupted restore can simply be re-run.
+    """
+    sha = entry["sha256"]
+    if dest.exists() and dest.stat().st_size == entry["size"] and sha256_file(dest) == sha:
+        return "unchanged", 0
+
+    blob = blob_path(root, sha)
+    if not blob.exists():
+        return "missing", 0
+
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    h = hashlib.sha256()
+    fd, tmp = tempfile.mkstemp(prefix=".restore-", dir=dest.parent)
+    try:
+        with os.fdopen(fd, "wb") as out, gzip.open(blob, "rb") as src:
+            for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):
+                h.update(chunk)
+                out.write(chunk)
+            os.fchmod(out.fileno(), FILE_MODE)  # not mkstemp's 0600
+        if h.hexdigest() != sha:
+            os.unlink(tmp)
+            return "corrupt", 0
+        os.replace(tmp, dest)
+        # keep mtimes so the next backup run does not re-hash everything
+        mtime_ns = entry.get("mtime_ns")
+        if mtime_ns:
+            os.utime(dest, ns=(mtime_ns, mtime_ns))
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return "restored", entry["size"]
+
+
+def restore_docs(root: Path, manifest: dict, docs_dest: Path, workers: int, dry_run: bool) -> int:
+    files = manifest["files"]
+    total = sum(e["size"] for e in files.values())
+
+    if dry_run:
+        missing = [rel for rel, e in files.items() if not blob_path(root, e["sha256"]).exists()]
+        existing = sum(1 for rel in files if (docs_dest / rel).exists())
+        print(f"[restore] would restore {len(files)} files ({total} bytes) into {docs_dest}")
+        print(f"[restore] {existing} already exist there (overwritten only if content differs)")
+        for rel in missing:
+            print(f"[restore] missing blob for {rel}")
+        return len(missing)
+
+    counts = {"restored": 0, "unchanged": 0, "missing": 0, "corrupt": 0}
+    written = 0
+    started = time.monotonic()
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {
+            pool.submit(_restore_file, root, docs_dest / rel, entry): rel
+            for rel, entry in files.items()
+        }
+        for fut in as_completed(futures):
+            outcome, n = fut.result()
+            counts[outcome] += 1
+            written += n
+            if outcome in ("missing", "corrupt"):
+                print(f"[restore] {outcome}: {futures[fut]}")
+
+    elapsed = time.monotonic() - started
+    rate = written / elapsed / (1024 * 1024) if elapsed > 0 else 0.0
+    print(
+        f"[restore] docs restored={counts['restored']} unchanged={counts['unchanged']} "
+        f"missing={counts['missing']} corrupt={counts['corrupt']} "
+        f"bytes={written} in {elapsed:.1f}s ({rate:.1f} MiB/s)"
+    )
+    return counts["missing"] + counts["corrupt"]
+
+
+def restore_db(snapshot: Path, manifest: dict, db_dest: Path, force: bool, dry_run: bool) -> int:
+    db_info = manifest.get("db")
+    if not db_info:
+        print("[restore] snapshot has no DB copy, skipping DB")
+        return 0
+
+    src = snapshot / db_info["file"]
+    if not src.exists() or sha256_file(src) != db_info["sha256"]:
+        print(f"[restore] DB snapshot {src} missing or corrupt")
+        return 1
+
+    if db_dest.exists() and not force:
+        print(f"[restore] {db_dest} exists; pass --force to overwrite it")
+        return 1
+
+    if dry_run:
+        print(f"[restore] would restore DB ({db_info['size']} bytes) to {db_dest}")
+        return 0
+
+    db_dest.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=".restore-", dir=db_dest.parent)
+    os.close(fd)
+    shutil.copyfile(src, tmp)
+    os.replace(tmp, db_dest)
+    # stale WAL/SHM from the old DB would be replayed onto the restored file
+    for suffix in ("-wal", "-shm"):
+        side = Path(str(db_dest) + suffix)
+        if side.exists():
+            side.unlink()
+    print(f"[restore] DB restored to {db_dest}")
+    return 0
+
+
+def cmd_restore(root: Path, args) -> int:
+    snapshot = pick_snapshot(root, args.snapshot, args.at)
+    manifest = load_manifest(snapshot)
+    print(f"[restore] using snapshot {snapshot.name} ({manifest['created_at']})")
+
+    errors = 0
+    if not args.no_db:
+        db_dest = Path(args.db_dest) if args.db_dest else sqlite_db_path()
+        if db_dest is None:
+            print("[restore] no SQLite DB configured; pass --db-dest or --no-db")
+            errors += 1
+        else:
+            errors += restore_db(snapshot, manifest, db_dest.resolve(), args.force, args.dry_run)
+
+    if not args.no_docs:
+        docs_dest = Path(args.docs_dest or manifest["docs_root"]).expanduser().resolve()
+        errors += restore_docs(root, manifest, docs_dest, args.workers, args.dry_run)
+
+    return errors
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Restore from backup_nightly snapshots")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    sub.add_parser("list", help="list available snapshots")
+
+    rp = sub.add_parser("restore", help="restore DB + docs from a snapshot")
+    rp.add_argument("snapshot", nargs="?", default="latest", help="snapshot name or 'latest'")
+    rp.add_argument("--at", help="newest snapshot at or before this time (ISO, e.g. 2026-01-01T12:00)")
+    rp.add_argument("--db-dest", help="where to write the DB (default: the configured SQLite file)")
+    rp.add_argument("--docs-dest", help="where to write docs (default: docs root recorded in the snapshot)")
+    rp.add_argument("--no-db", action="store_true")
+    rp.add_argument("--no-docs", action="store_true")
+    rp.add_argument("--workers", type=int, default=RESTORE_WORKERS)
+    rp.add_argument("--force", action="store_true", help="overwrite an existing DB file")
+    rp.add_argument("--dry-run", action="store_true")
+
+    args = ap.parse_args()
+    root = backup_root()
+
+    if args.cmd == "list":
+        cmd_list(root)
+        return
+
+    sys.exit(1 if cmd_restore(root, args) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -13,7 +13,7 @@ router = APIRouter(prefix="/accounts", tags=["accounts"])
 
 
 @router.get("/", response_model=List[schemas.AccountOut])
-async def list_accounts(
+def list_accounts(
     client_id: int,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
@@ -33,7 +33,7 @@ async def list_accounts(
     return accounts
 
 @router.post("/seed-defaults/{client_id}", response_model=List[schemas.AccountOut])
-async def seed_defaults(
+def seed_defaults(
     client_id: int,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
@@ -52,7 +52,7 @@ async def seed_defaults(
 @router.post(
     "/", response_model=schemas.AccountOut, status_code=status.HTTP_201_CREATED
 )
-async def create_account(
+def create_account(
     account_in: schemas.AccountCreate,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
@@ -76,7 +76,7 @@ async def create_account(
 
 
 @router.put("/{account_id}", response_model=schemas.AccountOut)
-async def update_account(
+def update_account(
     account_id: int,
     account_in: schemas.AccountUpdate,
     db: Session = Depends(get_db),
@@ -102,7 +102,7 @@ async def update_account(
 
 
 @router.delete("/{account_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_account(
+def delete_account(
     account_id: int,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
@@ -1,33 +1,185 @@
-from typing import List, Optional
-from fastapi import APIRouter, Depends
+import csv
+import io
+import json
+from datetime import datetime, timezone
+from typing import Iterator, List, Literal, Optional
+
+from fastapi import APIRouter, Depends, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, or_, select
 from sqlalchemy.orm import Session
 
-from .database import get_db
+from .database import SessionLocal, get_db
 from . import models, schemas
 from .auth import require_admin_or_owner
+from .pagination import after_keyset, paginate
 
 router = APIRouter(prefix="/admin/audit", tags=["admin-audit"])
 
+# Keyset: newest first, id as tiebreaker. With an equality filter on action or
+# client_id the (x, created_at) composite indexes (+ rowid) serve this order directly.
+AUDIT_ORDER = [("created_at", True, None), ("id", True, None)]
+
+EXPORT_BATCH = 1000
+EXPORT_COLUMNS = ["id", "created_at", "actor_user_id", "action", "entity_type", "entity_id", "client_id", "meta"]
+
+# Past the end of any string starting with a given prefix
+_PREFIX_END = "\U0010ffff"
+
+
+def _starts_with(col, prefix: str):
+    # range form so the B-tree index is used (LIKE is case-insensitive in SQLite and can't)
+    return and_(col >= prefix, col < prefix + _PREFIX_END)
+
+
+def _action_filter(action: str):
+    """
+    "client.purge"  -> that action and anything under it ("client.purge.executed")
+    "client.up*"    -> plain prefix match
+    """
+    col = models.AuditEvent.action
+    if action.endswith("*"):
+        return _starts_with(col, action[:-1])
+    return or_(col == action, _starts_with(col, action.rstrip(".") + "."))
+
+
+def _naive_utc(dt: datetime) -> datetime:
+    # created_at is stored as naive UTC
+    if dt.tzinfo is not None:
+        return dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def _criteria(
+    client_id: Optional[int],
+    actor_user_id: Optional[int],
+    action: Optional[str],
+    entity_type: Optional[str],
+    since: Optional[datetime],
+    until: Optional[datetime],
+) -> list:
+    AE = models.AuditEvent
+    out = []
+    if client_id is not None:
+        out.append(AE.client_id == client_id)
+    if actor_user_id is not None:
+        out.append(AE.actor_user_id == actor_user_id)
+    if action and action.strip():
+        out.append(_action_filter(action.strip()))
+    if entity_type and entity_type.strip():
+        out.append(AE.entity_type == entity_type.strip())
+    if since is not None:
+        out.append(AE.created_at >= _naive_utc(since))
+    if until is not None:
+        out.append(AE.created_at < _naive_utc(until))
+    return out
+
+
 @router.get("", response_model=List[schemas.AuditEventOut])
 def list_audit_events(
+    response: Response,
     client_id: Optional[int] = None,
     actor_user_id: Optional[int] = None,
     action: Optional[str] = None,
     entity_type: Optional[str] = None,
-    limit: int = 200,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = 200,  # clamped to MAX_PAGE_SIZE; page further with cursor
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(require_admin_or_owner),
 ):
-    q = db.query(models.AuditEvent)
+    """
+    Newest first. Pass the X-Next-Cursor value back as cursor for the next page.
+    since/until bound created_at (until is exclusive). entity_type is exact;
+    action matches itself and its dotted children, or any prefix with a trailing *.
+    """
+    q = db.query(models.AuditEvent).filter(
+        *_criteria(client_id, actor_user_id, action, entity_type, since, until)
+    )
+    return paginate(q, models.AuditEvent, AUDIT_ORDER, limit=limit, cursor=cursor, response=response)
 
-    if client_id is not None:
-        q = q.filter(models.AuditEvent.client_id == client_id)
-    if actor_user_id is not None:
-        q = q.filter(models.AuditEvent.actor_user_id == actor_user_id)
-    if action:
-        q = q.filter(models.AuditEvent.action.ilike(f"%{action}%"))
-    if entity_type:
-        q = q.filter(models.AuditEvent.entity_type.ilike(f"%{entity_type}%"))
-
-    limit = max(1, min(limit, 1000))
-    return q.order_by(models.AuditEvent.created_at.desc()).limit(limit).all()
\ No newline at end of file
+
+def _export_batches(criteria: list) -> Iterator[list]:
+    """
+    Walk every matching row newest-first in keyset batches, so memory stays
+    flat however large the export. Uses its own session: the request's one is
+    closed before a streamed body finishes.
+    """
+    AE = models.AuditEvent
+    cols = [getattr(AE, name) for name in EXPORT_COLUMNS]
+    db = SessionLocal()
+    try:
+        last = None
+        while True:
+            stmt = select(*cols).where(*criteria)
+            if last is not None:
+                stmt = stmt.where(after_keyset([AE.created_at, AE.id], AUDIT_ORDER, last))
+            stmt = stmt.order_by(AE.created_at.desc(), AE.id.desc()).limit(EXPORT_BATCH)
+            rows = db.execute(stmt).all()
+            if not rows:
+                return
+            yield rows
+            last = [rows[-1].created_at, rows[-1].id]
+            # drop the read snapshot between batches so WAL checkpoints aren't held up
+            db.rollback()
+    finally:
+        db.close()
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _ndjson(batches: Iterator[list]) -> Iterator[bytes]:
+    for rows in batches:
+        yield "".join(
+            json.dumps(dict(zip(EXPORT_COLUMNS, row)), separators=(",", ":"), default=_json_default) + "\n"
+            for row in rows
+        ).encode("utf-8")
+
+
+def _csv(batches: Iterator[list]) -> Iterator[bytes]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(EXPORT_COLUMNS)
+    for rows in batches:
+        writer.writerows(
+            (r.id, r.created_at.isoformat(), r.actor_user_id, r.action, r.entity_type,
+             r.entity_id, r.client_id, json.dumps(r.meta) if r.meta is not None else "")
+            for r in rows
+        )
+        yield buf.getvalue().encode("utf-8")
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue().encode("utf-8")
+
+
+@router.get("/export")
+def export_audit_events(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    client_id: Optional[int] = None,
+    actor_user_id: Optional[int] = None,
+    action: Optional[str] = None,
+    entity_type: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    current_user: models.User = Depends(require_admin_or_owner),
+):
+    """Stream every matching event (same filters as the list, no row cap)."""
+    criteria = _criteria(client_id, actor_user_id, action, entity_type, since, until)
+    batches = _export_batches(criteria)
+
+    stamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    if format == "csv":
+        body, media_type = _csv(batches), "text/csv"
+    else:
+        body, media_type = _ndjson(batches), "application/x-ndjson"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="audit-{stamp}.{format}"'},
+    )
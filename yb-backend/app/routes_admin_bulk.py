@@ -0,0 +1,104 @@
+# app/routes_admin_bulk.py
+from datetime import datetime
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from .database import get_db
+from . import bulk, models, schemas
+from .audit import log_event
+from .auth import require_admin_or_owner
+
+router = APIRouter(prefix="/admin/bulk", tags=["admin-bulk"])
+
+MAX_ERRORS = 200
+
+Format = Literal["csv", "ndjson", "parquet"]
+
+
+def _http_error(e: bulk.BulkError) -> HTTPException:
+    if isinstance(e, bulk.UnknownEntity):
+        return HTTPException(status_code=404, detail=str(e))
+    if isinstance(e, bulk.MissingDependency):
+        return HTTPException(status_code=501, detail=str(e))
+    return HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("", response_model=List[schemas.BulkEntityOut])
+def list_entities(current_user: models.User = Depends(require_admin_or_owner)):
+    """Every table that can be exported / imported, with its match key and ref columns."""
+    return [
+        {
+            "name": e.name,
+            "key": list(e.key),
+            "columns": e.export_columns,
+            "refs": [r._asdict() for r in e.refs],
+            "importable": e.importable,
+        }
+        for e in bulk.ENTITIES.values()
+    ]
+
+
+@router.get("/{entity}/export")
+def export_entity(
+    entity: str,
+    format: Format = "csv",
+    current_user: models.User = Depends(require_admin_or_owner),
+):
+    """Stream the whole table. Foreign keys also come out as natural keys (client, assigned_user, ...)."""
+    try:
+        body = bulk.export(entity, format)
+    except bulk.BulkError as e:
+        raise _http_error(e)
+
+    stamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    return StreamingResponse(
+        body,
+        media_type=bulk.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{entity}-{stamp}.{format}"'},
+    )
+
+
+@router.post("/{entity}/import", response_model=schemas.BulkImportResult)
+def import_entity(
+    entity: str,
+    file: UploadFile = File(...),
+    format: Optional[Format] = None,  # default: from the file name, else csv
+    key: Optional[str] = None,  # comma-separated match columns; default: the natural key
+    dry_run: bool = False,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(require_admin_or_owner),
+):
+    """
+    Upsert rows from a CSV / NDJSON / Parquet file in chunks. Rows that fail
+    are reported by line and skipped; the rest are kept. Ref columns (client,
+    assigned_user, ...) win over raw ids. With dry_run every chunk is rolled back.
+    """
+    fmt = format or bulk.format_for(file.filename)
+    match = [k.strip() for k in key.split(",") if k.strip()] if key else None
+    try:
+        result = bulk.import_rows(
+            db, entity, bulk.read_rows(file.file, fmt),
+            key=match, dry_run=dry_run, actor_id=current_user.id,
+        )
+    except bulk.BulkError as e:
+        raise _http_error(e)
+
+    if not dry_run:
+        log_event(
+            db,
+            actor_user_id=current_user.id,
+            action="bulk.import",
+            entity_type=entity,
+            meta={
+                "filename": file.filename,
+                "format": fmt,
+                "created": result.created,
+                "updated": result.updated,
+                "failed": len(result.errors),
+            },
+        )
+        db.commit()
+    return result.as_dict(max_errors=MAX_ERRORS)
@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session
 from .database import get_db
 from . import models, schemas
 from .auth import require_admin_or_owner
+from .settings import invalidate_settings, upsert_settings
 
 router = APIRouter(prefix="/admin/settings", tags=["admin-settings"])
 
@@ -33,19 +34,9 @@ def upsert_setting(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(require_admin_or_owner),
 ):
-    row = db.query(models.AppSetting).filter(models.AppSetting.key == key).first()
-    if row:
-        row.value = payload.value
-        row.updated_by_id = current_user.id
-    else:
-        row = models.AppSetting(
-            key=key,
-            value=payload.value,
-            updated_by_id=current_user.id,
-        )
-        db.add(row)
-
+    (row,) = upsert_settings(db, {key: payload.value}, updated_by_id=current_user.id)
     db.commit()
+    invalidate_settings()
     db.refresh(row)
     return row
 
@@ -55,19 +46,10 @@ def bulk_upsert_settings(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(require_admin_or_owner),
 ):
-    out = []
-    for key, value in payload.settings.items():
-        row = db.query(models.AppSetting).filter(models.AppSetting.key == key).first()
-        if row:
-            row.value = value
-            row.updated_by_id = current_user.id
-        else:
-            row = models.AppSetting(key=key, value=value, updated_by_id=current_user.id)
-            db.add(row)
-        out.append(row)
-
+    out = upsert_settings(db, payload.settings, updated_by_id=current_user.id)
     db.commit()
-    # refresh rows so updated_at is present
+    invalidate_settings()
+    # refresh rows so updated_at / version are present
     for r in out:
         db.refresh(r)
     return out
@@ -1,12 +1,14 @@
 # app/routes_auth.py
+import os
 from datetime import timedelta
 
-from fastapi import APIRouter, Depends, HTTPException, status, Response
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Response
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 
 from .database import get_db
 from . import models, schemas
+from .coordination import RateLimit
 from .auth import (
     authenticate_user,
     create_access_token,
@@ -18,15 +20,35 @@ from .auth import (
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
+# Failed logins per email and per client IP, counted in the DB so every
+# worker / host enforces the same budget. Checked before bcrypt runs.
+LOGIN_FAILURES = RateLimit(
+    "login",
+    limit=int(os.getenv("YB_LOGIN_MAX_FAILURES", "10")),
+    window_seconds=int(os.getenv("YB_LOGIN_WINDOW_SECONDS", "300")),
+)
+
+
 @router.post("/login", response_model=schemas.TokenResponse)
 def login(
     email: str,
     password: str,
+    request: Request,
     response: Response,
     db: Session = Depends(get_db),
 ):
+    keys = (f"email:{email.strip().lower()}", f"ip:{request.client.host if request.client else '-'}")
+    wait = LOGIN_FAILURES.retry_after(*keys)
+    if wait:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many failed logins, try again later",
+            headers={"Retry-After": str(wait)},
+        )
+
     user = authenticate_user(db, email, password)
     if not user:
+        LOGIN_FAILURES.hit(*keys)
         raise HTTPException(status_code=401, detail="Incorrect email or password")
 
     token = create_access_token(
@@ -53,13 +75,13 @@ async def logout(response: Response):
 
 
 @router.get("/me", response_model=schemas.UserOut)
-async def get_me(current_user: models.User = Depends(get_current_user)):
+def get_me(current_user: models.User = Depends(get_current_user)):
     return current_user
 
 
 # One-time helper to create the first admin user
 @router.post("/init-admin", response_model=schemas.UserOut)
-async def init_admin(
+def init_admin(
     user_in: schemas.UserCreate, db: Session = Depends(get_db)
 ):
     """
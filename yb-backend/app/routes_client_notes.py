@@ -30,7 +30,7 @@ def _note_to_out(note: models.ClientNote) -> schemas.ClientNoteOut:
     )
 
 @router.get("/", response_model=List[schemas.ClientNoteOut])
-async def list_client_notes(
+def list_client_notes(
     client_id: int,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
@@ -49,7 +49,7 @@ async def list_client_notes(
 
 
 @router.post("/", response_model=schemas.ClientNoteOut, status_code=status.HTTP_201_CREATED)
-async def create_client_note(
+def create_client_note(
     client_id: int,
     note_in: schemas.ClientNoteCreate,
     db: Session = Depends(get_db),
@@ -71,7 +71,7 @@ async def create_client_note(
 
 
 @router.put("/{note_id}", response_model=schemas.ClientNoteOut)
-async def update_client_note(
+def update_client_note(
     client_id: int,
     note_id: int,
     note_in: schemas.ClientNoteUpdate,
@@ -101,7 +101,7 @@ async def update_client_note(
 
 
 @router.delete("/{note_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_client_note(
+def delete_client_note(
     client_id: int,
     note_id: int,
     db: Session = Depends(get_db),
@@ -1,19 +1,19 @@
 # app/routes_clients.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 from sqlalchemy import or_
 from typing import List, Optional
 from datetime import date, timedelta, datetime
-from pathlib import Path
 import os
 from .database import get_db
 from . import models, schemas
 from .auth import get_current_user,require_admin, require_owner, require_staff
-from .onboarding import create_onboarding_tasks_for_client as create_onboarding_tasks_helper
+from .jobs import JOB_ID_HEADER, enqueue_client_provisioning, run_inline_if_enabled
 from .audit import log_event
-from .recurring_utils import advance_next_run
-from .permissions import assert_client_access, is_owner, is_admin, is_manager, is_bookkeeper
-from .storage import get_docs_root, abs_doc_path
+from .recurring_utils import advance_next_run, client_schedule_type
+from .pagination import MAX_PAGE_SIZE, paginate, parse_fields
+from .permissions import assert_client_access, clear_principals, invalidate_principals, is_owner, is_admin, is_manager, is_bookkeeper
+from .purge import enqueue_file_cleanup, plan_file_cleanup, purge_client_rows
 
 from .models import (
     Client,
@@ -23,61 +23,20 @@ from .models import (
 )
 
 router = APIRouter(prefix="/clients", tags=["clients"])
-# Make docs root configurable for your future NAS move
 
-
-
-def _safe_unlink_abs(abs_path: Path, docs_root: Path) -> None:
-    abs_path = abs_path.resolve()
-    docs_root = docs_root.resolve()
-
-    try:
-        abs_path.relative_to(docs_root)
-    except ValueError:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Refusing to delete outside docs root: {abs_path}",
-        )
-
-    try:
-        abs_path.unlink()
-    except FileNotFoundError:
-        return
-    except IsADirectoryError:
-        # If somehow a dir path sneaks in, don't nuke it here
-        return
-
-def _cleanup_empty_parents(start_dir: Path, docs_root: Path) -> None:
-    """
-    Try to remove empty directories up to docs_root.
-    Stops when a directory isn't empty.
-    """
-    d = start_dir.resolve()
-    docs_root = docs_root.resolve()
-
-    while True:
-        if d == docs_root:
-            return
-
-        # Stop if we are no longer under docs_root
-        try:
-            d.relative_to(docs_root)
-        except ValueError:
-            return
-
-        try:
-            d.rmdir()  # only removes if empty
-        except OSError:
-            return
-
-        d = d.parent
+# Keyset for cursor pagination
+CLIENT_ORDER = [("legal_name", False, None), ("id", False, None)]
 
 
 @router.get("/", response_model=List[schemas.ClientOut])
-async def list_clients(
+def list_clients(
+    response: Response,
     q: Optional[str] = None,
     tier: Optional[str] = None,
     manager_id: Optional[str] = None,
+    limit: Optional[int] = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
 ):
@@ -119,7 +78,15 @@ async def list_clients(
             pass
 
 
-    return query.order_by(models.Client.legal_name).all()
+    return paginate(
+        query,
+        models.Client,
+        CLIENT_ORDER,
+        limit=limit,
+        cursor=cursor,
+        fields=parse_fields(fields, models.Client),
+        response=response,
+    )
 
 def create_default_recurring_tasks_for_client(db, client, created_by_user_id: int | None = None):
     templates = (
@@ -176,13 +143,7 @@ def create_default_recurring_tasks_for_client(db, client, created_by_user_id: in
         db.add_all(templates)
         db.commit()
     # Resolve schedule type from client bookkeeping frequency
-    freq = (client.bookkeeping_frequency or "").lower()
-    if "quarter" in freq:
-        client_sched = "quarterly"
-    elif "annual" in freq or "year" in freq:
-        client_sched = "annual"
-    else:
-        client_sched = "monthly"
+    client_sched = client_schedule_type(client.bookkeeping_frequency)
 
     def pick_assignee(default_role: str | None) -> int | None:
         role = (default_role or "").lower().strip()
@@ -269,29 +230,28 @@ def create_default_recurring_tasks_for_client(db, client, created_by_user_id: in
     db.commit()
 
 @router.post("/", response_model=schemas.ClientOut, status_code=status.HTTP_201_CREATED)
-async def create_client(
+def create_client(
+    response: Response,
     client_in: schemas.ClientCreate,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
 ):
     new_client = models.Client(**client_in.dict())
     db.add(new_client)
+    db.flush()
+
+    # Default recurring rules + onboarding tasks are created by the job worker;
+    # the job row commits with the client so the work can't get lost.
+    job = enqueue_client_provisioning(db, new_client, created_by_user_id=current_user.id)
     db.commit()
     db.refresh(new_client)
+    invalidate_principals(new_client.manager_id, new_client.bookkeeper_id)
 
-    # 1) Create the default recurring rules + first tasks (unchanged for now)
-    create_default_recurring_tasks_for_client(db, new_client, created_by_user_id=current_user.id)
-
-    # 2) Create onboarding tasks from templates (Admin/Manager, etc.)
-    create_onboarding_tasks_helper(
-        db=db,
-        client=new_client,
-        created_by_user_id=current_user.id,
-    )
-
+    run_inline_if_enabled(job.id)
+    response.headers[JOB_ID_HEADER] = str(job.id)
     return new_client
 @router.get("/{client_id}", response_model=schemas.ClientOut)
-async def get_client(
+def get_client(
     client_id: int,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
@@ -301,7 +261,7 @@ async def get_client(
 
 
 @router.put("/{client_id}", response_model=schemas.ClientOut)
-async def update_client(
+def update_client(
     client_id: int,
     client_in: schemas.ClientUpdate,
     db: Session = Depends(get_db),
@@ -345,18 +305,21 @@ async def update_client(
         data.pop("primary_contact_id", None)
 
     # Apply all remaining fields normally
+    old_staff = (client.manager_id, client.bookkeeper_id)
     for field, value in data.items():
         setattr(client, field, value)
 
     db.commit()
     db.refresh(client)
+    if old_staff != (client.manager_id, client.bookkeeper_id):
+        invalidate_principals(*old_staff, client.manager_id, client.bookkeeper_id)
     return client
 
 @router.get(
     "/{client_id}/onboarding-tasks",
     response_model=List[schemas.TaskOut],
 )
-async def list_client_onboarding_tasks(
+def list_client_onboarding_tasks(
     client_id: int,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
@@ -448,6 +411,7 @@ def create_client_purge_request(
 def approve_and_execute_client_purge(
     client_id: int,
     request_id: int,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(require_owner),
 ):
@@ -477,60 +441,12 @@ def approve_and_execute_client_purge(
     pr.approved_by_id = current_user.id
     pr.approved_at = datetime.utcnow()
     db.flush()
-    docs_root = get_docs_root(db)
 
     try:
-        # 1) Delete document files from disk (then DB rows)
-        docs = db.query(models.Document).filter(models.Document.client_id == client_id).all()
-        for doc in docs:
-            if doc.stored_path:
-                abs_path = abs_doc_path(db, doc.stored_path)
-                _safe_unlink_abs(abs_path, docs_root)
-                _cleanup_empty_parents(abs_path.parent, docs_root)
-
-        db.query(models.Document).filter(models.Document.client_id == client_id).delete(
-            synchronize_session=False
-        )
-
-        # 2) Tasks: delete children first (subtasks/notes), then tasks
-        task_ids = [
-            tid for (tid,) in db.query(models.Task.id).filter(models.Task.client_id == client_id).all()
-        ]
-        if task_ids:
-            db.query(models.TaskSubtask).filter(models.TaskSubtask.task_id.in_(task_ids)).delete(
-                synchronize_session=False
-            )
-            db.query(models.TaskNote).filter(models.TaskNote.task_id.in_(task_ids)).delete(
-                synchronize_session=False
-            )
-            db.query(models.Task).filter(models.Task.id.in_(task_ids)).delete(
-                synchronize_session=False
-            )
-
-        # 3) Other client-linked tables
-        db.query(models.Account).filter(models.Account.client_id == client_id).delete(synchronize_session=False)
-        db.query(models.RecurringTask).filter(models.RecurringTask.client_id == client_id).delete(synchronize_session=False)
-        db.query(models.ClientNote).filter(models.ClientNote.client_id == client_id).delete(synchronize_session=False)
-
-        # 4) Intake rows for this client (true purge = delete, not detach)
-        intake_ids = [
-            iid for (iid,) in db.query(models.ClientIntake.id).filter(models.ClientIntake.client_id == client_id).all()
-        ]
-        if intake_ids:
-            db.query(models.IntakeOwner).filter(models.IntakeOwner.intake_id.in_(intake_ids)).delete(
-                synchronize_session=False
-            )
-            db.query(models.ClientIntake).filter(models.ClientIntake.id.in_(intake_ids)).delete(
-                synchronize_session=False
-            )
-
-        # 5) Purge requests must go too (your FK is non-nullable)
-        db.query(models.ClientPurgeRequest).filter(models.ClientPurgeRequest.client_id == client_id).delete(
-            synchronize_session=False
-        )
-
-        # 6) Finally delete the client row
-        db.delete(client)
+        # Files are only read here; the job removes them once the rows are gone
+        plan = plan_file_cleanup(db, client_id)
+        deleted = purge_client_rows(db, client_id)
+        job = enqueue_file_cleanup(db, plan, created_by_id=current_user.id)
         log_event(
             db,
             actor_user_id=current_user.id,
@@ -538,14 +454,22 @@ def approve_and_execute_client_purge(
             entity_type="client",
             entity_id=client_id,
             client_id=client_id,
-            meta={"purge_request_id": request_id},
+            meta={"purge_request_id": request_id, "deleted": deleted, "files_job_id": job.id},
         )
         db.commit()
-        return {"message": "Client and related data purged successfully."}
-
     except Exception as e:
         db.rollback()
         raise HTTPException(
             status_code=500,
             detail=f"An error occurred during purge: {str(e)}",
         )
+
+    # Anyone (staff or portal user) may have had this client in their access set
+    clear_principals()
+    run_inline_if_enabled(job.id)
+    response.headers[JOB_ID_HEADER] = str(job.id)
+    return {
+        "message": "Client and related data purged; document files are being removed.",
+        "deleted": deleted,
+        "files_job_id": job.id,
+    }
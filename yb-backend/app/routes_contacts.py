@@ -7,12 +7,17 @@ from sqlalchemy import or_
 from .database import get_db
 from . import models, schemas
 from .auth import get_current_user, require_admin
+from .pagination import MAX_PAGE_SIZE, paginate, parse_fields
 
 router = APIRouter(prefix="/contacts", tags=["contacts"])
 
+# Keyset for cursor pagination
+CONTACT_ORDER = [("name", False, None), ("id", False, None)]
+
 
 @router.get("/", response_model=List[schemas.ContactOut])
-async def list_contacts(
+def list_contacts(
+    response: Response,
     q: Optional[str] = Query(
         default=None,
         description="Search by name, email, or phone",
@@ -22,6 +27,9 @@ async def list_contacts(
         alias="type",
         description="Filter by type: individual or entity",
     ),
+    limit: Optional[int] = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
 ):
@@ -42,14 +50,19 @@ async def list_contacts(
     if type_filter:
         query = query.filter(models.Contact.type == type_filter)
 
-    return (
-        query.order_by(models.Contact.name.asc())
-        .all()
+    return paginate(
+        query,
+        models.Contact,
+        CONTACT_ORDER,
+        limit=limit,
+        cursor=cursor,
+        fields=parse_fields(fields, models.Contact),
+        response=response,
     )
 
 
 @router.post("/", response_model=schemas.ContactOut, status_code=status.HTTP_201_CREATED)
-async def create_contact(
+def create_contact(
     contact_in: schemas.ContactCreate,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
@@ -66,7 +79,7 @@ async def create_contact(
 
 
 @router.get("/{contact_id}", response_model=schemas.ContactOut)
-async def get_contact(
+def get_contact(
     contact_id: int,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
@@ -78,7 +91,7 @@ async def get_contact(
 
 
 @router.put("/{contact_id}", response_model=schemas.ContactOut)
-async def update_contact(
+def update_contact(
     contact_id: int,
     contact_in: schemas.ContactUpdate,
     db: Session = Depends(get_db),
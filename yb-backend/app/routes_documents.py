@@ -2,24 +2,32 @@
 from typing import List, Optional
 from pathlib import Path
 from datetime import date
+from email.utils import formatdate, parsedate_to_datetime
+import mimetypes
+import os
 import re
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, status
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query, Request, Response, status
 from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
 
 from .database import get_db
 from . import models, schemas
 from .auth import get_current_user, require_admin
-from .models import AppSetting
+from .pagination import MAX_PAGE_SIZE, paginate, parse_fields
 from .permissions import assert_client_upload_allowed, assert_client_access
-from .storage import get_docs_root, abs_doc_path
+from .storage import get_docs_root, abs_doc_path, save_upload_stream
 
 router = APIRouter(prefix="/documents", tags=["documents"])
 
-# Default docs path (used if no app_setting exists)
-DEFAULT_DOCS_DIR = Path("/home/kruzer04/YBTM/YB-TM/docs")
-
+# Keyset for cursor pagination (client-level docs, i.e. no account, sort first)
+DOCUMENT_ORDER = [
+    ("client_id", False, None),
+    ("account_id", False, 0),
+    ("year", False, None),
+    ("month", False, None),
+    ("id", False, None),
+]
 
 def _safe_folder_name(name: str) -> str:
     """
@@ -33,11 +41,15 @@ def _safe_folder_name(name: str) -> str:
 
 @router.get("/", response_model=List[schemas.DocumentOut])
 def list_documents(
+    response: Response,
     client_id: Optional[int] = None,
     account_id: Optional[int] = None,
     year: Optional[int] = None,
     doc_type: Optional[str] = None,
     folder: Optional[str] = None,
+    limit: Optional[int] = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
 ):
@@ -68,18 +80,21 @@ def list_documents(
     if folder is not None:
         q = q.filter(models.Document.folder == folder)
 
-    return q.order_by(
-        models.Document.client_id.asc(),
-        models.Document.account_id.asc().nullsfirst(),
-        models.Document.year.asc(),
-        models.Document.month.asc(),
-    ).all()
+    return paginate(
+        q,
+        models.Document,
+        DOCUMENT_ORDER,
+        limit=limit,
+        cursor=cursor,
+        fields=parse_fields(fields, models.Document),
+        response=response,
+    )
 @router.post(
     "/upload",
     response_model=schemas.DocumentOut,
     status_code=status.HTTP_201_CREATED,
 )
-async def upload_document(
+def upload_document(
     client_id: int = Form(...),
     account_id: int = Form(...),
     statement_date: date = Form(...),
@@ -121,10 +136,9 @@ async def upload_document(
         / stored_filename
     )
     abs_path = docs_root / relative_path
-    abs_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with abs_path.open("wb") as f:
-        f.write(await file.read())
+    # Handler runs in the threadpool; stream + hash the spooled upload into place
+    size_bytes, sha256 = save_upload_stream(file.file, abs_path)
 
     doc = models.Document(
         client_id=client_id,
@@ -137,6 +151,8 @@ async def upload_document(
         original_filename=file.filename,
         stored_filename=stored_filename,
         stored_path=str(relative_path),  # <-- RELATIVE stored
+        sha256=sha256,
+        size_bytes=size_bytes,
         uploaded_by=current_user.id,
     )
     db.add(doc)
@@ -150,7 +166,7 @@ async def upload_document(
     response_model=schemas.DocumentOut,
     status_code=status.HTTP_201_CREATED,
 )
-async def upload_general_document(
+def upload_general_document(
     client_id: int = Form(...),
     document_date: date = Form(...),
     folder: Optional[str] = Form(None),
@@ -187,10 +203,9 @@ async def upload_general_document(
     )
 
     abs_path = docs_root / relative_path
-    abs_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with abs_path.open("wb") as f:
-        f.write(await file.read())
+    # Handler runs in the threadpool; stream + hash the spooled upload into place
+    size_bytes, sha256 = save_upload_stream(file.file, abs_path)
 
     doc = models.Document(
         client_id=client_id,
@@ -203,6 +218,8 @@ async def upload_general_document(
         original_filename=file.filename,
         stored_filename=stored_filename,
         stored_path=str(relative_path),  # <-- RELATIVE stored
+        sha256=sha256,
+        size_bytes=size_bytes,
         uploaded_by=current_user.id,
     )
     db.add(doc)
@@ -211,9 +228,37 @@ async def upload_general_document(
     return doc
 
 
+def _etag_for(doc: models.Document, st: os.stat_result) -> str:
+    # Strong validator: the content hash when we have it, else mtime+size
+    if doc.sha256:
+        return f'"{doc.sha256}"'
+    return f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+
+
+def _not_modified(request: Request, etag: str, mtime: float) -> bool:
+    """RFC 9110 conditional GET: If-None-Match wins over If-Modified-Since."""
+    inm = request.headers.get("if-none-match")
+    if inm is not None:
+        tags = [t.strip() for t in inm.split(",")]
+        if "*" in tags:
+            return True
+        # weak comparison for If-None-Match
+        return etag in [t[2:] if t.startswith("W/") else t for t in tags]
+
+    ims = request.headers.get("if-modified-since")
+    if ims:
+        try:
+            since = parsedate_to_datetime(ims)
+        except (TypeError, ValueError):
+            return False
+        return int(mtime) <= since.timestamp()
+    return False
+
+
 @router.get("/{document_id}/download")
 def download_document(
     document_id: int,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
 ):
@@ -224,15 +269,31 @@ def download_document(
     assert_client_access(db, current_user, doc.client_id)
 
     abs_path = abs_doc_path(db, doc.stored_path)
-    if not abs_path.exists():
+    try:
+        st = abs_path.stat()
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail="File not found on disk")
 
-    # Force inline viewing
+    etag = _etag_for(doc, st)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(st.st_mtime, usegmt=True),
+        # Authenticated content: browser may cache, but must revalidate
+        "Cache-Control": "private, no-cache",
+    }
+    if _not_modified(request, etag, st.st_mtime):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    media_type = mimetypes.guess_type(doc.stored_filename)[0] or "application/octet-stream"
+
+    # Force inline viewing. FileResponse handles Range / If-Range (206, 416).
     return FileResponse(
         abs_path,
-        media_type="application/pdf",
+        media_type=media_type,
         filename=doc.stored_filename,
         content_disposition_type="inline",
+        headers=headers,
+        stat_result=st,
     )
 
 
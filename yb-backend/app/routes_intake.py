@@ -3,17 +3,20 @@ from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status, Body, Response
 from sqlalchemy.orm import Session
-from .accounts_seed import seed_default_accounts_for_client
 from .database import get_db
 from . import models, schemas
 from .auth import get_current_user, require_admin, require_admin_or_owner
 from datetime import datetime, date, timedelta
-from .onboarding import create_onboarding_tasks_for_client
-from .routes_clients import create_default_recurring_tasks_for_client
+from .jobs import JOB_ID_HEADER, enqueue_client_provisioning, run_inline_if_enabled
+from .pagination import MAX_PAGE_SIZE, paginate, parse_fields
+from .permissions import invalidate_principals
 import json
-from .recurring_utils import advance_next_run, next_run_from
+from .recurring_utils import advance_next_run, client_schedule_type, next_run_from
 router = APIRouter(prefix="/intake", tags=["client-intake"])
 
+# Keyset for cursor pagination: newest first
+INTAKE_ORDER = [("created_at", True, None), ("id", True, None)]
+
 def _client_intake_column_names() -> set[str]:
     # Only keep fields that actually exist as SQLAlchemy columns
     return set(models.ClientIntake.__table__.columns.keys())
@@ -65,7 +68,7 @@ def _normalize_intake_payload(data: dict) -> dict:
     return data
 
 @router.post("/", response_model=schemas.ClientIntakeOut, status_code=status.HTTP_201_CREATED)
-async def create_intake(
+def create_intake(
     intake_in: schemas.ClientIntakeCreate,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
@@ -122,7 +125,8 @@ def _repair_orphaned_intakes(db: Session) -> int:
 
 
 @router.get("/", response_model=List[schemas.ClientIntakeOut])
-async def list_intakes(
+def list_intakes(
+    response: Response,
     status_filter: Optional[str] = Query(
         default=None,
         alias="status",
@@ -132,6 +136,9 @@ async def list_intakes(
         default=None,
         description="Search by legal name, DBA, or primary contact",
     ),
+    limit: Optional[int] = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
 ):
@@ -151,12 +158,19 @@ async def list_intakes(
             | models.ClientIntake.primary_contact_name.ilike(like)
         )
 
-    q = q.order_by(models.ClientIntake.created_at.desc())
-    return q.all()
+    return paginate(
+        q,
+        models.ClientIntake,
+        INTAKE_ORDER,
+        limit=limit,
+        cursor=cursor,
+        fields=parse_fields(fields, models.ClientIntake),
+        response=response,
+    )
 
 
 @router.get("/{intake_id}", response_model=schemas.ClientIntakeOut)
-async def get_intake(
+def get_intake(
     intake_id: int,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
@@ -168,7 +182,7 @@ async def get_intake(
 
 
 @router.put("/{intake_id}", response_model=schemas.ClientIntakeOut)
-async def update_intake(
+def update_intake(
     intake_id: int,
     intake_in: schemas.ClientIntakeUpdate,
     db: Session = Depends(get_db),
@@ -254,14 +268,7 @@ def create_custom_recurring_tasks_from_intake(db, client, intake, created_by_use
         except Exception:
             rules = []
 
-    # resolve schedule type from client frequency
-    freq = (client.bookkeeping_frequency or "").lower()
-    if "quarter" in freq:
-        client_sched = "quarterly"
-    elif "annual" in freq or "year" in freq:
-        client_sched = "annual"
-    else:
-        client_sched = "monthly"
+    client_sched = client_schedule_type(client.bookkeeping_frequency)
 
     def fallback_assignee():
         return client.bookkeeper_id or client.manager_id or created_by_user_id
@@ -637,7 +644,8 @@ def create_contacts_from_intake(
         client.primary_contact_id = primary_contact.id
 
 @router.post("/{intake_id}/convert-to-client", response_model=schemas.ClientOut)
-async def convert_intake_to_client(
+def convert_intake_to_client(
+    response: Response,
     intake_id: int,
     convert_in: Optional[schemas.IntakeConvertIn] = Body(default=None),
     db: Session = Depends(get_db),
@@ -699,16 +707,8 @@ async def convert_intake_to_client(
     db.flush()
 
     create_contacts_from_intake(db, client, intake)
-    create_accounts_from_intake(db, client, intake)
-    seed_onboarding_account_shells(db, client)
-    seed_default_accounts_for_client(db, client.id)
-    create_default_recurring_tasks_for_client(db, client, created_by_user_id=current_user.id)
-    create_custom_recurring_tasks_from_intake(db, client, intake, created_by_user_id=current_user.id)
-    create_onboarding_tasks_for_client(
-        db=db,
-        client=client,
-        created_by_user_id=current_user.id,
-    )
+    # Accounts, recurring rules and onboarding tasks are provisioned by the job worker
+    job = enqueue_client_provisioning(db, client, created_by_user_id=current_user.id, intake_id=intake.id)
         # Update intake to link to new client
     if hasattr(intake, "client_id"):
         intake.client_id = client.id
@@ -723,4 +723,8 @@ async def convert_intake_to_client(
 
     db.commit()
     db.refresh(client)
+    invalidate_principals(client.manager_id, client.bookkeeper_id)
+
+    run_inline_if_enabled(job.id)
+    response.headers[JOB_ID_HEADER] = str(job.id)
     return client
\ No newline at end of file
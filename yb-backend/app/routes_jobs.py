@@ -0,0 +1,82 @@
+# app/routes_jobs.py
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from .database import get_db
+from . import models, schemas
+from .auth import get_current_user, require_admin_or_owner
+from .permissions import assert_client_access, is_admin, is_owner
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+def _assert_job_visible(db: Session, user: models.User, job: models.Job) -> None:
+    if is_owner(user) or is_admin(user) or job.created_by_id == user.id:
+        return
+    if job.client_id is not None:
+        assert_client_access(db, user, job.client_id)
+        return
+    raise HTTPException(status_code=403, detail="Not authorized for this job")
+
+
+@router.get("/", response_model=List[schemas.JobOut])
+def list_jobs(
+    client_id: Optional[int] = None,
+    status: Optional[str] = None,
+    kind: Optional[str] = None,
+    limit: int = Query(default=50, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    q = db.query(models.Job)
+
+    if client_id is not None:
+        assert_client_access(db, current_user, client_id)
+        q = q.filter(models.Job.client_id == client_id)
+    elif not (is_owner(current_user) or is_admin(current_user)):
+        q = q.filter(models.Job.created_by_id == current_user.id)
+
+    if status:
+        q = q.filter(models.Job.status == status)
+    if kind:
+        q = q.filter(models.Job.kind == kind)
+
+    return q.order_by(models.Job.id.desc()).limit(limit).all()
+
+
+@router.get("/{job_id}", response_model=schemas.JobOut)
+def get_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    """Poll this after an endpoint returned an X-Job-Id header."""
+    job = db.get(models.Job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    _assert_job_visible(db, current_user, job)
+    return job
+
+
+@router.post("/{job_id}/retry", response_model=schemas.JobOut)
+def retry_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(require_admin_or_owner),
+):
+    job = db.get(models.Job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status != "failed":
+        raise HTTPException(status_code=400, detail="Only failed jobs can be retried")
+
+    job.status = "queued"
+    job.attempts = 0
+    job.run_after = datetime.utcnow()
+    job.finished_at = None
+    db.commit()
+    db.refresh(job)
+    return job
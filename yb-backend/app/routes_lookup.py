@@ -0,0 +1,70 @@
+# app/routes_lookup.py
+from typing import List
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from .database import get_db
+from . import models, schemas
+from .auth import get_current_user, require_staff
+from .permissions import get_principal
+
+router = APIRouter(prefix="/lookup", tags=["lookup"])
+
+# Past the end of any name_key starting with the prefix (max code point)
+_KEY_END = "\U0010ffff"
+
+
+def _prefix_lookup(db: Session, model, label, prefix: str, limit: int, *criteria) -> List[dict]:
+    """
+    Top `limit` rows whose name_key starts with the normalized prefix, in
+    name order. The range bounds keep this an index range scan on name_key.
+    """
+    key = models.name_key(prefix) or ""
+    q = db.query(model.id, label).filter(*criteria)
+    if key:
+        q = q.filter(model.name_key >= key, model.name_key < key + _KEY_END)
+    else:
+        q = q.filter(model.name_key.isnot(None))
+    rows = q.order_by(model.name_key, model.id).limit(limit).all()
+    return [{"id": row_id, "name": name} for row_id, name in rows]
+
+
+@router.get("/clients", response_model=List[schemas.LookupItem])
+def lookup_clients(
+    prefix: str = Query(default="", max_length=100),
+    limit: int = Query(default=10, ge=1, le=50),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    """Client picker: only clients the caller can access."""
+    principal = get_principal(db, current_user)
+    criteria = []
+    if not principal.is_global:
+        if not principal.client_ids:
+            return []
+        criteria.append(models.Client.id.in_(principal.client_ids))
+    return _prefix_lookup(db, models.Client, models.Client.legal_name, prefix, limit, *criteria)
+
+
+@router.get("/contacts", response_model=List[schemas.LookupItem])
+def lookup_contacts(
+    prefix: str = Query(default="", max_length=100),
+    limit: int = Query(default=10, ge=1, le=50),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    return _prefix_lookup(db, models.Contact, models.Contact.name, prefix, limit)
+
+
+@router.get("/users", response_model=List[schemas.LookupItem])
+def lookup_users(
+    prefix: str = Query(default="", max_length=100),
+    limit: int = Query(default=10, ge=1, le=50),
+    include_inactive: bool = False,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(require_staff),
+):
+    """Assignee / staff picker (active users unless include_inactive)."""
+    criteria = [] if include_inactive else [models.User.is_active == True]  # noqa: E712
+    return _prefix_lookup(db, models.User, models.User.name, prefix, limit, *criteria)
@@ -1,18 +1,26 @@
 # app/routes_recurring.py
-from datetime import date, datetime
+from collections import Counter
+from datetime import date, datetime, timedelta
 from typing import List, Optional
 import json
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, EmailStr, constr, ConfigDict, field_validator
 
 from .database import get_db
 from . import models, schemas
 from .auth import get_current_user, require_manager_or_admin
-from .recurring_utils import advance_next_run
+from .pagination import MAX_PAGE_SIZE, paginate, parse_fields
+from .recurring_utils import advance_next_run, client_schedule_type, next_run_from, occurrences_between
 
 router = APIRouter(prefix="/recurring-tasks", tags=["recurring tasks"])
 
+# Keyset for cursor pagination: soonest next_run first
+RECURRING_ORDER = [("next_run", False, None), ("id", False, None)]
+
+FORECAST_DEFAULT_DAYS = 90
+FORECAST_MAX_DAYS = 366
+
 
 def _create_task_from_rule(
     db: Session,
@@ -42,7 +50,11 @@ def _create_task_from_rule(
 
 @router.get("/", response_model=List[schemas.RecurringTaskOut])
 def list_recurring_tasks(
+    response: Response,
     client_id: Optional[int] = None,
+    limit: Optional[int] = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
 ):
@@ -54,7 +66,15 @@ def list_recurring_tasks(
     if client_id is not None:
         q = q.filter(models.RecurringTask.client_id == client_id)
 
-    return q.order_by(models.RecurringTask.next_run.asc()).all()
+    return paginate(
+        q,
+        models.RecurringTask,
+        RECURRING_ORDER,
+        limit=limit,
+        cursor=cursor,
+        fields=parse_fields(fields, models.RecurringTask),
+        response=response,
+    )
 
 @router.post(
     "/", response_model=schemas.RecurringTaskOut, status_code=status.HTTP_201_CREATED
@@ -100,6 +120,144 @@ def create_recurring_task(
     return rule
 
 
+def _template_assignee(client: models.Client, role: Optional[str]) -> Optional[int]:
+    # Same preference order as create_default_recurring_tasks_for_client
+    if (role or "").strip().lower() == "manager":
+        return client.manager_id or client.bookkeeper_id
+    return client.bookkeeper_id or client.manager_id
+
+
+@router.get("/forecast", response_model=schemas.RecurringForecastOut)
+def forecast_recurring_tasks(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    user_id: Optional[int] = None,
+    client_id: Optional[int] = None,
+    include_templates: bool = False,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(require_manager_or_admin),
+):
+    """
+    Workload forecast: expand every active recurring rule over [start, end]
+    (default: the next 90 days) and count the tasks it will produce per user
+    and per day.
+
+    include_templates=true also projects the active recurring templates onto
+    clients that do not have that rule yet, using each client's bookkeeping
+    frequency (what create_default_recurring_tasks_for_client would create).
+    """
+    start = start or date.today()
+    end = end or (start + timedelta(days=FORECAST_DEFAULT_DAYS))
+    if end < start:
+        raise HTTPException(status_code=400, detail="end must be on or after start")
+    if (end - start).days > FORECAST_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"Window is limited to {FORECAST_MAX_DAYS} days")
+
+    # (user_id, date) -> count; everything else is derived from this
+    counts: Counter = Counter()
+
+    rq = db.query(
+        models.RecurringTask.name,
+        models.RecurringTask.client_id,
+        models.RecurringTask.assigned_user_id,
+        models.RecurringTask.schedule_type,
+        models.RecurringTask.day_of_month,
+        models.RecurringTask.weekday,
+        models.RecurringTask.week_of_month,
+        models.RecurringTask.next_run,
+    ).filter(
+        models.RecurringTask.active == True,  # noqa: E712
+        models.RecurringTask.next_run.isnot(None),
+        models.RecurringTask.next_run <= end,
+    )
+    if client_id is not None:
+        rq = rq.filter(models.RecurringTask.client_id == client_id)
+    rules = rq.all()
+
+    for r in rules:
+        for d in occurrences_between(
+            (r.schedule_type or "").strip().lower(),
+            r.next_run,
+            end,
+            r.day_of_month,
+            r.weekday,
+            r.week_of_month,
+        ):
+            if d >= start:
+                counts[(r.assigned_user_id, d)] += 1
+
+    if include_templates:
+        templates = (
+            db.query(models.RecurringTemplateTask)
+            .filter(models.RecurringTemplateTask.is_active == True)  # noqa: E712
+            .all()
+        )
+        cq = db.query(models.Client)
+        if client_id is not None:
+            cq = cq.filter(models.Client.id == client_id)
+        clients = cq.all()
+
+        have = {(r.client_id, (r.name or "").strip()) for r in rules}
+        if client_id is None:
+            # rules not due inside the window still count as "already set up"
+            have |= {
+                (cid, (name or "").strip())
+                for cid, name in db.query(models.RecurringTask.client_id, models.RecurringTask.name).all()
+            }
+
+        for tpl in templates:
+            name = (tpl.name or "").strip()
+            if not name:
+                continue
+            dom = tpl.day_of_month or 25
+            for client in clients:
+                if (client.id, name) in have:
+                    continue
+                sched = (tpl.schedule_type or "client_frequency").strip()
+                if sched == "client_frequency":
+                    sched = client_schedule_type(client.bookkeeping_frequency)
+                first = next_run_from(
+                    sched, start, day_of_month=dom, weekday=tpl.weekday, week_of_month=tpl.week_of_month
+                )
+                assignee = _template_assignee(client, tpl.default_assigned_role)
+                for d in occurrences_between(sched, first, end, dom, tpl.weekday, tpl.week_of_month):
+                    counts[(assignee, d)] += 1
+
+    if user_id is not None:
+        counts = Counter({k: v for k, v in counts.items() if k[0] == user_id})
+
+    by_user: Counter = Counter()
+    by_day: Counter = Counter()
+    for (uid, d), n in counts.items():
+        by_user[uid] += n
+        by_day[d] += n
+
+    names = {}
+    user_ids = [uid for uid in by_user if uid is not None]
+    if user_ids:
+        names = {
+            u.id: (u.name or u.email)
+            for u in db.query(models.User.id, models.User.name, models.User.email)
+            .filter(models.User.id.in_(user_ids))
+            .all()
+        }
+
+    return schemas.RecurringForecastOut(
+        start=start,
+        end=end,
+        total=sum(by_day.values()),
+        by_user=[
+            schemas.ForecastUserCount(user_id=uid, user_name=names.get(uid), count=n)
+            for uid, n in by_user.most_common()
+        ],
+        by_day=[schemas.ForecastDayCount(date=d, count=n) for d, n in sorted(by_day.items())],
+        by_user_day=[
+            schemas.ForecastUserDayCount(user_id=uid, date=d, count=n)
+            for (uid, d), n in sorted(counts.items(), key=lambda kv: (kv[0][1], kv[0][0] or 0))
+        ],
+    )
+
+
 @router.get("/{rt_id}", response_model=schemas.RecurringTaskOut)
 def get_recurring_task(
     rt_id: int,
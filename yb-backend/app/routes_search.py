@@ -0,0 +1,60 @@
+# app/routes_search.py
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from .database import IS_SQLITE, get_db
+from . import models, schemas, search
+from .auth import get_current_user
+from .permissions import assert_client_access, get_principal
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+@router.get("/", response_model=List[schemas.SearchHit])
+def global_search(
+    q: str = Query(..., min_length=2, max_length=200),
+    kinds: Optional[str] = Query(default=None, description="comma-separated, e.g. client,task_note"),
+    client_id: Optional[int] = None,
+    limit: int = Query(default=20, ge=1, le=100),
+    offset: int = Query(default=0, ge=0, le=1000),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    """
+    Ranked full-text search over clients, contacts, tasks and all note types.
+    Words match as prefixes and must all appear; matches in titles/names rank
+    above matches in bodies. Snippets mark hits with « ».
+
+    client_id narrows to items attached directly to that client.
+    """
+    if not IS_SQLITE:
+        raise HTTPException(status_code=501, detail="Search requires the SQLite FTS5 index")
+
+    kind_list = [k.strip() for k in (kinds or "").split(",") if k.strip()]
+    unknown = [k for k in kind_list if k not in search.KINDS]
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown kinds: {', '.join(unknown)}")
+
+    if client_id is not None:
+        assert_client_access(db, current_user, client_id)
+
+    try:
+        return search.search(
+            db.connection(),
+            q,
+            principal=get_principal(db, current_user),
+            kinds=kind_list or None,
+            client_id=client_id,
+            limit=limit,
+            offset=offset,
+        )
+    except OperationalError as e:
+        if search.TABLE not in str(e):
+            raise
+        raise HTTPException(
+            status_code=503,
+            detail="Search index missing; run `alembic upgrade head` or `python -m app.search rebuild`",
+        )
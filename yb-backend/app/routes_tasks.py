@@ -1,19 +1,30 @@
 # app/routes_tasks.py
+import os
 from datetime import date, timedelta, datetime
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import func, or_
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import and_, case, func, or_, select
 
 from .database import get_db
 from . import models, schemas
 from .auth import get_current_user
 from .onboarding import release_onboarding_tasks_if_ready
+from .pagination import MAX_PAGE_SIZE, paginate, parse_fields
 from .permissions import assert_client_access, can_view_task, is_admin, is_owner
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
+# Keyset for cursor pagination: newest first, id as tiebreaker. Raw
+# created_at (no COALESCE) so the (assigned_user_id, created_at) index
+# (+ rowid) serves the order; NULLs were backfilled (c7e3a9d2f614).
+TASK_ORDER = [("created_at", True, None), ("id", True, None)]
+
+# Max operations per POST /tasks/bulk
+BULK_MAX_OPS = int(os.getenv("YB_TASK_BULK_MAX", "500"))
+
 
 def _is_privileged(user: models.User) -> bool:
     role = (user.role or "").strip().lower()
@@ -32,23 +43,105 @@ def _ensure_task_visible(db: Session, current_user: models.User, task_id: int) -
     return task
 
 
-def _task_linked_client_ids(db: Session, task: models.Task) -> Optional[List[int]]:
-    if not bool(getattr(task, "is_intercompany", False)):
-        return None
-    try:
-        links = db.query(models.TaskClientLink).filter(models.TaskClientLink.task_id == task.id).all()
-        return [l.client_id for l in links]
-    except Exception:
-        return None
+def _build_task(db: Session, current_user: models.User, task_in: schemas.TaskCreate) -> models.Task:
+    """Validate a TaskCreate and build the (unsaved) Task; rules as in create_task."""
+    privileged = _is_privileged(current_user)
+
+    is_intercompany = bool(getattr(task_in, "is_intercompany", False))
+    linked_client_ids = list(dict.fromkeys((task_in.linked_client_ids or [])))  # unique, keep order
+
+    if is_intercompany:
+        if not privileged:
+            raise HTTPException(status_code=403, detail="Only Admin/Owner can create intercompany tasks")
+        if not linked_client_ids:
+            raise HTTPException(status_code=422, detail="linked_client_ids is required for intercompany tasks")
+
+        # ensure caller can access ALL linked clients (or you can loosen this later)
+        for cid in linked_client_ids:
+            assert_client_access(db, current_user, cid)
+
+    assigned_user_id = current_user.id
+    if privileged:
+        if task_in.assigned_user_id is not None:
+            assigned_user_id = task_in.assigned_user_id
+        elif bool(getattr(task_in, "leave_unassigned", False)):
+            assigned_user_id = None
+
+    task_type = task_in.task_type or "ad_hoc"
+    task = models.Task(
+        title=task_in.title.strip(),
+        description=task_in.description,
+        status=task_in.status or "new",
+        due_date=task_in.due_date,
+        client_id=task_in.client_id,
+        assigned_user_id=assigned_user_id,
+        recurring_task_id=task_in.recurring_task_id,
+        task_type=task_type,
+        created_by_id=current_user.id,
+        is_intercompany=is_intercompany,
+    )
+    if is_intercompany:
+        # anchor the task to the first client for convenience (client tab queries also join links)
+        task.client_id = linked_client_ids[0]
+        task.client_links = [models.TaskClientLink(client_id=cid) for cid in linked_client_ids]
+    return task
+
+
+def _apply_update(task: models.Task, current_user: models.User, task_in: schemas.TaskUpdate) -> bool:
+    """
+    Apply a TaskUpdate in place. All checks run before anything is changed, so a
+    rejected update leaves the task untouched. Returns True if it was completed.
+    """
+    privileged = _is_privileged(current_user)
+    if not privileged and task.assigned_user_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not allowed to modify this task")
+
+    status_changed_to_completed = (task_in.status is not None and task_in.status.lower() == "completed")
+    # block completing intercompany task if not all linked clients completed
+    if status_changed_to_completed and bool(getattr(task, "is_intercompany", False)):
+        links = task.client_links or []
+        if links and any(not l.is_completed for l in links):
+            raise HTTPException(
+                status_code=409,
+                detail="Cannot complete intercompany task until all linked clients are checked off.",
+            )
+
+    # privileged assignment
+    if privileged and task_in.assigned_user_id is not None:
+        task.assigned_user_id = task_in.assigned_user_id
+
+    if task_in.title is not None:
+        task.title = task_in.title.strip()
+    if task_in.description is not None:
+        task.description = task_in.description
+    if task_in.due_date is not None:
+        task.due_date = task_in.due_date
+    if task_in.client_id is not None:
+        task.client_id = task_in.client_id
+    if task_in.recurring_task_id is not None:
+        task.recurring_task_id = task_in.recurring_task_id
+    if task_in.task_type is not None:
+        task.task_type = task_in.task_type
+    if task_in.onboarding_phase is not None:
+        task.onboarding_phase = task_in.onboarding_phase
+    if task_in.template_task_id is not None:
+        task.template_task_id = task_in.template_task_id
+    if task_in.status is not None:
+        task.status = task_in.status
+    return status_changed_to_completed
 
 
 # --------- Core task CRUD ----------
 
 @router.get("/", response_model=List[schemas.TaskOut])
-async def list_tasks(
+def list_tasks(
+    response: Response,
     q: Optional[str] = None,
     status: Optional[str] = None,
     client_id: Optional[int] = None,
+    limit: Optional[int] = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
 ):
@@ -56,6 +149,9 @@ async def list_tasks(
     Personal task list:
     - Non-privileged: tasks assigned to me
     - Privileged: also defaults to tasks assigned to me (Admin uses /unassigned for unassigned queue)
+
+    Pass limit (and then the X-Next-Cursor value as cursor) to page through the
+    list; fields=id,title,... returns only those columns.
     """
     query = db.query(models.Task).filter(models.Task.assigned_user_id == current_user.id)
 
@@ -71,18 +167,19 @@ async def list_tasks(
     if client_id:
         query = query.filter(models.Task.client_id == client_id)
 
-    tasks = query.order_by(models.Task.created_at.desc()).all()
-
-    # populate linked_client_ids for intercompany
-    for t in tasks:
-        try:
-            t.linked_client_ids = _task_linked_client_ids(db, t)  # type: ignore[attr-defined]
-        except Exception:
-            pass
-
-    return tasks
+    # linked_client_ids is served by Task.client_links, which is selectin-loaded
+    # in one batched query for the whole list
+    return paginate(
+        query,
+        models.Task,
+        TASK_ORDER,
+        limit=limit,
+        cursor=cursor,
+        fields=parse_fields(fields, models.Task),
+        response=response,
+    )
 @router.get("/unassigned", response_model=List[schemas.TaskOut])
-async def list_unassigned_tasks(
+def list_unassigned_tasks(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
 ):
@@ -95,16 +192,11 @@ async def list_unassigned_tasks(
         .order_by(models.Task.created_at.desc())
         .all()
     )
-    for t in tasks:
-        try:
-            t.linked_client_ids = _task_linked_client_ids(db, t)  # type: ignore[attr-defined]
-        except Exception:
-            pass
     return tasks
 
 
 @router.post("/", response_model=schemas.TaskOut, status_code=status.HTTP_201_CREATED)
-async def create_task(
+def create_task(
     task_in: schemas.TaskCreate,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
@@ -115,62 +207,16 @@ async def create_task(
     - Privileged: can assign to others OR leave unassigned (leave_unassigned=True)
     - Intercompany: privileged only, uses linked_client_ids and creates TaskClientLink rows
     """
-    privileged = _is_privileged(current_user)
-
-    is_intercompany = bool(getattr(task_in, "is_intercompany", False))
-    linked_client_ids = list(dict.fromkeys((task_in.linked_client_ids or [])))  # unique, keep order
-
-    if is_intercompany:
-        if not privileged:
-            raise HTTPException(status_code=403, detail="Only Admin/Owner can create intercompany tasks")
-        if not linked_client_ids:
-            raise HTTPException(status_code=422, detail="linked_client_ids is required for intercompany tasks")
-
-        # ensure caller can access ALL linked clients (or you can loosen this later)
-        for cid in linked_client_ids:
-            assert_client_access(db, current_user, cid)
-
-    assigned_user_id = current_user.id
-    if privileged:
-        if task_in.assigned_user_id is not None:
-            assigned_user_id = task_in.assigned_user_id
-        elif bool(getattr(task_in, "leave_unassigned", False)):
-            assigned_user_id = None
-
-    task_type = task_in.task_type or "ad_hoc"
-    task = models.Task(
-        title=task_in.title.strip(),
-        description=task_in.description,
-        status=task_in.status or "new",
-        due_date=task_in.due_date,
-        client_id=task_in.client_id,
-        assigned_user_id=assigned_user_id,
-        recurring_task_id=task_in.recurring_task_id,
-        task_type=task_type,
-        created_by_id=current_user.id,
-        is_intercompany=is_intercompany,
-    )
+    task = _build_task(db, current_user, task_in)
     db.add(task)
-    db.flush()  # task.id available
-    if is_intercompany:
-        # anchor the task to the first client for convenience (client tab queries also join links)
-        task.client_id = linked_client_ids[0]
-        for cid in linked_client_ids:
-            db.add(models.TaskClientLink(task_id=task.id, client_id=cid))
-
     db.commit()
     db.refresh(task)
 
-    try:
-        task.linked_client_ids = _task_linked_client_ids(db, task)  # type: ignore[attr-defined]
-    except Exception:
-        pass
-
     return task
 
 
 @router.put("/{task_id}", response_model=schemas.TaskOut)
-async def update_task(
+def update_task(
     task_id: int,
     task_in: schemas.TaskUpdate,
     db: Session = Depends(get_db),
@@ -178,46 +224,7 @@ async def update_task(
 ):
     task = _ensure_task_visible(db, current_user, task_id)
 
-    privileged = _is_privileged(current_user)
-    if not privileged and task.assigned_user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not allowed to modify this task")
-
-    # privileged assignment
-    if privileged and task_in.assigned_user_id is not None:
-        task.assigned_user_id = task_in.assigned_user_id
-
-    if task_in.title is not None:
-        task.title = task_in.title.strip()
-    if task_in.description is not None:
-        task.description = task_in.description
-    if task_in.due_date is not None:
-        task.due_date = task_in.due_date
-    if task_in.client_id is not None:
-        task.client_id = task_in.client_id
-    if task_in.recurring_task_id is not None:
-        task.recurring_task_id = task_in.recurring_task_id
-    if task_in.task_type is not None:
-        task.task_type = task_in.task_type
-    if task_in.onboarding_phase is not None:
-        task.onboarding_phase = task_in.onboarding_phase
-    if task_in.template_task_id is not None:
-        task.template_task_id = task_in.template_task_id
-
-    status_changed_to_completed = (task_in.status is not None and task_in.status.lower() == "completed")
-    if task_in.status is not None:
-        # block completing intercompany task if not all linked clients completed
-        if status_changed_to_completed and bool(getattr(task, "is_intercompany", False)):
-            links = (
-                db.query(models.TaskClientLink)
-                .filter(models.TaskClientLink.task_id == task.id)
-                .all()
-            )
-            if links and any(not l.is_completed for l in links):
-                raise HTTPException(
-                    status_code=409,
-                    detail="Cannot complete intercompany task until all linked clients are checked off.",
-                )
-        task.status = task_in.status
+    status_changed_to_completed = _apply_update(task, current_user, task_in)
     db.commit()
     db.refresh(task)
 
@@ -229,16 +236,11 @@ async def update_task(
         )
         db.refresh(task)
 
-    try:
-        task.linked_client_ids = _task_linked_client_ids(db, task)  # type: ignore[attr-defined]
-    except Exception:
-        pass
-
     return task
 
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_task(
+def delete_task(
     task_id: int,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
@@ -254,12 +256,144 @@ async def delete_task(
     return None
 
 
+# --------- Bulk operations ----------
+
+@router.post("/bulk", response_model=schemas.TaskBulkResponse)
+def bulk_tasks(
+    body: schemas.TaskBulkRequest,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    """
+    Apply up to YB_TASK_BULK_MAX create/update/reassign/complete operations.
+
+    Same rules as the single-task endpoints, but the tasks, clients and
+    assignees involved are loaded once up front, every accepted change goes out
+    in one commit, and onboarding release runs once per affected client
+    (inside that same commit).
+    Rejected items are reported per index and don't stop the others.
+    """
+    ops = body.operations
+    if len(ops) > BULK_MAX_OPS:
+        raise HTTPException(status_code=422, detail=f"At most {BULK_MAX_OPS} operations per request")
+
+    privileged = _is_privileged(current_user)
+
+    # 1) everything the batch touches, one query per table
+    task_ids = {op.task_id for op in ops if op.task_id is not None}
+    tasks = {}
+    if task_ids:
+        tasks = {t.id: t for t in db.query(models.Task).filter(models.Task.id.in_(task_ids)).all()}
+    visible = {tid for tid, t in tasks.items() if can_view_task(db, current_user, t)}
+
+    # linked clients land in the identity map, so assert_client_access won't re-query them
+    client_ids = {cid for op in ops if op.create for cid in (op.create.linked_client_ids or [])}
+    if client_ids:
+        db.query(models.Client).filter(models.Client.id.in_(client_ids)).all()
+
+    assignee_ids = {op.assigned_user_id for op in ops if op.op == "reassign" and op.assigned_user_id is not None}
+    known_users = set()
+    if assignee_ids:
+        known_users = {uid for (uid,) in db.query(models.User.id).filter(models.User.id.in_(assignee_ids))}
+
+    # 2) apply in order; a rejected item leaves nothing behind
+    results: List[schemas.TaskBulkItemResult] = []
+    applied: List[tuple] = []  # (index, task)
+    release_client_ids = set()
+
+    for i, op in enumerate(ops):
+        try:
+            if op.op == "create":
+                if op.create is None:
+                    raise HTTPException(status_code=422, detail="create requires a 'create' body")
+                task = _build_task(db, current_user, op.create)
+                db.add(task)
+                code = status.HTTP_201_CREATED
+            else:
+                if op.task_id is None:
+                    raise HTTPException(status_code=422, detail=f"{op.op} requires task_id")
+                if op.task_id not in visible:
+                    raise HTTPException(status_code=404, detail="Task not found")
+                task = tasks[op.task_id]
+                code = status.HTTP_200_OK
+
+                if op.op == "reassign":
+                    if not privileged:
+                        raise HTTPException(status_code=403, detail="Only Admin/Owner can reassign tasks")
+                    if op.assigned_user_id is not None and op.assigned_user_id not in known_users:
+                        raise HTTPException(status_code=422, detail="Assignee not found")
+                    task.assigned_user_id = op.assigned_user_id
+                    completed = False
+                elif op.op == "complete":
+                    completed = _apply_update(task, current_user, schemas.TaskUpdate(status="completed"))
+                else:
+                    if op.update is None:
+                        raise HTTPException(status_code=422, detail="update requires an 'update' body")
+                    completed = _apply_update(task, current_user, op.update)
+
+                if completed and task.task_type == "onboarding" and task.client_id:
+                    release_client_ids.add(task.client_id)
+        except HTTPException as e:
+            results.append(
+                schemas.TaskBulkItemResult(
+                    index=i, op=op.op, ok=False, status_code=e.status_code,
+                    task_id=op.task_id, error=str(e.detail),
+                )
+            )
+            continue
+
+        applied.append((i, task))
+        results.append(schemas.TaskBulkItemResult(index=i, op=op.op, ok=True, status_code=code))
+
+    # 3) onboarding release once per client, then one commit for the whole batch
+    released = 0
+    try:
+        db.flush()
+        for cid in sorted(release_client_ids):
+            released += release_onboarding_tasks_if_ready(
+                db=db,
+                client_id=cid,
+                created_by_user_id=current_user.id,
+                commit=False,
+            )
+        applied_ids = {i: task.id for i, task in applied}
+        db.commit()
+    except SQLAlchemyError:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Bulk operation failed; no changes were applied")
+
+    # 4) reload the touched tasks (and their assignees) in one go for the response
+    fresh = {}
+    if applied_ids:
+        fresh = {
+            t.id: t
+            for t in db.query(models.Task)
+            .options(selectinload(models.Task.assigned_user))
+            .filter(models.Task.id.in_(set(applied_ids.values())))
+            .all()
+        }
+    for r in results:
+        if r.ok:
+            r.task_id = applied_ids[r.index]
+            r.task = schemas.TaskOut.model_validate(fresh[r.task_id])
+
+    ok = len(applied)
+    return schemas.TaskBulkResponse(
+        succeeded=ok,
+        failed=len(ops) - ok,
+        onboarding_released=released,
+        results=results,
+    )
+
+
 # --------- Dashboard endpoint ----------
 
 @router.get("/my-dashboard", response_model=schemas.TaskDashboardResponse)
-async def get_my_dashboard(
+def get_my_dashboard(
     assignee_user_id: Optional[int] = None,
     include_unassigned: bool = False,
+    counts_only: bool = False,
+    limit: Optional[int] = Query(default=None, ge=1, le=500),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
 ):
@@ -268,6 +402,9 @@ async def get_my_dashboard(
     - Bookkeeper/etc: can only view self
     - Manager: can view self + direct reports
     - Admin/Owner: can view anyone, OR view unassigned via include_unassigned=true
+
+    counts_only=true returns just the per-bucket counts (for badges).
+    limit=N caps each bucket at N tasks; counts still reflect the full totals.
     """
     role = (current_user.role or "").strip().lower()
     is_privileged = role in ("owner", "admin")
@@ -296,8 +433,11 @@ async def get_my_dashboard(
             if target_user_id != current_user.id:
                 raise HTTPException(status_code=403, detail="Not allowed to view this user's dashboard")
 
+    # Date-range boundaries (index-friendly, unlike func.date(due_date))
     today = date.today()
-    seven_days = today + timedelta(days=7)
+    today_start = datetime.combine(today, datetime.min.time())
+    tomorrow_start = today_start + timedelta(days=1)
+    upcoming_end = today_start + timedelta(days=8)  # through today + 7 days
 
     base_q = db.query(models.Task)
 
@@ -311,57 +451,78 @@ async def get_my_dashboard(
     base_q = base_q.filter(
         ~((models.Task.task_type == "onboarding") & (func.lower(models.Task.status) == "blocked"))
     )
-    overdue = (
-        base_q.filter(
-            models.Task.due_date.isnot(None),
-            func.date(models.Task.due_date) < today,
-            models.Task.status != "completed",
-            models.Task.status != "waiting_on_client",
-        )
-        .order_by(models.Task.due_date.asc())
-        .all()
-    )
 
-    today_tasks = (
-        base_q.filter(
-            models.Task.due_date.isnot(None),
-            func.date(models.Task.due_date) == today,
-            models.Task.status != "completed",
-            models.Task.status != "waiting_on_client",
-        )
-        .order_by(models.Task.created_at.asc())
-        .all()
+    is_waiting = models.Task.status == "waiting_on_client"
+    is_open_dated = and_(
+        models.Task.due_date.isnot(None),
+        models.Task.due_date < upcoming_end,
+        models.Task.status != "completed",
+        models.Task.status != "waiting_on_client",
     )
-
-    upcoming = (
-        base_q.filter(
-            models.Task.due_date.isnot(None),
-            func.date(models.Task.due_date) > today,
-            func.date(models.Task.due_date) <= seven_days,
-            models.Task.status != "completed",
-            models.Task.status != "waiting_on_client",
+    base_q = base_q.filter(or_(is_waiting, is_open_dated))
+
+    if counts_only:
+        # Badges only: one aggregate, no rows pulled
+        dated = is_open_dated
+        row = base_q.with_entities(
+            func.sum(case((and_(dated, models.Task.due_date < today_start), 1), else_=0)),
+            func.sum(case((and_(dated, models.Task.due_date >= today_start, models.Task.due_date < tomorrow_start), 1), else_=0)),
+            func.sum(case((and_(dated, models.Task.due_date >= tomorrow_start), 1), else_=0)),
+            func.sum(case((is_waiting, 1), else_=0)),
+        ).one()
+        return schemas.TaskDashboardResponse(
+            counts=schemas.TaskDashboardCounts(
+                overdue=row[0] or 0,
+                today=row[1] or 0,
+                upcoming=row[2] or 0,
+                waiting_on_client=row[3] or 0,
+            ),
         )
-        .order_by(models.Task.due_date.asc())
-        .all()
-    )
 
-    waiting = (
-        base_q.filter(models.Task.status == "waiting_on_client")
-        .order_by(models.Task.due_date.asc())
-        .all()
+    # Single pass over the user's open tasks, bucketed in Python
+    overdue: List[models.Task] = []
+    today_tasks: List[models.Task] = []
+    upcoming: List[models.Task] = []
+    waiting: List[models.Task] = []
+
+    rows = base_q.order_by(models.Task.due_date.asc(), models.Task.created_at.asc()).all()
+    for t in rows:
+        if t.status == "waiting_on_client":
+            waiting.append(t)
+        elif t.due_date < today_start:
+            overdue.append(t)
+        elif t.due_date < tomorrow_start:
+            today_tasks.append(t)
+        else:
+            upcoming.append(t)
+
+    # today's bucket has always been ordered by creation time
+    today_tasks.sort(key=lambda t: t.created_at or datetime.min)
+
+    counts = schemas.TaskDashboardCounts(
+        overdue=len(overdue),
+        today=len(today_tasks),
+        upcoming=len(upcoming),
+        waiting_on_client=len(waiting),
     )
 
+    if limit is not None:
+        overdue, today_tasks, upcoming, waiting = (
+            overdue[:limit], today_tasks[:limit], upcoming[:limit], waiting[:limit]
+        )
+
     return schemas.TaskDashboardResponse(
         overdue=overdue,
         today=today_tasks,
         upcoming=upcoming,
         waiting_on_client=waiting,
+        counts=counts,
     )
 
 # --------- Intercompany linked clients ----------
 
 @router.get("/{task_id}/linked-clients", response_model=List[schemas.TaskClientLinkOut])
-async def list_task_linked_clients(
+def list_task_linked_clients(
     task_id: int,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
@@ -392,7 +553,7 @@ async def list_task_linked_clients(
     return out
 
 @router.put("/{task_id}/linked-clients/{client_id}", response_model=schemas.TaskClientLinkOut)
-async def set_task_linked_client_completion(
+def set_task_linked_client_completion(
     task_id: int,
     client_id: int,
     body: schemas.TaskClientLinkUpdate,
@@ -437,7 +598,7 @@ async def set_task_linked_client_completion(
 # --------- Subtasks ----------
 
 @router.get("/{task_id}/subtasks", response_model=List[schemas.TaskSubtaskOut])
-async def list_subtasks(
+def list_subtasks(
     task_id: int,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
@@ -452,7 +613,7 @@ async def list_subtasks(
 
 
 @router.post("/{task_id}/subtasks", response_model=schemas.TaskSubtaskOut, status_code=status.HTTP_201_CREATED)
-async def create_subtask(
+def create_subtask(
     task_id: int,
     sub_in: schemas.TaskSubtaskCreate,
     db: Session = Depends(get_db),
@@ -467,7 +628,7 @@ async def create_subtask(
 
 
 @router.put("/{task_id}/subtasks/{sub_id}", response_model=schemas.TaskSubtaskOut)
-async def update_subtask(
+def update_subtask(
     task_id: int,
     sub_id: int,
     sub_in: schemas.TaskSubtaskUpdate,
@@ -493,7 +654,7 @@ async def update_subtask(
 # --------- Notes ----------
 
 @router.get("/{task_id}/notes", response_model=List[schemas.TaskNoteOut])
-async def list_notes(
+def list_notes(
     task_id: int,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
@@ -513,7 +674,7 @@ async def list_notes(
         out.append(n)
     return out
 @router.post("/{task_id}/notes", response_model=schemas.TaskNoteOut, status_code=status.HTTP_201_CREATED)
-async def create_note(
+def create_note(
     task_id: int,
     note_in: schemas.TaskNoteCreate,
     db: Session = Depends(get_db),
@@ -538,7 +699,7 @@ async def create_note(
 # --------- Client tasks tab endpoint ----------
 
 @router.get("/client/{client_id}", response_model=List[schemas.TaskOut])
-async def list_tasks_for_client(
+def list_tasks_for_client(
     client_id: int,
     task_types: Optional[str] = None,  # comma-separated: "ad_hoc,project"
     status: Optional[str] = None,
@@ -552,11 +713,11 @@ async def list_tasks_for_client(
     # include:
     # - tasks directly on the client_id
     # - tasks linked through TaskClientLink (intercompany)
-    query = (
-        db.query(models.Task)
-        .outerjoin(models.TaskClientLink, models.TaskClientLink.task_id == models.Task.id)
-        .filter(or_(models.Task.client_id == client_id, models.TaskClientLink.client_id == client_id))
-        .distinct()
+    # (an IN subquery rather than an outer join, so each side of the OR can use
+    # its client_id index instead of scanning every task)
+    linked_ids = select(models.TaskClientLink.task_id).where(models.TaskClientLink.client_id == client_id)
+    query = db.query(models.Task).filter(
+        or_(models.Task.client_id == client_id, models.Task.id.in_(linked_ids))
     )
 
     types = [t.strip() for t in (task_types or "").split(",") if t.strip()]
@@ -574,9 +735,4 @@ async def list_tasks_for_client(
         query = query.filter(models.Task.title.ilike(f"%{q}%"))
 
     tasks = query.order_by(models.Task.created_at.desc()).all()
-    for t in tasks:
-        try:
-            t.linked_client_ids = _task_linked_client_ids(db, t)  # type: ignore[attr-defined]
-        except Exception:
-            pass
     return tasks
\ No newline at end of file
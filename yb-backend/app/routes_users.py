@@ -3,17 +3,25 @@ from typing import List, Optional
 import secrets
 import string
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 
 from .database import get_db
 from . import models, schemas
 from .auth import get_current_user, get_password_hash, require_admin_or_owner, require_staff
+from .pagination import MAX_PAGE_SIZE, paginate, parse_fields
+from .permissions import invalidate_principals
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 ALLOWED_ROLES = {"bookkeeper", "manager", "admin", "owner", "client"}
 
+# Keyset for cursor pagination
+USER_ORDER = [("name", False, None), ("id", False, None)]
+
+# Never expose these through a fields= projection
+_HIDDEN_USER_FIELDS = {"hashed_password"}
+
 @router.get("/team", response_model=List[schemas.UserOut])
 def get_team_users(
     db: Session = Depends(get_db),
@@ -52,6 +60,10 @@ def _generate_temp_password(length: int = 14) -> str:
 
 @router.get("/", response_model=List[schemas.UserOut])
 def list_users(
+    response: Response,
+    limit: Optional[int] = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(require_staff),
 ):
@@ -59,7 +71,15 @@ def list_users(
     List all users.
     Staff can view (helps with assignments).
     """
-    return db.query(models.User).order_by(models.User.name.asc()).all()
+    return paginate(
+        db.query(models.User),
+        models.User,
+        USER_ORDER,
+        limit=limit,
+        cursor=cursor,
+        fields=parse_fields(fields, models.User, hidden=_HIDDEN_USER_FIELDS),
+        response=response,
+    )
 
 
 @router.get("/{user_id}", response_model=schemas.UserOut)
@@ -195,6 +215,7 @@ def update_user(
             user.manager_id = mid
     db.commit()
     db.refresh(user)
+    invalidate_principals(user.id)
     return user
 
 
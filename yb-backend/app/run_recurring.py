@@ -1,95 +1,253 @@
 # app/run_recurring.py
+"""
+Materialize due recurring tasks.
+
+    python -m app.run_recurring                      # normal nightly run
+    python -m app.run_recurring --dry-run --json     # what would happen, with timings
+    python -m app.run_recurring --today 2026-03-01
+
+Works set-based: expand every due rule up front, look up which
+(recurring_task_id, due_date) pairs already exist (one index seek per chunk of
+rules), then insert the missing tasks and advance next_run in bounded,
+separately committed batches.
+
+Only one run writes at a time (a "run_recurring" lease in the DB), so the
+timer can be enabled on every app host: the first to start does the work,
+the others report the holder and exit.
+"""
 from __future__ import annotations
 
+import argparse
+import json
+import os
+import time
 from datetime import date, datetime
-from typing import Optional
+from typing import Dict, List, Optional, Set, Tuple
 
+from sqlalchemy import update
+
+from .coordination import hold_lease, lease_holder
 from .database import SessionLocal
 from . import models
 from .recurring_utils import advance_next_run
 
+# Per-rule catch-up cap (safety for misconfigured rules)
+MAX_CYCLES = 36
+BATCH_SIZE = int(os.getenv("YB_RECURRING_BATCH_SIZE", "500"))
+# A crashed run blocks the next one for at most this long
+LEASE_SECONDS = int(os.getenv("YB_RECURRING_LEASE_SECONDS", "3600"))
+LEASE_NAME = "run_recurring"
+# Rule ids per duplicate-check query
+DEDUPE_CHUNK = 500
+
+
+def _expand_rule(rule, today: date) -> Tuple[List[date], Optional[date], bool]:
+    """All due dates <= today for this rule, the new next_run, and whether the cap hit."""
+    dues: List[date] = []
+    next_run = rule.next_run
+    while next_run and next_run <= today:
+        if len(dues) >= MAX_CYCLES:
+            return dues, next_run, True
+        dues.append(next_run)
+        next_run = advance_next_run(
+            rule.schedule_type,
+            next_run,
+            day_of_month=rule.day_of_month,
+            weekday=rule.weekday,
+            week_of_month=rule.week_of_month,
+        )
+    return dues, next_run, False
+
+
+def _existing_pairs(
+    db, rule_ids: List[int], since: datetime, until: datetime
+) -> Set[Tuple[int, datetime]]:
+    # recurring_task_id IN (...) + the due_date range is a seek on
+    # ix_tasks_recurring_due; chunked to stay under SQLite's bound-parameter cap
+    pairs: Set[Tuple[int, datetime]] = set()
+    for i in range(0, len(rule_ids), DEDUPE_CHUNK):
+        rows = (
+            db.query(models.Task.recurring_task_id, models.Task.due_date)
+            .filter(
+                models.Task.recurring_task_id.in_(rule_ids[i:i + DEDUPE_CHUNK]),
+                models.Task.due_date >= since,
+                models.Task.due_date <= until,
+                models.Task.task_type == "recurring",
+            )
+            .all()
+        )
+        pairs.update((rid, due) for rid, due in rows)
+    return pairs
+
+
+def run_once(
+    today: Optional[date] = None,
+    *,
+    dry_run: bool = False,
+    batch_size: int = BATCH_SIZE,
+) -> dict:
+    """
+    One pass as the leader. If another run holds the lease the result is
+    {"skipped": True, "leader": <holder>} and nothing is written.
+    """
+    today = today or date.today()
+    if dry_run:
+        return _run(today, dry_run=True, batch_size=batch_size)
+    with hold_lease(LEASE_NAME, LEASE_SECONDS) as leader:
+        if not leader:
+            return {"skipped": True, "leader": lease_holder(LEASE_NAME), "today": str(today)}
+        return _run(today, dry_run=False, batch_size=batch_size)
 
-def _ensure_task_for_rule_and_date(db, rule: models.RecurringTask, due: date) -> bool:
-    due_dt = datetime.combine(due, datetime.min.time())
 
-    existing = (
-        db.query(models.Task)
-        .filter(
-            models.Task.recurring_task_id == rule.id,
-            models.Task.task_type == "recurring",
-            models.Task.due_date == due_dt,
-        )
-        .first()
-    )
-    if existing:
-        return False
-
-    task = models.Task(
-        title=rule.name,
-        description=rule.description or "",
-        status=rule.default_status or "new",
-        due_date=due_dt,
-        assigned_user_id=rule.assigned_user_id,
-        client_id=rule.client_id,
-        recurring_task_id=rule.id,
-        task_type="recurring",
-    )
-    db.add(task)
-    return True
+def _run(today: date, *, dry_run: bool, batch_size: int) -> dict:
+    timings: Dict[str, float] = {}
+    started = t0 = time.perf_counter()
 
-def run_once(today: Optional[date] = None) -> dict:
-    today = today or date.today()
-    db = SessionLocal()
-    created = 0
-    advanced = 0
-    skipped_infinite = 0
+    def lap(name: str):
+        nonlocal t0
+        now = time.perf_counter()
+        timings[name] = round((now - t0) * 1000, 1)
+        t0 = now
 
+    db = SessionLocal()
     try:
+        # 1) only rules that actually have something due
         rules = (
-            db.query(models.RecurringTask)
-            .filter(models.RecurringTask.active == True)  # noqa: E712
+            db.query(
+                models.RecurringTask.id,
+                models.RecurringTask.name,
+                models.RecurringTask.description,
+                models.RecurringTask.default_status,
+                models.RecurringTask.assigned_user_id,
+                models.RecurringTask.client_id,
+                models.RecurringTask.schedule_type,
+                models.RecurringTask.day_of_month,
+                models.RecurringTask.weekday,
+                models.RecurringTask.week_of_month,
+                models.RecurringTask.next_run,
+            )
+            .filter(
+                models.RecurringTask.active == True,  # noqa: E712
+                models.RecurringTask.next_run.isnot(None),
+                models.RecurringTask.next_run <= today,
+            )
+            .order_by(models.RecurringTask.id)
             .all()
         )
+        lap("load_ms")
 
+        # 2) expand every rule's missed cycles
+        plan = []
+        skipped_infinite = 0
+        occurrences = 0
+        earliest: Optional[date] = None
         for rule in rules:
-            if not rule.next_run:
-                continue
-
-            loops = 0
-            while rule.next_run and rule.next_run <= today:
-                loops += 1
-                if loops > 36:  # safety for misconfigured rules
-                    skipped_infinite += 1
-                    break
-
-                due = rule.next_run
-                if _ensure_task_for_rule_and_date(db, rule, due):
-                    created += 1
-
-                rule.next_run = advance_next_run(
-                    rule.schedule_type,
-                    due,
-                    day_of_month=rule.day_of_month,
-                    weekday=rule.weekday,
-                    week_of_month=rule.week_of_month,
+            dues, next_run, capped = _expand_rule(rule, today)
+            skipped_infinite += int(capped)
+            occurrences += len(dues)
+            if dues and (earliest is None or dues[0] < earliest):
+                earliest = dues[0]
+            plan.append((rule, dues, next_run))
+        lap("expand_ms")
+
+        # 3) what already exists in the window, for the rules that have dues
+        existing: Set[Tuple[int, datetime]] = set()
+        if earliest is not None:
+            existing = _existing_pairs(
+                db,
+                [rule.id for rule, dues, _ in plan if dues],
+                datetime.combine(earliest, datetime.min.time()),
+                datetime.combine(today, datetime.min.time()),
+            )
+        lap("dedupe_ms")
+
+        # 4) insert missing tasks + advance rules, committing every batch_size tasks
+        created = 0
+        advanced = 0
+        batches = 0
+        task_rows: List[dict] = []
+        rule_rows: List[dict] = []
+
+        def flush():
+            nonlocal batches
+            if dry_run or not (task_rows or rule_rows):
+                task_rows.clear()
+                rule_rows.clear()
+                return
+            if task_rows:
+                db.execute(models.Task.__table__.insert(), task_rows)
+            if rule_rows:
+                db.execute(update(models.RecurringTask), rule_rows)
+            db.commit()
+            batches += 1
+            task_rows.clear()
+            rule_rows.clear()
+
+        for rule, dues, next_run in plan:
+            for due in dues:
+                due_dt = datetime.combine(due, datetime.min.time())
+                if (rule.id, due_dt) in existing:
+                    continue
+                task_rows.append(
+                    {
+                        "title": rule.name,
+                        "description": rule.description or "",
+                        "status": rule.default_status or "new",
+                        "due_date": due_dt,
+                        "assigned_user_id": rule.assigned_user_id,
+                        "client_id": rule.client_id,
+                        "recurring_task_id": rule.id,
+                        "task_type": "recurring",
+                    }
                 )
-                advanced += 1
+                created += 1
+            advanced += len(dues)
+            if next_run != rule.next_run:
+                rule_rows.append({"id": rule.id, "next_run": next_run})
+
+            if len(task_rows) >= batch_size or len(rule_rows) >= batch_size:
+                flush()
+        flush()
+        lap("insert_ms")
 
-        db.commit()
+        timings["total_ms"] = round((time.perf_counter() - started) * 1000, 1)
         return {
             "created": created,
             "advanced": advanced,
             "skipped_infinite": skipped_infinite,
             "today": str(today),
+            "dry_run": dry_run,
+            "rules_due": len(rules),
+            "occurrences": occurrences,
+            "already_existed": occurrences - created,
+            "batches": batches,
+            "timings": timings,
         }
+    except Exception:
+        db.rollback()
+        raise
     finally:
         db.close()
 
 
 def main():
-    result = run_once()
+    ap = argparse.ArgumentParser(description="Create due recurring tasks")
+    ap.add_argument("--dry-run", action="store_true", help="compute everything, write nothing")
+    ap.add_argument("--json", action="store_true", help="print stats (incl. per-phase timings) as JSON")
+    ap.add_argument("--today", type=date.fromisoformat, help="run as of this date (YYYY-MM-DD)")
+    ap.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = ap.parse_args()
+
+    result = run_once(args.today, dry_run=args.dry_run, batch_size=max(1, args.batch_size))
+    if args.json:
+        print(json.dumps(result))
+        return
+    if result.get("skipped"):
+        print(f"[run_recurring] {result['today']} skipped: another run holds the lease ({result['leader']})")
+        return
     print(
         f"[run_recurring] {result['today']} created={result['created']} advanced={result['advanced']} skipped={result['skipped_infinite']}"
+        + (" (dry run)" if args.dry_run else "")
     )
 
 
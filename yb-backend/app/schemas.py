@@ -1,6 +1,6 @@
 # app/schemas.py
 from datetime import datetime, date
-from typing import Optional, List, Any, Dict
+from typing import Optional, List, Any, Dict, Literal
 import json
 from pydantic import BaseModel, EmailStr, constr, ConfigDict, field_validator
 
@@ -95,11 +95,50 @@ class TaskOut(TaskBase):
     is_intercompany: bool | None = False
     linked_client_ids: Optional[List[int]] = None
 
+class TaskDashboardCounts(BaseModel):
+    overdue: int = 0
+    today: int = 0
+    upcoming: int = 0
+    waiting_on_client: int = 0
+
 class TaskDashboardResponse(BaseModel):
-    overdue: List[TaskOut]
-    today: List[TaskOut]
-    upcoming: List[TaskOut]
-    waiting_on_client: List[TaskOut]
+    overdue: List[TaskOut] = []
+    today: List[TaskOut] = []
+    upcoming: List[TaskOut] = []
+    waiting_on_client: List[TaskOut] = []
+    counts: Optional[TaskDashboardCounts] = None
+
+class TaskBulkOp(BaseModel):
+    """
+    One operation in POST /tasks/bulk:
+      create   -> `create`
+      update   -> task_id + `update`
+      reassign -> task_id + assigned_user_id (null = unassign)
+      complete -> task_id
+    """
+    op: Literal["create", "update", "reassign", "complete"]
+    task_id: Optional[int] = None
+    create: Optional[TaskCreate] = None
+    update: Optional[TaskUpdate] = None
+    assigned_user_id: Optional[int] = None
+
+class TaskBulkRequest(BaseModel):
+    operations: List[TaskBulkOp]
+
+class TaskBulkItemResult(BaseModel):
+    index: int
+    op: str
+    ok: bool
+    status_code: int
+    task_id: Optional[int] = None
+    error: Optional[str] = None
+    task: Optional[TaskOut] = None
+
+class TaskBulkResponse(BaseModel):
+    succeeded: int
+    failed: int
+    onboarding_released: int = 0
+    results: List[TaskBulkItemResult]
 
 class TaskSubtaskBase(BaseModel):
     title: constr(min_length=1, max_length=255)
@@ -200,6 +239,31 @@ class RecurringTaskOut(RecurringTaskBase):
     class Config:
         from_attributes = True
 
+class ForecastUserCount(BaseModel):
+    user_id: Optional[int] = None
+    user_name: Optional[str] = None
+    count: int
+
+
+class ForecastDayCount(BaseModel):
+    date: date
+    count: int
+
+
+class ForecastUserDayCount(BaseModel):
+    user_id: Optional[int] = None
+    date: date
+    count: int
+
+
+class RecurringForecastOut(BaseModel):
+    start: date
+    end: date
+    total: int
+    by_user: List[ForecastUserCount] = []
+    by_day: List[ForecastDayCount] = []
+    by_user_day: List[ForecastUserDayCount] = []
+
 # ---------- Recurring Template Task (admin rules) ----------
 
 class RecurringTemplateTaskBase(BaseModel):
@@ -604,6 +668,8 @@ class DocumentOut(DocumentBase):
     original_filename: str
     stored_filename: str
     stored_path: str
+    sha256: Optional[str] = None
+    size_bytes: Optional[int] = None
     uploaded_by: int
     uploaded_at: datetime
 
@@ -702,6 +768,7 @@ class AppSettingOut(BaseModel):
 
     key: str
     value: Any
+    version: Optional[int] = None
     updated_at: Optional[datetime] = None
     updated_by_id: Optional[int] = None
 
@@ -804,4 +871,64 @@ class QuickNoteOut(BaseModel):
     created_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+# ---------- Background Jobs ----------
+class JobOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    kind: str
+    status: str
+    attempts: int
+    max_attempts: int
+    client_id: Optional[int] = None
+    created_by_id: Optional[int] = None
+    result: Optional[Dict[str, Any]] = None
+    last_error: Optional[str] = None
+    run_after: datetime
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+# ---------- Global search ----------
+class SearchHit(BaseModel):
+    kind: str  # client | contact | task | task_note | client_note | manual_entry | quick_note
+    id: int
+    client_id: Optional[int] = None
+    task_id: Optional[int] = None
+    title: Optional[str] = None
+    snippet: str
+    score: float
+
+# ---------- Typeahead lookups ----------
+class LookupItem(BaseModel):
+    id: int
+    name: str
+
+# ---------- Bulk import / export ----------
+class BulkRefOut(BaseModel):
+    column: str  # FK column, e.g. client_id
+    name: str    # readable column in files, e.g. client
+    table: str
+    key: str     # natural key it holds, e.g. legal_name
+
+class BulkEntityOut(BaseModel):
+    name: str
+    key: List[str]  # empty = insert-only
+    columns: List[str]
+    refs: List[BulkRefOut]
+    importable: bool
+
+class BulkImportError(BaseModel):
+    line: int
+    error: str
+
+class BulkImportResult(BaseModel):
+    entity: str
+    dry_run: bool
+    created: int
+    updated: int
+    duplicates: int
+    failed: int
+    ignored_columns: List[str]  # in the file but not in the table
+    errors: List[BulkImportError]  # first 200, by line
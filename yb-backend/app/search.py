@@ -0,0 +1,286 @@
+# app/search.py
+"""
+Global full-text search (SQLite FTS5).
+
+One `search_index` FTS5 table holds the searchable text of clients, contacts,
+tasks, task notes, client notes, manual entries and quick notes. SQL triggers
+on the source tables keep it in sync, so rows written outside the ORM (the
+recurring runner's bulk inserts, importers, raw SQL) are indexed too.
+
+Each source row maps to a fixed rowid (ref_id * 8 + kind code), which lets the
+triggers replace / delete index entries by rowid instead of scanning.
+
+    python -m app.search rebuild      # (re)create table + triggers, reindex everything
+    python -m app.search query "acme payroll"
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import time
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from .database import IS_SQLITE
+
+TABLE = "search_index"
+
+SNIPPET_OPEN = "«"
+SNIPPET_CLOSE = "»"
+
+
+class Source(NamedTuple):
+    code: int           # low 3 bits of the index rowid
+    kind: str
+    table: str
+    title: str          # SQL expressions; {r} is the source row (NEW / OLD / table)
+    body: str
+    client_id: str = "NULL"
+    task_id: str = "NULL"
+    owner_id: str = "NULL"
+    watch: Sequence[str] = ()  # columns whose UPDATE must reindex the row
+
+
+def _cols(*names: str) -> str:
+    """Space-joined text of several nullable columns."""
+    return " || ' ' || ".join(f"coalesce({{r}}.{n}, '')" for n in names)
+
+
+SOURCES: List[Source] = [
+    Source(1, "client", "clients", "{r}.legal_name",
+           _cols("dba_name", "primary_contact", "email", "cpa"),
+           client_id="{r}.id",
+           watch=("legal_name", "dba_name", "primary_contact", "email", "cpa")),
+    Source(2, "contact", "contacts", "{r}.name",
+           _cols("email", "phone", "notes"),
+           watch=("name", "email", "phone", "notes")),
+    Source(3, "task", "tasks", "{r}.title", "{r}.description",
+           client_id="{r}.client_id", task_id="{r}.id", owner_id="{r}.assigned_user_id",
+           watch=("title", "description", "client_id", "assigned_user_id")),
+    Source(4, "task_note", "task_notes", "''", "{r}.body",
+           task_id="{r}.task_id", owner_id="{r}.author_id",
+           watch=("body", "task_id")),
+    Source(5, "client_note", "client_notes", "''", "{r}.body",
+           client_id="{r}.client_id", owner_id="{r}.created_by_id",
+           watch=("body", "client_id")),
+    Source(6, "manual_entry", "client_manual_entries", "{r}.title", "{r}.body",
+           client_id="{r}.client_id", task_id="{r}.task_id", owner_id="{r}.created_by_id",
+           watch=("title", "body", "client_id", "task_id")),
+    Source(7, "quick_note", "quick_notes", "''", "{r}.body",
+           client_id="{r}.client_id", owner_id="{r}.created_by_id",
+           watch=("body", "client_id")),
+]
+KINDS: Dict[str, Source] = {s.kind: s for s in SOURCES}
+
+
+# ---------- DDL ----------
+
+def _row_expr(src: Source, ref: str) -> str:
+    """VALUES / SELECT list for one source row; `ref` is NEW / OLD / the table name."""
+    return ", ".join(
+        e.format(r=ref)
+        for e in (
+            f"{{r}}.id * 8 + {src.code}",
+            f"'{src.kind}'",
+            "{r}.id",
+            src.client_id,
+            src.task_id,
+            src.owner_id,
+            f"coalesce({src.title}, '')",
+            f"coalesce({src.body}, '')",
+        )
+    )
+
+
+_COLUMNS = "rowid, kind, ref_id, client_id, task_id, owner_id, title, body"
+
+
+def _trigger_sql(src: Source) -> List[str]:
+    name = f"{TABLE}_{src.kind}"
+    watch = ", ".join(src.watch)
+    return [
+        f"""CREATE TRIGGER IF NOT EXISTS {name}_ai AFTER INSERT ON {src.table} BEGIN
+            INSERT INTO {TABLE}({_COLUMNS}) VALUES ({_row_expr(src, "NEW")});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {name}_au AFTER UPDATE OF {watch} ON {src.table} BEGIN
+            DELETE FROM {TABLE} WHERE rowid = OLD.id * 8 + {src.code};
+            INSERT INTO {TABLE}({_COLUMNS}) VALUES ({_row_expr(src, "NEW")});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {name}_ad AFTER DELETE ON {src.table} BEGIN
+            DELETE FROM {TABLE} WHERE rowid = OLD.id * 8 + {src.code};
+        END""",
+    ]
+
+
+def install(conn: Connection) -> None:
+    """Create the FTS table and sync triggers (idempotent)."""
+    conn.exec_driver_sql(
+        f"""CREATE VIRTUAL TABLE IF NOT EXISTS {TABLE} USING fts5(
+            title, body,
+            kind UNINDEXED, ref_id UNINDEXED, client_id UNINDEXED,
+            task_id UNINDEXED, owner_id UNINDEXED,
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3'
+        )"""
+    )
+    for src in SOURCES:
+        for stmt in _trigger_sql(src):
+            conn.exec_driver_sql(stmt)
+
+
+def restore_triggers(conn: Connection) -> None:
+    """
+    Re-create missing sync triggers if the index exists. Alembic's batch mode
+    copies tables into new ones, which silently drops their triggers.
+    """
+    if conn.dialect.name != "sqlite":
+        return
+    exists = conn.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (TABLE,)
+    ).first()
+    if exists:
+        install(conn)
+
+
+def uninstall(conn: Connection) -> None:
+    for src in SOURCES:
+        for suffix in ("ai", "au", "ad"):
+            conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {TABLE}_{src.kind}_{suffix}")
+    conn.exec_driver_sql(f"DROP TABLE IF EXISTS {TABLE}")
+
+
+def rebuild(conn: Connection) -> Dict[str, int]:
+    """Reindex every source table from scratch. Returns rows indexed per kind."""
+    install(conn)
+    conn.exec_driver_sql(f"DELETE FROM {TABLE}")
+    counts = {}
+    for src in SOURCES:
+        res = conn.exec_driver_sql(
+            f"INSERT INTO {TABLE}({_COLUMNS}) SELECT {_row_expr(src, src.table)} FROM {src.table}"
+        )
+        counts[src.kind] = res.rowcount
+    conn.exec_driver_sql(f"INSERT INTO {TABLE}({TABLE}) VALUES ('optimize')")
+    return counts
+
+
+# ---------- querying ----------
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def match_expression(q: str) -> Optional[str]:
+    """
+    Turn free text into a safe FTS5 query: every word must match, each as a
+    prefix (so "acm pay" finds "Acme Payroll"). FTS syntax in the input is ignored.
+    """
+    tokens = _TOKEN.findall(q or "")
+    if not tokens:
+        return None
+    return " ".join(f'"{t}"*' for t in tokens[:12])
+
+
+def search(
+    conn: Connection,
+    q: str,
+    *,
+    principal=None,
+    kinds: Optional[Sequence[str]] = None,
+    client_id: Optional[int] = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> List[dict]:
+    """
+    Ranked hits (best first). With a non-global `principal` (see
+    permissions.get_principal) results are limited to what that user may see:
+    clients / client notes / manual entries of their clients, tasks and task
+    notes they could open, their own quick notes, and contacts.
+    """
+    expr = match_expression(q)
+    if expr is None:
+        return []
+
+    where = [f"{TABLE} MATCH :expr"]
+    params: Dict[str, object] = {"expr": expr, "limit": limit, "offset": offset}
+
+    if kinds:
+        names = [k for k in kinds if k in KINDS]
+        where.append("kind IN (SELECT value FROM json_each(:kinds))")
+        params["kinds"] = json.dumps(names)
+
+    if client_id is not None:
+        where.append("client_id = :client_id")
+        params["client_id"] = client_id
+
+    if principal is not None and not principal.is_global:
+        params["uid"] = principal.user_id
+        params["cids"] = json.dumps(sorted(principal.client_ids))
+        my_clients = "SELECT value FROM json_each(:cids)"
+        where.append(
+            f"""(
+                kind = 'contact'
+                OR (kind IN ('client', 'client_note', 'manual_entry') AND client_id IN ({my_clients}))
+                OR (kind = 'quick_note' AND owner_id = :uid)
+                OR (kind IN ('task', 'task_note') AND task_id IN (
+                    SELECT id FROM tasks WHERE assigned_user_id = :uid OR client_id IN ({my_clients})
+                    UNION
+                    SELECT task_id FROM task_client_links WHERE client_id IN ({my_clients})
+                ))
+            )"""
+        )
+
+    sql = f"""
+        SELECT kind, ref_id, client_id, task_id, title,
+               snippet({TABLE}, -1, '{SNIPPET_OPEN}', '{SNIPPET_CLOSE}', '…', 12) AS snippet,
+               bm25({TABLE}, 10.0, 1.0) AS score
+        FROM {TABLE}
+        WHERE {' AND '.join(where)}
+        ORDER BY score
+        LIMIT :limit OFFSET :offset
+    """
+    rows = conn.execute(text(sql), params).mappings().all()
+    return [
+        {
+            "kind": r["kind"],
+            "id": r["ref_id"],
+            "client_id": r["client_id"],
+            "task_id": r["task_id"],
+            "title": r["title"] or None,
+            "snippet": r["snippet"],
+            # bm25 is "lower is better"; flip it so clients can sort descending
+            "score": round(-float(r["score"]), 4),
+        }
+        for r in rows
+    ]
+
+
+def main():
+    from .database import engine
+
+    ap = argparse.ArgumentParser(description="Full-text search index")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("rebuild", help="(re)create the index and reindex all rows")
+    qp = sub.add_parser("query", help="run a search (no permission filtering)")
+    qp.add_argument("q")
+    qp.add_argument("--limit", type=int, default=20)
+    args = ap.parse_args()
+
+    if not IS_SQLITE:
+        raise SystemExit("[search] the FTS5 index needs SQLite")
+
+    if args.cmd == "rebuild":
+        started = time.perf_counter()
+        with engine.begin() as conn:
+            counts = rebuild(conn)
+        print(f"[search] indexed {counts} in {time.perf_counter() - started:.1f}s")
+        return
+
+    with engine.connect() as conn:
+        for hit in search(conn, args.q, limit=args.limit):
+            print(f"{hit['score']:>8}  {hit['kind']:<12} {hit['id']:<6} {hit['title'] or ''}  {hit['snippet']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+# app/settings.py
+"""
+Typed, cached view of the app_settings table.
+
+    from .settings import get_settings
+    s = get_settings(db)        # db optional; a session is opened if needed
+    s.docs_root, s.org_name, s.feature_flags, s.get("some_key")
+
+Every process keeps one snapshot in memory, loaded at startup. Writes go
+through upsert_settings(), which bumps each row's `version`; after the commit
+call invalidate_settings() so this process reloads right away. Other workers
+compare (row count, sum of versions) against their snapshot at most every
+YB_SETTINGS_CHECK_SECONDS and reload when it moved.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from .database import SessionLocal
+from . import models
+
+# Used when neither YECNY_DOCS_ROOT nor the docs_root_path setting is set
+DEFAULT_DOCS_DIR = Path(__file__).resolve().parents[2] / "docs"
+
+DOCS_ROOT_ENV = "YECNY_DOCS_ROOT"
+DOCS_ROOT_KEY = "docs_root_path"
+
+# Known keys -> (type, default). Values of the wrong type read as the default;
+# unknown keys are still available through AppSettings.get().
+SPEC: Dict[str, Tuple[type, Any]] = {
+    DOCS_ROOT_KEY: (str, ""),
+    "org_name": (str, ""),
+    "feature_flags": (dict, {}),
+}
+
+SETTINGS_CHECK_SECONDS = float(os.getenv("YB_SETTINGS_CHECK_SECONDS", "5"))
+
+Stamp = Tuple[int, int]  # (row count, sum of row versions)
+
+
+@dataclass(frozen=True)
+class AppSettings:
+    stamp: Stamp
+    values: Mapping[str, Any] = field(default_factory=dict)
+    docs_root: Path = DEFAULT_DOCS_DIR
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in SPEC:
+            typ, fallback = SPEC[key]
+            value = self.values.get(key)
+            return value if isinstance(value, typ) else (fallback if default is None else default)
+        return self.values.get(key, default)
+
+    @property
+    def org_name(self) -> str:
+        return self.get("org_name").strip()
+
+    @property
+    def feature_flags(self) -> Dict[str, Any]:
+        return dict(self.get("feature_flags"))
+
+
+def _docs_root(values: Mapping[str, Any]) -> Path:
+    # Env override is ideal for prod deployments
+    env = os.getenv(DOCS_ROOT_ENV)
+    if env and env.strip():
+        return Path(env).expanduser().resolve()
+    value = values.get(DOCS_ROOT_KEY)
+    if isinstance(value, str) and value.strip():
+        return Path(value).expanduser().resolve()
+    return DEFAULT_DOCS_DIR.resolve()
+
+
+def _stamp(db: Session) -> Stamp:
+    count, total = db.execute(
+        select(func.count(models.AppSetting.id), func.coalesce(func.sum(models.AppSetting.version), 0))
+    ).one()
+    return int(count), int(total)
+
+
+def _load(db: Session) -> AppSettings:
+    rows = db.execute(select(models.AppSetting.key, models.AppSetting.value, models.AppSetting.version)).all()
+    values = {key: value for key, value, _ in rows}
+    stamp = (len(rows), sum(v or 0 for _, _, v in rows))
+    return AppSettings(stamp=stamp, values=values, docs_root=_docs_root(values))
+
+
+# ---------- per-process cache ----------
+
+_cached: Optional[AppSettings] = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def invalidate_settings() -> None:
+    """Forget this process's snapshot; the next get_settings() reloads."""
+    global _cached
+    with _lock:
+        _cached = None
+
+
+def _with_session(db: Optional[Session], fn):
+    if db is not None:
+        return fn(db)
+    own = SessionLocal()
+    try:
+        return fn(own)
+    finally:
+        own.close()
+
+
+def load_settings(db: Optional[Session] = None) -> AppSettings:
+    """Read every row now and make it the cached snapshot (startup / after invalidation)."""
+    global _cached, _checked_at
+    snapshot = _with_session(db, _load)
+    with _lock:
+        _cached, _checked_at = snapshot, time.monotonic()
+    return snapshot
+
+
+def get_settings(db: Optional[Session] = None) -> AppSettings:
+    """
+    The cached snapshot. Costs nothing between checks; a check is one
+    aggregate over app_settings, and only a changed stamp reloads the rows.
+    """
+    global _checked_at
+    with _lock:
+        snapshot, checked_at = _cached, _checked_at
+    if snapshot is None:
+        return load_settings(db)
+
+    now = time.monotonic()
+    if now - checked_at < SETTINGS_CHECK_SECONDS:
+        return snapshot
+    if _with_session(db, _stamp) != snapshot.stamp:
+        return load_settings(db)
+    with _lock:
+        _checked_at = now
+    return snapshot
+
+
+# ---------- writes ----------
+
+def upsert_settings(
+    db: Session, values: Mapping[str, Any], updated_by_id: Optional[int] = None
+) -> List[models.AppSetting]:
+    """
+    Insert / update rows, bumping each changed row's version. Caller commits,
+    then calls invalidate_settings().
+    """
+    keys: Iterable[str] = list(values)
+    existing = {
+        row.key: row
+        for row in db.query(models.AppSetting).filter(models.AppSetting.key.in_(keys))
+    }
+    out = []
+    for key, value in values.items():
+        row = existing.get(key)
+        if row is None:
+            row = models.AppSetting(key=key, value=value, version=1, updated_by_id=updated_by_id)
+            db.add(row)
+        else:
+            row.value = value
+            row.updated_by_id = updated_by_id
+            # SQL-side increment: concurrent writers never reuse a version
+            row.version = models.AppSetting.version + 1
+        out.append(row)
+    db.flush()
+    return out
@@ -1,25 +1,33 @@
 # app/storage.py
 from pathlib import Path
+import hashlib
 import os
+import tempfile
+from typing import BinaryIO, Tuple
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 
-from .models import AppSetting
+from .settings import DEFAULT_DOCS_DIR, get_settings  # noqa: F401  (DEFAULT_DOCS_DIR re-exported)
 
-DEFAULT_DOCS_DIR = Path("/home/kruzer04/YBTM/YB-TM/docs")
+# Upload limits (bytes). Scanned statements can be a few hundred MB.
+UPLOAD_MAX_BYTES = int(os.getenv("YB_UPLOAD_MAX_BYTES", str(512 * 1024 * 1024)))
+UPLOAD_CHUNK_BYTES = int(os.getenv("YB_UPLOAD_CHUNK_BYTES", str(1024 * 1024)))
 
-def get_docs_root(db: Session | None = None) -> Path:
-    # Env override is ideal for prod deployments
-    env = os.getenv("YECNY_DOCS_ROOT")
-    if env and env.strip():
-        return Path(env).expanduser().resolve()
 
-    if db is not None:
-        row = db.query(AppSetting).filter(AppSetting.key == "docs_root_path").first()
-        if row and isinstance(row.value, str) and row.value.strip():
-            return Path(row.value).expanduser().resolve()
+def _default_file_mode() -> int:
+    # os.umask can only be read by setting it; done once at import, before
+    # any worker threads exist
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return 0o666 & ~umask
+
 
-    return DEFAULT_DOCS_DIR.resolve()
+# What open() would have given the file; mkstemp creates its temp files 0600
+FILE_MODE = _default_file_mode()
+
+def get_docs_root(db: Session | None = None) -> Path:
+    """YECNY_DOCS_ROOT, else the docs_root_path setting, else DEFAULT_DOCS_DIR (cached, see app.settings)."""
+    return get_settings(db).docs_root
 
 def _is_under(p: Path, root: Path) -> bool:
     try:
@@ -39,3 +47,50 @@ def abs_doc_path(db: Session, stored_path: str) -> Path:
         raise HTTPException(status_code=500, detail=f"Refusing path outside docs root: {abs_p}")
 
     return abs_p
+
+
+def save_upload_stream(
+    src: BinaryIO,
+    dest: Path,
+    max_bytes: int = UPLOAD_MAX_BYTES,
+    chunk_size: int = UPLOAD_CHUNK_BYTES,
+) -> Tuple[int, str]:
+    """
+    Copy an upload to `dest` in fixed-size chunks, hashing as it goes.
+
+    Data lands in a temp file next to `dest` and is renamed into place only
+    once complete, so a failed or oversized upload never leaves a partial
+    file behind. Returns (size_bytes, sha256_hex). Blocking: call from a
+    sync handler / threadpool.
+    """
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+
+    fd, tmp_name = tempfile.mkstemp(prefix=".upload-", suffix=".part", dir=dest.parent)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = src.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"File too large (max {max_bytes / (1024 * 1024):.0f} MB)",
+                    )
+                digest.update(chunk)
+                out.write(chunk)
+            out.flush()
+            os.fchmod(out.fileno(), FILE_MODE)
+            os.fsync(out.fileno())
+        os.replace(tmp_name, dest)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+    return size, digest.hexdigest()
@@ -0,0 +1,156 @@
+# bench/clients_list.py
+"""
+GET /api/clients memory and latency, with and without eager-loaded notes.
+
+Seeds --clients clients with --notes notes and --entries manual entries each
+(default 500 x 50 x 10), then requests the full list (limit=500) through
+TestClient as an owner:
+
+- after:  the current models (notes / manual_entries load on demand)
+- before: every Client select gets selectinload(Client.notes) and
+          selectinload(Client.manual_entries), which is what the old
+          lazy="selectin" relationships did on each Client load
+
+Latency comes from untraced runs; peak memory from one run under tracemalloc.
+
+    python -m bench.clients_list [--clients 500] [--notes 50] [--entries 10] [--repeat 20]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, selectinload
+
+from .common import fmt, make_user, summarize, token_for, use_temp_db
+
+
+@contextmanager
+def eager_client_collections():
+    """Emulate the old lazy="selectin" relationships on Client."""
+    from app import models
+
+    def add_options(state):
+        if not state.is_select or state.is_column_load or state.is_relationship_load:
+            return
+        if any(m.class_ is models.Client for m in state.all_mappers):
+            state.statement = state.statement.options(
+                selectinload(models.Client.notes), selectinload(models.Client.manual_entries)
+            )
+
+    event.listen(Session, "do_orm_execute", add_options)
+    try:
+        yield
+    finally:
+        event.remove(Session, "do_orm_execute", add_options)
+
+
+@contextmanager
+def count_statements():
+    from app.database import engine
+
+    counter = {"n": 0}
+
+    def listener(conn, cursor, statement, parameters, context, executemany):
+        counter["n"] += 1
+
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+
+def seed(db, clients: int, notes: int, entries: int, rng: random.Random) -> None:
+    from app import models
+
+    words = "payroll reconcile invoice vendor bank statement receipt tax quarter ledger deposit refund".split()
+    first = (db.query(models.Client.id).order_by(models.Client.id.desc()).limit(1).scalar() or 0) + 1
+    db.execute(models.Client.__table__.insert(), [{"legal_name": f"Bench Client {i:04d}"} for i in range(clients)])
+    ids = range(first, first + clients)
+    for cid in ids:
+        db.execute(models.ClientNote.__table__.insert(), [
+            {"client_id": cid, "body": " ".join(rng.choices(words, k=40)), "pinned": False}
+            for _ in range(notes)
+        ])
+        if entries:
+            db.execute(models.ClientManualEntry.__table__.insert(), [
+                {"client_id": cid, "category": "general", "title": f"entry {n}", "body": " ".join(rng.choices(words, k=60))}
+                for n in range(entries)
+            ])
+    db.commit()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="GET /api/clients with and without eager-loaded notes")
+    ap.add_argument("--clients", type=int, default=500)
+    ap.add_argument("--notes", type=int, default=50, help="notes per client")
+    ap.add_argument("--entries", type=int, default=10, help="manual entries per client")
+    ap.add_argument("--repeat", type=int, default=20)
+    ap.add_argument("--json", action="store_true")
+    args = ap.parse_args()
+
+    use_temp_db()
+    from fastapi.testclient import TestClient
+
+    from app.database import SessionLocal
+    from app.main import app
+
+    db = SessionLocal()
+    try:
+        seed(db, args.clients, args.notes, args.entries, random.Random(1))
+        owner = make_user(db, "owner")
+    finally:
+        db.close()
+
+    headers = {"Authorization": f"Bearer {token_for(owner)}"}
+    path = "/api/clients/?limit=500"
+
+    def get() -> int:
+        r = client.get(path, headers=headers)
+        assert r.status_code == 200, r.text
+        return len(r.json())
+
+    results = {}
+    with TestClient(app) as client:
+        for mode in ("before", "after"):
+            ctx = eager_client_collections() if mode == "before" else nullcontext()
+            with ctx:
+                rows = get()  # warm up
+                ms = []
+                for _ in range(args.repeat):
+                    t0 = time.perf_counter()
+                    get()
+                    ms.append((time.perf_counter() - t0) * 1000)
+
+                with count_statements() as statements:
+                    get()
+                tracemalloc.start()
+                get()
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+            results[mode] = {
+                "rows": rows,
+                "statements": statements["n"],
+                "peak_mib": round(peak / 2**20, 1),
+                "latency": summarize(ms),
+            }
+
+    if args.json:
+        print(json.dumps(results, indent=1))
+        return
+    print(f"[bench] {args.clients} clients x {args.notes} notes x {args.entries} manual entries, GET {path}")
+    for mode, r in results.items():
+        print(
+            f"[bench] {mode:6} rows={r['rows']} statements={r['statements']} "
+            f"peak={r['peak_mib']}MiB {fmt(r['latency'])}"
+        )
+
+
+if __name__ == "__main__":
+    main()
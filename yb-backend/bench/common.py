@@ -0,0 +1,181 @@
+# bench/common.py
+"""
+Shared benchmark setup: a throwaway copy of the repo's yb_app.db, migrated to
+head, with a docs root next to it. Call use_temp_db() before anything imports
+app.* so the app's engine and settings point at the copy (same trick as
+tests/conftest.py); the real DB and docs are never touched.
+"""
+from __future__ import annotations
+
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import warnings
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from statistics import median
+from typing import Dict, List, Optional
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+REPO_DIR = BACKEND_DIR.parent
+
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+
+def use_temp_db(workdir: Optional[str] = None, keep: bool = False) -> Path:
+    """Point YB_DATABASE_URL / YECNY_DOCS_ROOT at a migrated copy; returns its dir."""
+    if "app.database" in sys.modules:
+        raise RuntimeError("use_temp_db() must run before app.* is imported")
+
+    root = Path(workdir or tempfile.mkdtemp(prefix="yb-bench-"))
+    root.mkdir(parents=True, exist_ok=True)
+    db_file = root / "yb_bench.db"
+
+    os.environ["YB_DATABASE_URL"] = f"sqlite:///{db_file}"
+    os.environ["YECNY_DOCS_ROOT"] = str(root / "docs")
+    os.environ.setdefault("YB_SECRET_KEY", "bench-secret")
+
+    # The chain can't be replayed from an empty file, so start from the
+    # checked-in DB and go to head.
+    shutil.copyfile(REPO_DIR / "yb_app.db", db_file)
+    subprocess.run(
+        [sys.executable, "-m", "alembic", "upgrade", "head"],
+        cwd=REPO_DIR,
+        env=dict(os.environ),
+        check=True,
+        capture_output=True,
+    )
+    # the models' known overlapping-relationship warnings, once per process
+    from sqlalchemy.exc import SAWarning
+
+    warnings.filterwarnings("ignore", category=SAWarning)
+
+    if not keep:
+        import atexit
+
+        atexit.register(shutil.rmtree, root, True)
+    print(f"[bench] scratch DB: {db_file}{' (kept)' if keep else ''}")
+    return root
+
+
+def make_user(db, role: str = "bookkeeper", email: Optional[str] = None):
+    """A committed, active user (password "bench")."""
+    from app import models
+    from app.auth import get_password_hash
+
+    n = db.query(models.User).count() + 1
+    user = models.User(
+        email=email or f"bench{n}@example.com",
+        name=f"Bench {n}",
+        hashed_password=get_password_hash("bench"),
+        role=role,
+        is_active=True,
+    )
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+STATUSES = ["new", "in_progress", "waiting_on_client", "completed"]
+
+
+def seed_tasks(db, user_id: Optional[int], n: int, rng: random.Random, client_ids=(None,), **fields) -> None:
+    """n tasks for user_id, due within +-60 days of today, mixed statuses."""
+    from app import models
+
+    today = datetime.combine(date.today(), datetime.min.time())
+    rows = [
+        {
+            "title": f"bench task {i}",
+            "status": rng.choice(STATUSES),
+            "task_type": "ad_hoc",
+            "due_date": today + timedelta(days=rng.randint(-60, 60), hours=rng.choice([0, 9, 17])),
+            "assigned_user_id": user_id,
+            "client_id": rng.choice(client_ids),
+            "created_at": today - timedelta(days=rng.randint(0, 365)),
+            **fields,
+        }
+        for i in range(n)
+    ]
+    for start in range(0, n, 5000):
+        db.execute(models.Task.__table__.insert(), rows[start:start + 5000])
+    db.commit()
+
+
+def seed_rules(db, n: int, cycles: int, rng: random.Random, user_id: Optional[int] = None, client_id=None) -> date:
+    """
+    n active rules whose next_run is `cycles` runs in the past (a mix of
+    monthly / quarterly / annual, day-of-month and nth-weekday). Returns the
+    "today" to run them as.
+    """
+    from app import models
+
+    today = date.today()
+    rows = []
+    for i in range(n):
+        schedule = rng.choice(["monthly", "monthly", "quarterly", "annual"])
+        months = {"monthly": 1, "quarterly": 3, "annual": 12}[schedule] * cycles
+        year, month = divmod(today.year * 12 + today.month - 1 - months, 12)
+        kw = (
+            {"day_of_month": rng.randint(1, 28), "weekday": None, "week_of_month": None}
+            if rng.random() < 0.7
+            else {"day_of_month": None, "weekday": rng.randint(0, 6), "week_of_month": rng.choice([1, 2, 3, 4, -1])}
+        )
+        rows.append({
+            "name": f"bench rule {i}",
+            "schedule_type": schedule,
+            "next_run": date(year, month + 1, 1),
+            "default_status": "new",
+            "assigned_user_id": user_id,
+            "client_id": client_id,
+            "active": True,
+            "created_at": datetime.utcnow(),
+            **kw,
+        })
+    for start in range(0, n, 5000):
+        db.execute(models.RecurringTask.__table__.insert(), rows[start:start + 5000])
+    db.commit()
+    return today
+
+
+def snapshot_db(dest: Path) -> Path:
+    """Copy the scratch DB (checkpointed, so the copy is self-contained) to dest."""
+    from app.database import engine
+
+    with engine.connect() as conn:
+        conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+    engine.dispose()
+    shutil.copyfile(engine.url.database, dest)
+    return dest
+
+
+def token_for(user) -> str:
+    from app.auth import create_access_token
+
+    return create_access_token({"sub": user.id})
+
+
+def pct(sorted_ms: List[float], p: float) -> float:
+    if not sorted_ms:
+        return 0.0
+    return sorted_ms[min(len(sorted_ms) - 1, int(p * len(sorted_ms)))]
+
+
+def summarize(ms: List[float]) -> Dict[str, float]:
+    ms = sorted(ms)
+    return {
+        "n": len(ms),
+        "p50_ms": round(median(ms), 2) if ms else 0.0,
+        "p95_ms": round(pct(ms, 0.95), 2),
+        "p99_ms": round(pct(ms, 0.99), 2),
+        "max_ms": round(ms[-1], 2) if ms else 0.0,
+    }
+
+
+def fmt(stats: Dict[str, float]) -> str:
+    return " ".join(f"{k.replace('_ms', '')}={v}{'ms' if k.endswith('_ms') else ''}" for k, v in stats.items())
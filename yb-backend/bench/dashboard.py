@@ -0,0 +1,175 @@
+# bench/dashboard.py
+"""
+/tasks/my-dashboard: the old four-query implementation vs the current one.
+
+Seeds --tasks tasks (default 50k) spread over --users bookkeepers, then times
+both implementations for the first user, in-process against the same session
+(queries + bucketing + building the response model, no HTTP). Also checks the
+two agree: same tasks in each bucket, in the same order of the sort keys.
+
+    python -m bench.dashboard [--tasks 50000] [--users 10] [--repeat 30]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import func
+
+from .common import fmt, make_user, seed_tasks, summarize, use_temp_db
+
+BUCKETS = ("overdue", "today", "upcoming", "waiting_on_client")
+
+
+def old_dashboard(db, target_user_id: int, include_unassigned: bool = False):
+    """
+    The query part of get_my_dashboard before the single-query rewrite, frozen
+    from `git show 6f15a0a~1:yb-backend/app/routes_tasks.py` (the role checks,
+    unchanged since, are left out). func.date(due_date) keeps SQLite from
+    using the due_date column of the index.
+    """
+    from app import models, schemas
+
+    today = date.today()
+    seven_days = today + timedelta(days=7)
+
+    base_q = db.query(models.Task)
+
+    # who are we viewing?
+    if include_unassigned:
+        base_q = base_q.filter(models.Task.assigned_user_id.is_(None))
+    else:
+        base_q = base_q.filter(models.Task.assigned_user_id == target_user_id)
+
+    # never show blocked onboarding in dashboard
+    base_q = base_q.filter(
+        ~((models.Task.task_type == "onboarding") & (func.lower(models.Task.status) == "blocked"))
+    )
+    overdue = (
+        base_q.filter(
+            models.Task.due_date.isnot(None),
+            func.date(models.Task.due_date) < today,
+            models.Task.status != "completed",
+            models.Task.status != "waiting_on_client",
+        )
+        .order_by(models.Task.due_date.asc())
+        .all()
+    )
+
+    today_tasks = (
+        base_q.filter(
+            models.Task.due_date.isnot(None),
+            func.date(models.Task.due_date) == today,
+            models.Task.status != "completed",
+            models.Task.status != "waiting_on_client",
+        )
+        .order_by(models.Task.created_at.asc())
+        .all()
+    )
+
+    upcoming = (
+        base_q.filter(
+            models.Task.due_date.isnot(None),
+            func.date(models.Task.due_date) > today,
+            func.date(models.Task.due_date) <= seven_days,
+            models.Task.status != "completed",
+            models.Task.status != "waiting_on_client",
+        )
+        .order_by(models.Task.due_date.asc())
+        .all()
+    )
+
+    waiting = (
+        base_q.filter(models.Task.status == "waiting_on_client")
+        .order_by(models.Task.due_date.asc())
+        .all()
+    )
+
+    return schemas.TaskDashboardResponse(
+        overdue=overdue,
+        today=today_tasks,
+        upcoming=upcoming,
+        waiting_on_client=waiting,
+    )
+
+
+def new_dashboard(db, user, counts_only: bool = False):
+    from app.routes_tasks import get_my_dashboard
+
+    return get_my_dashboard(
+        assignee_user_id=None,
+        include_unassigned=False,
+        counts_only=counts_only,
+        limit=None,
+        db=db,
+        current_user=user,
+    )
+
+
+def _same(old, new) -> bool:
+    """Bucket membership, and ordering by each bucket's sort key."""
+    for name in BUCKETS:
+        a, b = getattr(old, name), getattr(new, name)
+        key = (lambda t: t.created_at) if name == "today" else (lambda t: t.due_date)
+        if {t.id for t in a} != {t.id for t in b} or [key(t) for t in a] != [key(t) for t in b]:
+            return False
+    return True
+
+
+def main():
+    ap = argparse.ArgumentParser(description="my-dashboard: old four-query vs single-query implementation")
+    ap.add_argument("--tasks", type=int, default=50_000, help="tasks in the table")
+    ap.add_argument("--users", type=int, default=10, help="bookkeepers the tasks are spread over")
+    ap.add_argument("--repeat", type=int, default=30)
+    ap.add_argument("--json", action="store_true")
+    args = ap.parse_args()
+
+    use_temp_db()
+    from app.database import SessionLocal
+
+    rng = random.Random(1)
+    db = SessionLocal()
+    try:
+        users = [make_user(db) for _ in range(max(1, args.users))]
+        per_user = args.tasks // len(users)
+        for u in users:
+            seed_tasks(db, u.id, per_user, rng)
+        user = users[0]
+
+        variants = {
+            "old (4 queries, func.date)": lambda: old_dashboard(db, user.id),
+            "new (1 range query)": lambda: new_dashboard(db, user),
+            "new counts_only": lambda: new_dashboard(db, user, counts_only=True),
+        }
+        results = {}
+        for name, fn in variants.items():
+            fn()
+            ms = []
+            for _ in range(args.repeat):
+                db.expunge_all()
+                t0 = time.perf_counter()
+                fn()
+                ms.append((time.perf_counter() - t0) * 1000)
+            results[name] = summarize(ms)
+
+        db.expunge_all()
+        same = _same(old_dashboard(db, user.id), new_dashboard(db, user))
+        counts = new_dashboard(db, user, counts_only=True).counts.model_dump()
+    finally:
+        db.close()
+
+    if args.json:
+        print(json.dumps({"tasks": per_user * len(users), "user_tasks": per_user, "counts": counts,
+                          "same": same, "results": results}, indent=1))
+        return
+    print(f"[bench] {per_user * len(users)} tasks, {per_user} for the viewed user; buckets {counts}")
+    for name, stats in results.items():
+        print(f"[bench] {name:28} {fmt(stats)}")
+    print(f"[bench] old and new buckets match: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# bench/dashboard_concurrency.py
+"""
+20 concurrent clients on GET /api/tasks/my-dashboard.
+
+Seeds one bookkeeper per client thread (each with --tasks tasks) in a scratch
+copy of the DB, starts uvicorn on it (app.loadtest.spawn_server) and runs a
+closed loop like app.loadtest's, one keep-alive connection per client.
+Reports throughput and p50/p95/p99. Compare threadpool sizes with --threadpool 1,40 (YB_THREADPOOL_SIZE); a
+blocked event loop shows up as p99 climbing with the number of clients.
+
+    python -m bench.dashboard_concurrency [--clients 20] [--tasks 2000] [--duration 20]
+"""
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import os
+import random
+import threading
+import time
+
+from .common import fmt, make_user, seed_tasks, summarize, token_for, use_temp_db
+
+
+def main():
+    ap = argparse.ArgumentParser(description="my-dashboard latency under concurrent clients")
+    ap.add_argument("--clients", type=int, default=20, help="client threads (one user each)")
+    ap.add_argument("--tasks", type=int, default=2000, help="tasks per user")
+    ap.add_argument("--duration", type=float, default=20.0, help="seconds per run")
+    ap.add_argument("--warmup", type=float, default=2.0)
+    ap.add_argument("--workers", type=int, default=1, help="uvicorn workers")
+    ap.add_argument("--threadpool", default="40", help="comma-separated YB_THREADPOOL_SIZE values to compare")
+    ap.add_argument("--port", type=int, default=8766)
+    ap.add_argument("--json", action="store_true")
+    args = ap.parse_args()
+
+    use_temp_db()
+    from app import loadtest
+    from app.database import SessionLocal
+
+    rng = random.Random(1)
+    db = SessionLocal()
+    try:
+        users = [make_user(db) for _ in range(args.clients)]
+        for u in users:
+            seed_tasks(db, u.id, args.tasks, rng)
+        tokens = [token_for(u) for u in users]
+    finally:
+        db.close()
+
+    url = f"http://127.0.0.1:{args.port}"
+    results = []
+    for size in [int(n) for n in args.threadpool.split(",") if n.strip()]:
+        os.environ["YB_THREADPOOL_SIZE"] = str(size)
+        proc = loadtest.spawn_server(args.workers, args.port)
+        try:
+            loadtest._wait_ready(url)
+            if args.warmup > 0:
+                run_clients(url, tokens, args.warmup)
+            results.append({"threadpool": size, **run_clients(url, tokens, args.duration)})
+        finally:
+            loadtest.stop_server(proc)
+
+    if args.json:
+        print(json.dumps(results, indent=1))
+        return
+    for r in results:
+        stats = {k: r[k] for k in ("n", "p50_ms", "p95_ms", "p99_ms", "max_ms")}
+        print(
+            f"[bench] my-dashboard clients={args.clients} threadpool={r['threadpool']} "
+            f"rps={r['rps']} errors={r['errors']} {fmt(stats)}"
+        )
+
+
+def run_clients(url: str, tokens: list, duration: float) -> dict:
+    """Closed loop, one thread per token (each client sees its own dashboard)."""
+    from app.loadtest import ENDPOINTS, _Conn
+
+    method, path = ENDPOINTS["dashboard"]
+    samples, errors = [], [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client(token: str):
+        conn, local, failed = _Conn(url), [], 0
+        headers = {"Authorization": f"Bearer {token}"}
+        while time.perf_counter() < deadline:
+            t0 = time.perf_counter()
+            try:
+                status, _ = conn.request(method, path, headers)
+            except (OSError, http.client.HTTPException):
+                status = 0
+            if status == 200:
+                local.append((time.perf_counter() - t0) * 1000)
+            else:
+                failed += 1
+        with lock:
+            samples.extend(local)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=client, args=(t,)) for t in tokens]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+    return {**summarize(samples), "rps": round(len(samples) / elapsed, 1), "errors": errors[0]}
+
+
+if __name__ == "__main__":
+    main()
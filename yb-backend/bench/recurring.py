@@ -0,0 +1,207 @@
+# bench/recurring.py
+"""
+run_recurring catch-up: 10k rules x 36 missed cycles.
+
+Seeds --rules active rules whose next_run is --cycles runs in the past, then
+runs, each on a fresh copy of the same seeded DB:
+
+- old: the per-rule, per-date runner (one existence query and one ORM add
+  per due date, one commit at the end), frozen below from
+  `git show 968535d~1:yb-backend/app/run_recurring.py`
+- new: app.run_recurring.run_once (set-based, batched commits)
+
+and checks both leave the same tasks and next_run values behind.
+
+    python -m bench.recurring [--rules 10000] [--cycles 36] [--skip-old]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import shutil
+import time
+from datetime import date, datetime
+from pathlib import Path
+from typing import Optional
+
+from .common import make_user, seed_rules, snapshot_db, use_temp_db
+
+
+# ---------- the old runner (frozen) ----------
+
+def _ensure_task_for_rule_and_date(db, rule, due: date) -> bool:
+    from app import models
+
+    due_dt = datetime.combine(due, datetime.min.time())
+
+    existing = (
+        db.query(models.Task)
+        .filter(
+            models.Task.recurring_task_id == rule.id,
+            models.Task.task_type == "recurring",
+            models.Task.due_date == due_dt,
+        )
+        .first()
+    )
+    if existing:
+        return False
+
+    task = models.Task(
+        title=rule.name,
+        description=rule.description or "",
+        status=rule.default_status or "new",
+        due_date=due_dt,
+        assigned_user_id=rule.assigned_user_id,
+        client_id=rule.client_id,
+        recurring_task_id=rule.id,
+        task_type="recurring",
+    )
+    db.add(task)
+    return True
+
+
+def old_run_once(today: Optional[date] = None) -> dict:
+    from app import models
+    from app.database import SessionLocal
+    from app.recurring_utils import advance_next_run
+
+    today = today or date.today()
+    db = SessionLocal()
+    created = 0
+    advanced = 0
+    skipped_infinite = 0
+
+    try:
+        rules = (
+            db.query(models.RecurringTask)
+            .filter(models.RecurringTask.active == True)  # noqa: E712
+            .all()
+        )
+
+        for rule in rules:
+            if not rule.next_run:
+                continue
+
+            loops = 0
+            while rule.next_run and rule.next_run <= today:
+                loops += 1
+                if loops > 36:  # safety for misconfigured rules
+                    skipped_infinite += 1
+                    break
+
+                due = rule.next_run
+                if _ensure_task_for_rule_and_date(db, rule, due):
+                    created += 1
+
+                rule.next_run = advance_next_run(
+                    rule.schedule_type,
+                    due,
+                    day_of_month=rule.day_of_month,
+                    weekday=rule.weekday,
+                    week_of_month=rule.week_of_month,
+                )
+                advanced += 1
+
+        db.commit()
+        return {
+            "created": created,
+            "advanced": advanced,
+            "skipped_infinite": skipped_infinite,
+            "today": str(today),
+        }
+    finally:
+        db.close()
+
+
+# ---------- harness ----------
+
+def _reset(template: Path) -> None:
+    """Put the seeded DB back in place (the engine reconnects on next use)."""
+    from app.database import engine
+
+    engine.dispose()
+    db_file = Path(engine.url.database)
+    for suffix in ("-wal", "-shm"):
+        side = Path(str(db_file) + suffix)
+        if side.exists():
+            side.unlink()
+    shutil.copyfile(template, db_file)
+
+
+def _outcome():
+    """Everything a run leaves behind, for comparing old and new."""
+    from app import models
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        tasks = sorted(
+            db.query(
+                models.Task.recurring_task_id, models.Task.due_date, models.Task.title,
+                models.Task.status, models.Task.assigned_user_id, models.Task.client_id,
+            )
+            .filter(models.Task.task_type == "recurring")
+            .all()
+        )
+        rules = sorted(db.query(models.RecurringTask.id, models.RecurringTask.next_run).all())
+        return tasks, rules
+    finally:
+        db.close()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="run_recurring catch-up: old per-row runner vs set-based run_once")
+    ap.add_argument("--rules", type=int, default=10_000)
+    ap.add_argument("--cycles", type=int, default=36, help="missed runs per rule")
+    ap.add_argument("--skip-old", action="store_true", help="only time the current runner")
+    ap.add_argument("--json", action="store_true")
+    args = ap.parse_args()
+
+    root = use_temp_db()
+    from app import models, run_recurring
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        user = make_user(db)
+        client_id = db.query(models.Client.id).order_by(models.Client.id).limit(1).scalar()
+        today = seed_rules(db, args.rules, args.cycles, random.Random(1), user.id, client_id)
+    finally:
+        db.close()
+    template = snapshot_db(root / "seeded.db")
+
+    results = {}
+    outcomes = {}
+    runners = {"new": lambda: run_recurring.run_once(today)}
+    if not args.skip_old:
+        runners["old"] = lambda: old_run_once(today)
+    for name, run in runners.items():
+        _reset(template)
+        t0 = time.perf_counter()
+        out = run()
+        seconds = time.perf_counter() - t0
+        results[name] = {
+            "seconds": round(seconds, 2),
+            "created": out["created"],
+            "advanced": out["advanced"],
+            "capped": out["skipped_infinite"],
+        }
+        outcomes[name] = _outcome()
+
+    same = outcomes["old"] == outcomes["new"] if "old" in outcomes else None
+    if args.json:
+        print(json.dumps({"rules": args.rules, "cycles": args.cycles, "results": results, "same": same}, indent=1))
+        return
+    print(f"[bench] {args.rules} rules, {args.cycles} missed cycles each, as of {today}")
+    for name, r in results.items():
+        print(
+            f"[bench] {name:3} {r['seconds']:>8}s created={r['created']} advanced={r['advanced']} capped={r['capped']}"
+        )
+    if same is not None:
+        print(f"[bench] speedup x{results['old']['seconds'] / max(results['new']['seconds'], 1e-9):.1f}; "
+              f"same tasks and next_run: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+# bench/recurring_calendar.py
+"""
+Recurring date math: the memoized app.recurring_utils vs the frozen
+pre-memoization copy in tests/_recurring_baseline.py.
+
+Same seeded inputs for both sides (realistic rules: monthly / quarterly /
+annual, day-of-month or nth-weekday, dates 2015-2030):
+
+- advance_next_run    --calls calls
+- next_run_from       --calls calls
+- forecast            12-month occurrences_between() for --rules rules
+                      (what the forecast endpoint calls per request)
+- occurrences         the same through the new occurrences() generator
+- last_day_of_month   every month 1900-2199
+
+Each workload runs --repeat times with both modules' caches cleared
+first, so a run pays for filling them; best and median per call are shown,
+and the outputs of both sides are compared. No DB needed.
+
+    python -m bench.recurring_calendar [--calls 200000] [--rules 2000] [--repeat 5]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import date, timedelta
+from statistics import median
+
+from .common import BACKEND_DIR
+
+sys.path.insert(0, str(BACKEND_DIR / "tests"))
+
+import _recurring_baseline as baseline  # noqa: E402
+from app import recurring_utils as current  # noqa: E402
+
+SCHEDULES = ["monthly", "monthly", "quarterly", "annual"]
+
+
+def random_rule(rng: random.Random) -> dict:
+    if rng.random() < 0.7:
+        return {"day_of_month": rng.randint(1, 31)}
+    return {"weekday": rng.randint(0, 6), "week_of_month": rng.choice([1, 2, 3, 4, -1])}
+
+
+def random_date(rng: random.Random) -> date:
+    return date(2015, 1, 1) + timedelta(days=rng.randint(0, 365 * 15))
+
+
+def _clear_caches() -> None:
+    for module in (baseline, current):
+        for fn in vars(module).values():
+            if hasattr(fn, "cache_clear"):
+                fn.cache_clear()
+
+
+def workloads(args, rng: random.Random) -> dict:
+    calls = [(rng.choice(SCHEDULES), random_date(rng), random_rule(rng)) for _ in range(args.calls)]
+
+    start = date.today().replace(day=1)
+    end = start + timedelta(days=365)
+    rules = []
+    for _ in range(args.rules):
+        schedule, kw = rng.choice(SCHEDULES), random_rule(rng)
+        next_run = baseline.next_run_from(schedule, start - timedelta(days=rng.randint(0, 90)), **kw)
+        rules.append((schedule, kw, next_run))
+    months = [(y, m) for y in range(1900, 2200) for m in range(1, 13)]
+
+    def forecast_old():
+        return [
+            [d for d in baseline.occurrences_between(s, nr, end, **kw) if d >= start]
+            for s, kw, nr in rules
+        ]
+
+    def forecast_new():
+        return [
+            [d for d in current.occurrences_between(s, nr, end, **kw) if d >= start]
+            for s, kw, nr in rules
+        ]
+
+    def occurrences_new():
+        return [
+            list(current.occurrences(
+                current.RuleSpec(s, kw.get("day_of_month"), kw.get("weekday"), kw.get("week_of_month"), nr),
+                start, end,
+            ))
+            for s, kw, nr in rules
+        ]
+
+    return {
+        "advance_next_run": (
+            len(calls),
+            lambda: [baseline.advance_next_run(s, d, **kw) for s, d, kw in calls],
+            lambda: [current.advance_next_run(s, d, **kw) for s, d, kw in calls],
+        ),
+        "next_run_from": (
+            len(calls),
+            lambda: [baseline.next_run_from(s, d, **kw) for s, d, kw in calls],
+            lambda: [current.next_run_from(s, d, **kw) for s, d, kw in calls],
+        ),
+        "forecast": (len(rules), forecast_old, forecast_new),
+        "occurrences": (len(rules), forecast_old, occurrences_new),
+        "last_day_of_month": (
+            len(months),
+            lambda: [baseline.last_day_of_month(y, m) for y, m in months],
+            lambda: [current.last_day_of_month(y, m) for y, m in months],
+        ),
+    }
+
+
+def _time(fn, repeat: int) -> tuple[list, list]:
+    runs, out = [], None
+    for _ in range(repeat):
+        _clear_caches()
+        t0 = time.perf_counter()
+        out = fn()
+        runs.append(time.perf_counter() - t0)
+    return runs, out
+
+
+def main():
+    ap = argparse.ArgumentParser(description="recurring_utils: memoized vs pre-memoization date math")
+    ap.add_argument("--calls", type=int, default=200_000, help="advance_next_run / next_run_from calls")
+    ap.add_argument("--rules", type=int, default=2000, help="rules in the forecast workload")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--json", action="store_true")
+    args = ap.parse_args()
+
+    results = {}
+    for name, (n, old, new) in workloads(args, random.Random(1)).items():
+        old_runs, old_out = _time(old, args.repeat)
+        new_runs, new_out = _time(new, args.repeat)
+        results[name] = {
+            "calls": n,
+            "old_best_us": round(min(old_runs) / n * 1e6, 3),
+            "old_median_us": round(median(old_runs) / n * 1e6, 3),
+            "new_best_us": round(min(new_runs) / n * 1e6, 3),
+            "new_median_us": round(median(new_runs) / n * 1e6, 3),
+            "speedup": round(min(old_runs) / min(new_runs), 2),
+            "same": old_out == new_out,
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=1))
+        return
+    for name, r in results.items():
+        print(
+            f"[bench] {name:18} n={r['calls']:<7} old {r['old_best_us']:>8.3f}us/call "
+            f"new {r['new_best_us']:>8.3f}us/call  x{r['speedup']}  same={r['same']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
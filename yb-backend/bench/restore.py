@@ -0,0 +1,141 @@
+# bench/restore.py
+"""
+Restore throughput on a synthetic docs tree.
+
+Builds a docs tree of --gb gigabytes (statement-sized files, 50 KiB - 16 MiB,
+mostly incompressible like real PDFs/scans plus a --text share of text-like
+files), takes a backup_nightly snapshot of it, then times app.restore's
+restore_docs into an empty directory for each --workers value, plus one
+re-run over the finished tree (the "resume" path: every file is hashed and
+skipped).
+
+Scales to production size; it needs roughly 3x --gb of free disk (tree, blobs,
+restored copy), so point --dir at a big volume:
+
+    python -m bench.restore --gb 1 --workers 1,4,8
+    python -m bench.restore --gb 20 --dir /mnt/scratch --workers 4,8,16
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from .common import use_temp_db
+
+MIB = 1024 * 1024
+POOL_SIZE = 64 * MIB
+WORDS = b"invoice statement balance deposit withdrawal transfer payroll vendor ledger reconcile total".split()
+
+
+def build_tree(docs: Path, total_bytes: int, text_share: float, rng: random.Random) -> tuple[int, int]:
+    """Write files until total_bytes; returns (files, bytes)."""
+    # Slices of one random / one text pool at random offsets: cheap to
+    # produce, and each file is unique thanks to its header line.
+    binary = os.urandom(POOL_SIZE)
+    lines, text_size = [], 0
+    while text_size < POOL_SIZE:
+        line = b" ".join(rng.choices(WORDS, k=12)) + b" %d\n" % rng.randint(0, 10**9)
+        lines.append(line)
+        text_size += len(line)
+    text = b"".join(lines)
+    files = written = 0
+    while written < total_bytes:
+        size = min(int(2 ** rng.uniform(15.6, 24)), total_bytes - written)
+        client, year = rng.randint(1, 500), rng.randint(2019, 2026)
+        path = docs / f"client_{client:03d}" / str(year) / f"statement_{files:07d}.pdf"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("wb") as f:
+            f.write(f"%PDF-1.7 bench file {files}\n".encode())
+            pool = text if rng.random() < text_share else binary
+            left = size
+            while left > 0:
+                n = min(left, 4 * MIB)
+                start = rng.randrange(0, len(pool) - n + 1)
+                f.write(pool[start:start + n])
+                left -= n
+        files += 1
+        written += size
+    return files, written
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Backup restore throughput on a synthetic docs tree")
+    ap.add_argument("--gb", type=float, default=1.0, help="size of the docs tree (GiB), e.g. 20")
+    ap.add_argument("--text", type=float, default=0.2, help="share of text-like (compressible) files")
+    ap.add_argument("--workers", default="1,4,8", help="comma-separated restore worker counts")
+    ap.add_argument("--dir", default=None, help="scratch directory (default: system temp)")
+    ap.add_argument("--keep", action="store_true", help="leave the scratch directory behind")
+    ap.add_argument("--json", action="store_true")
+    args = ap.parse_args()
+
+    workers = [int(n) for n in args.workers.split(",") if n.strip()]
+    total = int(args.gb * 1024 * MIB)
+    parent = Path(args.dir or tempfile.gettempdir())
+    free = shutil.disk_usage(parent).free
+    if free < 3.2 * total:
+        raise SystemExit(f"[bench] need ~{3.2 * total / 2**30:.1f} GiB free under {parent}, have {free / 2**30:.1f}")
+
+    root = use_temp_db(tempfile.mkdtemp(prefix="yb-bench-", dir=parent), keep=args.keep)
+    os.environ["YB_BACKUP_DIR"] = str(root / "backups")
+    from app import backup_nightly, restore
+
+    docs = Path(os.environ["YECNY_DOCS_ROOT"])
+    t0 = time.perf_counter()
+    files, size = build_tree(docs, total, args.text, random.Random(1))
+    print(f"[bench] built {files} files, {size / MIB:.0f} MiB in {time.perf_counter() - t0:.1f}s")
+
+    backup_root = backup_nightly.backup_root()
+    t0 = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        snapshot = backup_nightly.take_snapshot(backup_root)
+    backup_s = time.perf_counter() - t0
+    manifest = backup_nightly.load_manifest(snapshot)
+    blob_bytes = sum(p.stat().st_size for p in (backup_root / "blobs").rglob("*.gz"))
+    print(
+        f"[bench] snapshot {backup_s:.1f}s ({size / MIB / backup_s:.1f} MiB/s), "
+        f"blobs {blob_bytes / MIB:.0f} MiB ({blob_bytes / size:.0%} of the tree)"
+    )
+
+    results = []
+    dest = root / "restored"
+    for n in workers:
+        shutil.rmtree(dest, ignore_errors=True)
+        results.append(_timed_restore(restore, backup_root, manifest, dest, n, size, "cold"))
+    # resume path: everything is already there and gets hashed + skipped
+    results.append(_timed_restore(restore, backup_root, manifest, dest, workers[-1], size, "rerun"))
+
+    if args.json:
+        print(json.dumps({"files": files, "bytes": size, "snapshot_s": round(backup_s, 2),
+                          "blob_bytes": blob_bytes, "restores": results}, indent=1))
+        return
+    for r in results:
+        print(
+            f"[bench] restore {r['kind']:5} workers={r['workers']:<3} {r['seconds']}s "
+            f"{r['mib_per_s']} MiB/s errors={r['errors']}"
+        )
+
+
+def _timed_restore(restore, backup_root: Path, manifest: dict, dest: Path, workers: int, size: int, kind: str) -> dict:
+    t0 = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        errors = restore.restore_docs(backup_root, manifest, dest, workers, dry_run=False)
+    seconds = time.perf_counter() - t0
+    return {
+        "kind": kind,
+        "workers": workers,
+        "seconds": round(seconds, 2),
+        "mib_per_s": round(size / MIB / seconds, 1),
+        "errors": errors,
+    }
+
+
+if __name__ == "__main__":
+    main()
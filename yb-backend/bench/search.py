@@ -0,0 +1,144 @@
+# bench/search.py
+"""
+Global search at 1M rows: the FTS5 index vs the old leading-wildcard LIKE.
+
+Seeds --rows client notes (default 1M) over --clients clients with a Zipf
+word distribution (a few very common words, a long tail of rare ones, and a
+unique "refNNN" token per note), inserted through the index triggers. Then,
+for a handful of queries from very selective to very common, times:
+
+- fts admin:   app.search.search() as a global user
+- fts scoped:  the same, limited to 20 clients through a Principal
+- like top20:  lower(body) LIKE '%word%' ORDER BY id DESC LIMIT 20, i.e. what
+               the old ilike() filters did
+- like count:  the same predicate counted, i.e. a guaranteed full scan
+
+and finally 1000 single-row updates, each reindexed by the triggers.
+
+    python -m bench.search [--rows 1000000] [--repeat 5]
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import random
+import time
+
+from sqlalchemy import text
+
+from .common import summarize, use_temp_db
+
+COMMON = "payroll reconcile invoice vendor bank statement receipt tax quarter annual ledger journal accrual deposit refund payment credit debit transfer review".split()
+CHUNK = 50_000
+
+
+def vocabulary(size: int, rng: random.Random) -> tuple[list, list]:
+    """Words (common ones first) and Zipf cumulative weights."""
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = COMMON + ["".join(rng.choices(letters, k=rng.randint(4, 9))) for _ in range(size)]
+    return words, list(itertools.accumulate(1 / (i + 1) for i in range(len(words))))
+
+
+def main():
+    ap = argparse.ArgumentParser(description="FTS5 search vs LIKE on a large notes table")
+    ap.add_argument("--rows", type=int, default=1_000_000, help="client notes to index")
+    ap.add_argument("--clients", type=int, default=500)
+    ap.add_argument("--vocab", type=int, default=20_000, help="tail vocabulary size")
+    ap.add_argument("--repeat", type=int, default=5, help="timed runs per query")
+    ap.add_argument("--json", action="store_true")
+    args = ap.parse_args()
+
+    use_temp_db()
+    from app import models, search
+    from app.database import engine
+    from app.permissions import Principal
+
+    rng = random.Random(1)
+    words, cum = vocabulary(args.vocab, rng)
+    rare = words[len(COMMON) + args.vocab // 2]
+
+    with engine.begin() as conn:
+        first = (conn.execute(text("SELECT max(id) FROM clients")).scalar() or 0) + 1
+        conn.execute(models.Client.__table__.insert(), [
+            {"legal_name": f"Search Bench {i:04d}"} for i in range(args.clients)
+        ])
+    client_ids = list(range(first, first + args.clients))
+
+    t0 = time.perf_counter()
+    for start in range(0, args.rows, CHUNK):
+        rows = [
+            {
+                "client_id": rng.choice(client_ids),
+                "body": " ".join(rng.choices(words, cum_weights=cum, k=12)) + f" ref{n}",
+                "pinned": False,
+            }
+            for n in range(start, min(start + CHUNK, args.rows))
+        ]
+        with engine.begin() as conn:
+            conn.execute(models.ClientNote.__table__.insert(), rows)
+    insert_s = time.perf_counter() - t0
+    with engine.begin() as conn:
+        t0 = time.perf_counter()
+        conn.exec_driver_sql(f"INSERT INTO {search.TABLE}({search.TABLE}) VALUES('optimize')")
+        optimize_s = time.perf_counter() - t0
+    print(f"[bench] {args.rows} notes inserted through the index triggers in {insert_s:.1f}s, optimize {optimize_s:.1f}s")
+
+    principal = Principal(0, "bookkeeper", False, frozenset(client_ids[:20]), frozenset())
+    queries = {
+        "selective (ref id)": f"ref{args.rows * 7 // 9}",
+        "rare word": rare,
+        "common word": COMMON[0],
+        "two common words": f"{COMMON[0]} {COMMON[3]}",
+        "prefix": COMMON[12][:3],
+    }
+
+    def timed(fn) -> dict:
+        fn()
+        ms = []
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            fn()
+            ms.append((time.perf_counter() - t0) * 1000)
+        return summarize(ms)
+
+    results = {}
+    with engine.connect() as conn:
+        for label, q in queries.items():
+            like = {"like": f"%{q.split()[0].lower()}%"}
+            matches = conn.execute(
+                text(f"SELECT count(*) FROM {search.TABLE} WHERE {search.TABLE} MATCH :e"),
+                {"e": search.match_expression(q)},
+            ).scalar()
+            results[label] = {
+                "q": q,
+                "matches": matches,
+                "fts_admin": timed(lambda: search.search(conn, q, limit=20)),
+                "fts_scoped": timed(lambda: search.search(conn, q, principal=principal, limit=20)),
+                "like_top20": timed(lambda: conn.execute(
+                    text("SELECT id FROM client_notes WHERE lower(body) LIKE :like ORDER BY id DESC LIMIT 20"), like
+                ).all()),
+                "like_count": timed(lambda: conn.execute(
+                    text("SELECT count(*) FROM client_notes WHERE lower(body) LIKE :like"), like
+                ).scalar()),
+            }
+
+    t0 = time.perf_counter()
+    with engine.begin() as conn:
+        step = max(1, args.rows // 1000)
+        for note_id in range(1, args.rows + 1, step)[:1000]:
+            conn.execute(text("UPDATE client_notes SET body = body || ' edited' WHERE id = :i"), {"i": note_id})
+    update_ms = (time.perf_counter() - t0) * 1000
+
+    if args.json:
+        print(json.dumps({"rows": args.rows, "insert_s": round(insert_s, 1), "optimize_s": round(optimize_s, 1),
+                          "queries": results, "updates_1000_ms": round(update_ms)}, indent=1))
+        return
+    for label, r in results.items():
+        cols = " | ".join(f"{k} {r[k]['p50_ms']:>8.1f}ms" for k in ("fts_admin", "fts_scoped", "like_top20", "like_count"))
+        print(f"[bench] {label:18} {r['q']!r:22} matches={r['matches']:<7} {cols}")
+    print(f"[bench] 1000 single-row updates with reindexing: {update_ms:.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
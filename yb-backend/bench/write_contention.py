@@ -0,0 +1,174 @@
+# bench/write_contention.py
+"""
+Recurring runner vs concurrent API writes.
+
+Seeds --rules recurring rules that are --cycles runs behind, starts uvicorn on
+a scratch copy of the DB, then runs `python -m app.run_recurring` while
+--writers client threads keep creating and updating tasks through the API.
+Reports the runner's wall time and the writers' latency / error counts
+(a 500 here is almost always "database is locked").
+
+Each --profiles entry gets a fresh copy of the same seeded DB, e.g. the
+default WAL + busy_timeout profile against the old rollback journal:
+
+    python -m bench.write_contention --profiles wal,delete
+    python -m bench.write_contention --rules 10000 --cycles 12 --writers 8
+
+Profiles: wal (the default pragmas), delete (journal_mode=DELETE,
+synchronous=FULL, busy_timeout=0: roughly the pre-profile engine).
+"""
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+
+from .common import BACKEND_DIR, fmt, make_user, seed_rules, snapshot_db, summarize, token_for, use_temp_db
+
+PROFILES = {
+    "wal": {},
+    "delete": {
+        "YB_SQLITE_JOURNAL_MODE": "DELETE",
+        "YB_SQLITE_SYNCHRONOUS": "FULL",
+        "YB_SQLITE_BUSY_TIMEOUT_MS": "0",
+    },
+}
+
+
+def main():
+    ap = argparse.ArgumentParser(description="API write latency while the recurring runner works")
+    ap.add_argument("--rules", type=int, default=5000)
+    ap.add_argument("--cycles", type=int, default=12, help="missed runs per rule")
+    ap.add_argument("--writers", type=int, default=8, help="API writer threads")
+    ap.add_argument("--profiles", default="wal,delete", help=f"comma-separated: {', '.join(PROFILES)}")
+    ap.add_argument("--port", type=int, default=8767)
+    ap.add_argument("--json", action="store_true")
+    args = ap.parse_args()
+
+    profiles = [p.strip() for p in args.profiles.split(",") if p.strip()]
+    unknown = set(profiles) - set(PROFILES)
+    if unknown:
+        raise SystemExit(f"[bench] unknown profiles: {', '.join(sorted(unknown))}")
+
+    root = use_temp_db()
+    from app import loadtest, models
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        admin = make_user(db, "admin")
+        client_id = db.query(models.Client.id).order_by(models.Client.id).limit(1).scalar()
+        today = seed_rules(db, args.rules, args.cycles, random.Random(1), admin.id, client_id)
+        token = token_for(admin)
+    finally:
+        db.close()
+    template = snapshot_db(root / "seeded.db")
+
+    url = f"http://127.0.0.1:{args.port}"
+    base_env = dict(os.environ)
+    results = []
+    for name in profiles:
+        db_file = root / f"{name}.db"
+        db_file.write_bytes(template.read_bytes())
+        os.environ.clear()
+        os.environ.update(base_env, YB_DATABASE_URL=f"sqlite:///{db_file}", **PROFILES[name])
+
+        # failed writes are counted; their tracebacks would just bury the report
+        proc = loadtest.spawn_server(1, args.port, stderr=subprocess.DEVNULL)
+        try:
+            loadtest._wait_ready(url)
+            results.append({"profile": name, **contend(url, token, args.writers, today)})
+        finally:
+            loadtest.stop_server(proc)
+    os.environ.clear()
+    os.environ.update(base_env)
+
+    if args.json:
+        print(json.dumps(results, indent=1))
+        return
+    for r in results:
+        print(
+            f"[bench] {r['profile']}: runner {r['runner_s']}s "
+            f"{'created=' + str(r['created']) if r['runner_ok'] else 'FAILED'} | "
+            f"writes {r['writes_ok']} ok, {r['writes_failed']} failed ({r['writes_per_s']}/s) {fmt(r['latency'])}"
+        )
+
+
+def contend(url: str, token: str, writers: int, today) -> dict:
+    """Writers run from just before the runner starts until it exits."""
+    from app.loadtest import _Conn
+
+    headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
+    samples, failed = [], [0]
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    def writer(n: int):
+        conn, local, errors, task_id = _Conn(url), [], 0, None
+        i = 0
+        while not stop.is_set():
+            i += 1
+            if task_id is None or i % 2:
+                method, path = "POST", "/api/tasks/"
+                body = {"title": f"writer {n} task {i}", "status": "new", "task_type": "ad_hoc"}
+            else:
+                method, path = "PUT", f"/api/tasks/{task_id}"
+                body = {"status": "in_progress", "description": f"edit {i}"}
+            t0 = time.perf_counter()
+            try:
+                status, raw = conn.request(method, path, headers, json.dumps(body).encode())
+            except (OSError, http.client.HTTPException):
+                status, raw = 0, b""
+            if status in (200, 201):
+                local.append((time.perf_counter() - t0) * 1000)
+                if method == "POST":
+                    task_id = json.loads(raw)["id"]
+            else:
+                errors += 1
+        with lock:
+            samples.extend(local)
+            failed[0] += errors
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(writers)]
+    for t in threads:
+        t.start()
+    time.sleep(1.0)
+
+    started = time.perf_counter()
+    run = subprocess.run(
+        [sys.executable, "-m", "app.run_recurring", "--json", "--today", today.isoformat()],
+        cwd=BACKEND_DIR,
+        env=dict(os.environ),
+        capture_output=True,
+        text=True,
+    )
+    runner_s = time.perf_counter() - started
+    stop.set()
+    for t in threads:
+        t.join()
+    if run.returncode != 0:
+        errors = [line for line in run.stderr.splitlines() if "Error:" in line] or ["?"]
+        last = errors[-1].strip()
+        print(f"[bench] run_recurring exited {run.returncode}: {last[:300]}", file=sys.stderr)
+    out = json.loads(run.stdout.strip().splitlines()[-1]) if run.returncode == 0 else {}
+
+    elapsed = runner_s + 1.0
+    return {
+        "runner_s": round(runner_s, 2),
+        "runner_ok": run.returncode == 0,
+        "created": out.get("created"),
+        "writes_ok": len(samples),
+        "writes_failed": failed[0],
+        "writes_per_s": round(len(samples) / elapsed, 1),
+        "latency": summarize(samples),
+    }
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# tests/test_backup.py
+"""Nightly docs snapshots (app.backup_nightly) and restores (app.restore) on a scratch tree."""
+import os
+import stat
+from pathlib import Path
+
+from app import backup_nightly, restore
+
+
+def write(path: Path, data: bytes) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return path
+
+
+def test_files_deleted_mid_walk_are_skipped(tmp_path, monkeypatch):
+    docs = tmp_path / "docs"
+    kept = write(docs / "a" / "kept.pdf", b"kept")
+    gone = docs / "a" / "gone.pdf"  # listed by the walk, deleted before it is read
+    monkeypatch.setattr(backup_nightly, "_iter_docs", lambda root: iter([gone, kept]))
+
+    files, stats = backup_nightly.snapshot_docs(tmp_path / "backups", docs, None)
+
+    assert list(files) == ["a/kept.pdf"]
+    assert (stats["files"], stats["vanished"]) == (1, 1)
+
+
+def test_known_content_is_not_recompressed(tmp_path, monkeypatch):
+    docs, backups = tmp_path / "docs", tmp_path / "backups"
+    write(docs / "2025" / "statement.pdf", b"%PDF statement")
+    files, _ = backup_nightly.snapshot_docs(backups, docs, None)
+
+    # the same content under a new path (a folder rename) and re-touched
+    write(docs / "Tax" / "statement.pdf", b"%PDF statement")
+    compressed = []
+    real = backup_nightly.gzip.GzipFile
+    monkeypatch.setattr(backup_nightly.gzip, "GzipFile", lambda *a, **kw: compressed.append(1) or real(*a, **kw))
+
+    again, stats = backup_nightly.snapshot_docs(backups, docs, {"files": files})
+    assert again["Tax/statement.pdf"]["sha256"] == files["2025/statement.pdf"]["sha256"]
+    assert (stats["new_blobs"], compressed) == (0, [])
+
+    # a fresh upload whose recorded hash has no blob yet goes straight to gzip
+    new = write(docs / "Tax" / "new.pdf", b"%PDF new")
+    sha = backup_nightly.sha256_file(new)
+    _, stats = backup_nightly.snapshot_docs(backups, docs, {"files": again}, {"Tax/new.pdf": (sha, 8)})
+    assert (stats["new_blobs"], len(compressed)) == (1, 1)
+    assert backup_nightly.blob_path(backups, sha).exists()
+
+
+def test_restored_files_get_the_default_file_mode(tmp_path):
+    docs, backups = tmp_path / "docs", tmp_path / "backups"
+    write(docs / "a" / "statement.pdf", b"%PDF restore me")
+    files, _ = backup_nightly.snapshot_docs(backups, docs, None)
+
+    dest = tmp_path / "restored" / "a" / "statement.pdf"
+    assert restore._restore_file(backups, dest, files["a/statement.pdf"])[0] == "restored"
+    umask = os.umask(0)
+    os.umask(umask)
+    assert stat.S_IMODE(dest.stat().st_mode) == 0o666 & ~umask
@@ -0,0 +1,88 @@
+# tests/test_bulk_import.py
+"""Bulk imports (app.bulk / POST /api/admin/bulk/{entity}/import)."""
+from itertools import count
+
+import pytest
+
+from app import bulk, models
+
+_names = count(1)
+
+
+def csv_file(text: str):
+    return {"file": ("rows.csv", text.encode("utf-8"), "text/csv")}
+
+
+@pytest.fixture
+def client_row(db):
+    c = models.Client(legal_name=f"Bulk Access Co {next(_names)}")
+    db.add(c)
+    db.commit()
+    db.refresh(c)
+    return c
+
+
+def test_access_import_takes_effect_right_away(db, client, make_user, auth_header, client_row):
+    admin, user = make_user("admin"), make_user("bookkeeper")
+    url = f"/api/clients/{client_row.id}"
+    assert client.get(url, headers=auth_header(user)).status_code == 403  # principal now cached
+
+    r = client.post(
+        "/api/admin/bulk/client_user_access/import",
+        files=csv_file(f"client,user,access_level\n{client_row.legal_name},{user.email},bookkeeper\n"),
+        headers=auth_header(admin),
+    )
+    assert r.status_code == 200 and r.json()["created"] == 1, r.text
+    assert client.get(url, headers=auth_header(user)).status_code == 200
+
+
+def test_cli_path_clears_cached_access_too(db, client, make_user, auth_header, client_row):
+    user = make_user("bookkeeper")
+    url = f"/api/clients/{client_row.id}"
+    assert client.get(url, headers=auth_header(user)).status_code == 403
+
+    result = bulk.import_rows(db, "clients", [(2, {"legal_name": client_row.legal_name, "bookkeeper_id": user.id})])
+    assert result.updated == 1 and result.access_changed
+    assert client.get(url, headers=auth_header(user)).status_code == 200
+
+
+def import_users(client, admin, auth_header, text):
+    r = client.post("/api/admin/bulk/users/import", files=csv_file(text), headers=auth_header(admin))
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+def test_users_rows_get_the_users_api_checks(db, client, make_user, auth_header):
+    admin = make_user("admin")
+    manager, bookkeeper = make_user("manager"), make_user("bookkeeper")
+    n = next(_names)
+
+    out = import_users(client, admin, auth_header, (
+        "email,name,role,manager\n"
+        f"  New.Person{n}@Example.com ,New Person,Bookkeeper,{manager.email}\n"
+        f"bad-role{n}@example.com,Bad Role,superuser,\n"
+        f"not-a-manager{n}@example.com,Wrong Manager,bookkeeper,{bookkeeper.email}\n"
+        f"{bookkeeper.email},{bookkeeper.name},admin,{manager.email}\n"
+    ))
+    assert (out["created"], out["updated"], out["failed"]) == (1, 1, 2)
+    errors = {e["line"]: e["error"] for e in out["errors"]}
+    assert "role" in errors[3] and "manager_id" in errors[4]
+
+    created = db.query(models.User).filter(models.User.email == f"new.person{n}@example.com").one()
+    assert (created.role, created.manager_id) == ("bookkeeper", manager.id)
+    db.refresh(bookkeeper)
+    # promoted away from bookkeeper: the manager link is dropped, as in update_user
+    assert (bookkeeper.role, bookkeeper.manager_id) == ("admin", None)
+
+
+def test_users_import_cannot_lock_out_the_importer(db, client, make_user, auth_header):
+    admin = make_user("admin")
+    out = import_users(client, admin, auth_header, (
+        "email,name,role,is_active\n"
+        f"{admin.email},{admin.name},bookkeeper,true\n"
+        f"{admin.email.upper()},{admin.name},admin,false\n"
+    ))
+    # the second row supersedes the first (same normalized email) and is refused
+    assert (out["updated"], out["duplicates"], out["failed"]) == (0, 1, 1)
+    db.refresh(admin)
+    assert (admin.role, admin.is_active) == ("admin", True)
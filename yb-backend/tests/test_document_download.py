@@ -0,0 +1,81 @@
+# tests/test_document_download.py
+"""GET /api/documents/{id}/download: ranges, validators and conditional requests."""
+import os
+
+import pytest
+
+from app import models
+
+DATA = os.urandom(200_000)
+
+
+@pytest.fixture
+def download(db, client, make_user, auth_header):
+    """(url, headers) for a freshly uploaded statement owned by a new owner user."""
+    owner = make_user("owner")
+    c = models.Client(legal_name="Download Test Co")
+    db.add(c)
+    db.commit()
+    a = models.Account(client_id=c.id, name="Checking")
+    db.add(a)
+    db.commit()
+
+    headers = auth_header(owner)
+    r = client.post(
+        "/api/documents/upload",
+        data={"client_id": c.id, "account_id": a.id, "statement_date": "2026-01-31"},
+        files={"file": ("statement.pdf", DATA, "application/pdf")},
+        headers=headers,
+    )
+    assert r.status_code in (200, 201), r.text
+    return f"/api/documents/{r.json()['id']}/download", headers
+
+
+def test_full_download(client, download):
+    url, headers = download
+    r = client.get(url, headers=headers)
+    assert r.status_code == 200
+    assert r.content == DATA
+    assert r.headers["content-type"].startswith("application/pdf")
+    assert r.headers["accept-ranges"] == "bytes"
+    assert r.headers["etag"]
+
+
+def test_range_returns_206(client, download):
+    url, headers = download
+    r = client.get(url, headers={**headers, "Range": "bytes=1000-1999"})
+    assert r.status_code == 206
+    assert r.headers["content-range"] == f"bytes 1000-1999/{len(DATA)}"
+    assert r.content == DATA[1000:2000]
+
+    r = client.get(url, headers={**headers, "Range": "bytes=-100"})
+    assert r.status_code == 206
+    assert r.content == DATA[-100:]
+
+
+def test_unsatisfiable_range_returns_416(client, download):
+    url, headers = download
+    r = client.get(url, headers={**headers, "Range": f"bytes={len(DATA) + 10}-"})
+    assert r.status_code == 416
+    assert r.headers["content-range"].endswith(f"*/{len(DATA)}")
+
+
+def test_if_none_match_returns_304(client, download):
+    url, headers = download
+    etag = client.get(url, headers=headers).headers["etag"]
+
+    r = client.get(url, headers={**headers, "If-None-Match": etag})
+    assert r.status_code == 304
+    assert r.content == b""
+    assert r.headers["etag"] == etag
+
+    r = client.get(url, headers={**headers, "If-None-Match": '"something-else"'})
+    assert r.status_code == 200
+    assert r.content == DATA
+
+
+def test_if_range_with_stale_etag_sends_whole_file(client, download):
+    url, headers = download
+    r = client.get(url, headers={**headers, "Range": "bytes=0-9", "If-Range": '"stale"'})
+    assert r.status_code == 200
+    assert r.content == DATA
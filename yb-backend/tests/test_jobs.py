@@ -0,0 +1,89 @@
+# tests/test_jobs.py
+"""Job queue: report_progress doubles as the running job's heartbeat."""
+from datetime import datetime, timedelta
+
+from app import jobs, models
+
+seen = {}
+
+
+@jobs.job_handler("test.heartbeat")
+def _heartbeat_handler(db, payload):
+    job_id = payload["job_id"]
+    db.query(models.Job).filter(models.Job.id == job_id).update(
+        {models.Job.locked_at: datetime.utcnow() - timedelta(hours=1)}, synchronize_session=False
+    )
+    db.commit()
+    seen["held"] = jobs.report_progress(job_id, {"step": 1})
+    seen["locked_at"] = db.query(models.Job.locked_at).filter(models.Job.id == job_id).scalar()
+
+    # the job went stale and another worker took it over
+    db.query(models.Job).filter(models.Job.id == job_id).update(
+        {models.Job.locked_by: "other-host:1"}, synchronize_session=False
+    )
+    db.commit()
+    seen["held_after_takeover"] = jobs.report_progress(job_id, {"step": 2})
+    return {"done": True}
+
+
+def test_report_progress_refreshes_locked_at_for_the_holder(db):
+    job = jobs.enqueue(db, "test.heartbeat")
+    db.commit()
+
+    started = datetime.utcnow() - timedelta(seconds=1)
+    assert jobs.claim_next(db, "this-host:1") == job.id
+    assert jobs.run_job(job.id, "this-host:1") == "succeeded"
+
+    assert seen["held"] is True
+    assert seen["locked_at"] >= started
+    assert seen["held_after_takeover"] is False
+    db.refresh(job)
+    assert job.result == {"done": True}
+
+
+def test_dedupe_only_against_unfinished_jobs(db):
+    first = jobs.enqueue(db, "test.dedupe", dedupe_key="test.dedupe:1")
+    db.commit()
+    assert jobs.enqueue(db, "test.dedupe", dedupe_key="test.dedupe:1").id == first.id
+
+    first.status = "succeeded"
+    db.commit()
+    second = jobs.enqueue(db, "test.dedupe", dedupe_key="test.dedupe:1")
+    db.commit()
+    db.refresh(first)
+    assert second.id != first.id and second.status == "queued"
+    assert (first.dedupe_key, second.dedupe_key) == (None, "test.dedupe:1")
+
+
+@jobs.job_handler("test.count_runs")
+def _count_runs_handler(db, payload):
+    seen["runs"] = seen.get("runs", 0) + 1
+    return {"runs": seen["runs"]}
+
+
+def test_run_job_leaves_a_job_claimed_by_another_worker_alone(db):
+    seen["runs"] = 0
+    job = jobs.enqueue(db, "test.count_runs")
+    db.commit()
+    # a worker claims it between the enqueue commit and the inline run
+    assert jobs._claim(db, job.id, "worker-host:1", datetime.utcnow())
+    db.commit()
+
+    assert jobs.run_job(job.id, "inline:api-host:2") == "running"
+    assert jobs.run_job(job.id) == "running"
+    assert seen["runs"] == 0
+
+    assert jobs.run_job(job.id, "worker-host:1") == "succeeded"
+    assert seen["runs"] == 1
+    # finished: nobody runs it again
+    assert jobs.run_job(job.id, "worker-host:1") == "succeeded"
+    assert seen["runs"] == 1
+
+
+def test_inline_run_claims_a_queued_job_conditionally(db):
+    seen["runs"] = 0
+    job = jobs.enqueue(db, "test.count_runs")
+    db.commit()
+    assert jobs.run_job(job.id, "inline:api-host:2") == "succeeded"
+    db.refresh(job)
+    assert (job.attempts, seen["runs"]) == (1, 1)
@@ -0,0 +1,34 @@
+# tests/test_purge.py
+"""Client purge (app.purge): what it leaves behind for the next client."""
+from app import jobs, models
+from app.purge import purge_client_rows
+
+
+def new_client(db, name: str) -> models.Client:
+    c = models.Client(legal_name=name)
+    db.add(c)
+    db.commit()
+    return c
+
+
+def test_purged_client_id_reused_gets_provisioned_again(db):
+    first = new_client(db, "Purge Reuse Old Co")
+    old_id = first.id
+    job = jobs.enqueue_client_provisioning(db, first, None)
+    db.commit()
+    assert jobs.run_job(job.id, "test-host:1") == "succeeded"
+
+    purge_client_rows(db, old_id)
+    db.commit()
+    db.refresh(job)
+    assert (job.client_id, job.dedupe_key) == (None, None)  # kept as history only
+
+    # clients.id isn't AUTOINCREMENT: the newest client's id comes back
+    second = new_client(db, "Purge Reuse New Co")
+    assert second.id == old_id
+
+    again = jobs.enqueue_client_provisioning(db, second, None)
+    db.commit()
+    assert again.id != job.id and again.status == "queued"
+    assert jobs.run_job(again.id, "test-host:1") == "succeeded"
+    assert db.query(models.RecurringTask).filter(models.RecurringTask.client_id == second.id).count() > 0
@@ -0,0 +1,99 @@
+# tests/test_recurring_equivalence.py
+"""
+The memoized recurring date math must give exactly the old answers.
+
+Seeded random sweeps compare app.recurring_utils against the frozen
+pre-memoization copy in _recurring_baseline.py, including the odd inputs
+real rows contain (day 0/31+/negative, a 5th or "-2nd" weekday, unknown or
+badly cased schedule types, weekday without week_of_month).
+"""
+import random
+from datetime import date, timedelta
+
+import pytest
+
+import _recurring_baseline as baseline
+from app import recurring_utils as current
+
+SEEDS = [1, 2, 3, 4, 5]
+CASES_PER_SEED = 4000
+
+SCHEDULES = ["monthly", "quarterly", "annual", "Monthly ", "QUARTERLY", "weird", "", None]
+
+
+def random_date(rng: random.Random) -> date:
+    return date(1990, 1, 1) + timedelta(days=rng.randint(0, 365 * 60))
+
+
+def random_rule(rng: random.Random) -> dict:
+    kind = rng.randrange(6)
+    if kind == 0:
+        return {}
+    if kind == 1:
+        return {"day_of_month": rng.randint(-3, 40)}
+    if kind == 2:
+        return {"weekday": rng.randint(0, 6), "week_of_month": rng.choice([1, 2, 3, 4, 5, -1, -2, 0])}
+    if kind == 3:
+        # day_of_month wins over weekday rules
+        return {"day_of_month": rng.randint(1, 31), "weekday": rng.randint(0, 6), "week_of_month": 2}
+    if kind == 4:
+        return {"weekday": rng.choice([None, 0, 4]), "week_of_month": rng.choice([None, 3])}
+    return {"day_of_month": rng.choice([None, 0, 29, 30, 31])}
+
+
+def baseline_occurrences(schedule, next_run, start, end, kw):
+    """What the forecast produced before occurrences() existed."""
+    first = next_run or baseline.next_run_from(schedule, start, **kw)
+    return [d for d in baseline.occurrences_between(schedule, first, end, **kw) if d >= start]
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_advance_next_run_matches_baseline(seed):
+    rng = random.Random(seed)
+    for _ in range(CASES_PER_SEED):
+        schedule, d, kw = rng.choice(SCHEDULES), random_date(rng), random_rule(rng)
+        assert current.advance_next_run(schedule, d, **kw) == baseline.advance_next_run(schedule, d, **kw), (
+            schedule, d, kw,
+        )
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_next_run_from_matches_baseline(seed):
+    rng = random.Random(seed)
+    for _ in range(CASES_PER_SEED):
+        schedule, d, kw = rng.choice(SCHEDULES), random_date(rng), random_rule(rng)
+        assert current.next_run_from(schedule, d, **kw) == baseline.next_run_from(schedule, d, **kw), (
+            schedule, d, kw,
+        )
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_occurrences_match_baseline(seed):
+    rng = random.Random(seed)
+    for _ in range(CASES_PER_SEED // 10):
+        schedule, kw = rng.choice(SCHEDULES), random_rule(rng)
+        start = random_date(rng)
+        end = start + timedelta(days=rng.randint(0, 3 * 366))
+        next_run = rng.choice([
+            None,
+            start - timedelta(days=rng.randint(0, 400)),
+            start + timedelta(days=rng.randint(0, 200)),
+        ])
+        # a rule's next_run is always one of its own run dates
+        if next_run is not None:
+            next_run = baseline.next_run_from(schedule, next_run, **kw)
+
+        spec = current.RuleSpec(schedule, kw.get("day_of_month"), kw.get("weekday"), kw.get("week_of_month"), next_run)
+        expected = baseline_occurrences(schedule, next_run, start, end, kw)
+        assert list(current.occurrences(spec, start, end)) == expected, (schedule, kw, next_run, start, end)
+
+        if next_run is not None:
+            assert current.occurrences_between(schedule, next_run, end, **kw) == baseline.occurrences_between(
+                schedule, next_run, end, **kw
+            )
+
+
+def test_last_day_of_month_matches_baseline():
+    for year in range(1900, 2200):
+        for month in range(1, 13):
+            assert current.last_day_of_month(year, month) == baseline.last_day_of_month(year, month)
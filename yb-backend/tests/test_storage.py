@@ -0,0 +1,19 @@
+# tests/test_storage.py
+"""Streaming uploads to disk (app.storage.save_upload_stream)."""
+import hashlib
+import io
+import os
+import stat
+
+from app import storage
+
+
+def test_stored_upload_gets_the_default_file_mode(tmp_path):
+    dest = tmp_path / "client" / "010125.pdf"
+    size, sha = storage.save_upload_stream(io.BytesIO(b"%PDF upload"), dest)
+
+    assert (size, sha) == (11, hashlib.sha256(b"%PDF upload").hexdigest())
+    umask = os.umask(0)
+    os.umask(umask)
+    assert stat.S_IMODE(dest.stat().st_mode) == 0o666 & ~umask
+    assert [p.name for p in dest.parent.iterdir()] == ["010125.pdf"]
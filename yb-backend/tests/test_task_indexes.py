@@ -0,0 +1,101 @@
+# tests/test_task_indexes.py
+"""
+The hot task queries must be index seeks, not full scans of tasks.
+
+Each test runs the real code path, records the SQL it sends, and checks
+EXPLAIN QUERY PLAN for every statement that reads the tasks table.
+"""
+import re
+from contextlib import contextmanager
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event
+
+from app import models
+from app.database import engine
+from app.onboarding import release_onboarding_tasks_if_ready
+from app.run_recurring import _existing_pairs
+
+READS_TASKS = re.compile(r"\bFROM tasks\b")
+
+
+@contextmanager
+def task_statements():
+    """Collects (sql, params) for every statement that reads tasks."""
+    seen = []
+
+    def listener(conn, cursor, statement, parameters, context, executemany):
+        if READS_TASKS.search(statement) and not statement.startswith("EXPLAIN"):
+            seen.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        yield seen
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+
+def query_plans(statements):
+    with engine.connect() as conn:
+        return [
+            [row[3] for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + sql, params)]
+            for sql, params in statements
+        ]
+
+
+def assert_indexed(statements, index_prefix):
+    assert statements, "no query on tasks was captured"
+    for plan in query_plans(statements):
+        scans = [step for step in plan if re.match(r"SCAN tasks\b(?! USING)", step)]
+        assert not scans, f"full scan of tasks: {plan}"
+        assert any(index_prefix in step for step in plan), f"{index_prefix} not used: {plan}"
+
+
+@pytest.fixture
+def client_row(db):
+    c = models.Client(legal_name="Index Test Co")
+    db.add(c)
+    db.commit()
+    db.refresh(c)
+    return c
+
+
+def test_list_tasks(client, make_user, auth_header):
+    user = make_user()
+    with task_statements() as seen:
+        r = client.get("/api/tasks/?limit=50", headers=auth_header(user))
+    assert r.status_code == 200
+    assert_indexed(seen, "ix_tasks_assignee_created")
+    # the index provides the keyset order; no sort of the matching rows
+    assert not any("TEMP B-TREE" in step for plan in query_plans(seen) for step in plan)
+
+
+def test_my_dashboard(client, make_user, auth_header):
+    user = make_user()
+    for path in ("/api/tasks/my-dashboard", "/api/tasks/my-dashboard?counts_only=true"):
+        with task_statements() as seen:
+            r = client.get(path, headers=auth_header(user))
+        assert r.status_code == 200
+        assert_indexed(seen, "ix_tasks_assignee_")
+
+
+def test_list_tasks_for_client(client, make_user, auth_header, client_row):
+    owner = make_user("owner")
+    with task_statements() as seen:
+        r = client.get(f"/api/tasks/client/{client_row.id}", headers=auth_header(owner))
+    assert r.status_code == 200
+    assert_indexed(seen, "ix_tasks_client_type_status")
+    assert any("ix_task_client_links_client_id" in step for plan in query_plans(seen) for step in plan)
+
+
+def test_release_onboarding_tasks_if_ready(db, client_row):
+    with task_statements() as seen:
+        release_onboarding_tasks_if_ready(db, client_row.id, commit=False)
+    assert_indexed(seen, "ix_tasks_client_type_status")
+
+
+def test_run_recurring_existing_pairs(db):
+    with task_statements() as seen:
+        _existing_pairs(db, [1, 2, 3], datetime(2026, 1, 1), datetime(2026, 12, 31))
+    assert_indexed(seen, "ix_tasks_recurring_due")
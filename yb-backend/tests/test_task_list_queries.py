@@ -0,0 +1,99 @@
+# tests/test_task_list_queries.py
+"""
+Listing tasks costs a fixed number of statements, however many tasks come
+back (no per-row lookups for linked_client_ids or the assignee).
+"""
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from app import models
+from app.database import engine
+
+N = 5
+
+
+@contextmanager
+def count_statements():
+    counter = {"n": 0}
+
+    def listener(conn, cursor, statement, parameters, context, executemany):
+        counter["n"] += 1
+
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+
+@pytest.fixture
+def clients(db):
+    rows = [models.Client(legal_name=f"Query Count Co {i}") for i in range(2)]
+    db.add_all(rows)
+    db.commit()
+    return rows
+
+
+def add_tasks(db, user, clients, n):
+    """n intercompany tasks for user (None: unassigned), each linked to every client."""
+    for i in range(n):
+        task = models.Task(
+            title=f"task {i}",
+            status="new",
+            task_type="ad_hoc",
+            assigned_user_id=user.id if user else None,
+            client_id=clients[0].id,
+            is_intercompany=True,
+        )
+        task.client_links = [models.TaskClientLink(client_id=c.id) for c in clients]
+        db.add(task)
+    db.commit()
+
+
+def statements_for(client, path, headers, expected_rows):
+    with count_statements() as counter:
+        r = client.get(path, headers=headers)
+    assert r.status_code == 200
+    body = r.json()
+    assert len(body) == expected_rows
+    ours = [t for t in body if t["is_intercompany"]]
+    assert ours and all(len(t["linked_client_ids"]) == 2 for t in ours)
+    return counter["n"]
+
+
+@pytest.mark.parametrize("path", ["/api/tasks/", "/api/tasks/?limit=500"])
+def test_list_tasks_statement_count_is_constant(db, client, make_user, auth_header, clients, path):
+    small, large = make_user(), make_user()
+    add_tasks(db, small, clients, N)
+    add_tasks(db, large, clients, 10 * N)
+
+    few = statements_for(client, path, auth_header(small), N)
+    many = statements_for(client, path, auth_header(large), 10 * N)
+    assert many == few
+
+
+def test_unassigned_tasks_statement_count_is_constant(db, client, make_user, auth_header, clients):
+    headers = auth_header(make_user("owner"))
+    path = "/api/tasks/unassigned"
+    # the list is global: count on top of whatever unassigned tasks exist
+    base = len(client.get(path, headers=headers).json())
+
+    add_tasks(db, None, clients, N)
+    few = statements_for(client, path, headers, base + N)
+    add_tasks(db, None, clients, 9 * N)
+    many = statements_for(client, path, headers, base + 10 * N)
+    assert many == few
+
+
+def test_client_tasks_statement_count_is_constant(db, client, make_user, auth_header, clients):
+    user = make_user()
+    headers = auth_header(make_user("owner"))
+    path = f"/api/tasks/client/{clients[1].id}"  # reached through the links only
+
+    add_tasks(db, user, clients, N)
+    few = statements_for(client, path, headers, N)
+    add_tasks(db, user, clients, 9 * N)
+    many = statements_for(client, path, headers, 10 * N)
+    assert many == few
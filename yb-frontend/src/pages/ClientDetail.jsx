@@ -68,8 +68,8 @@ export default function ClientDetail() {
 		try {
 			const [clientRes, usersRes, contactsRes] = await Promise.all([
 				api.get(`/clients/${id}`),
-				api.get("/users"),
-				api.get("/contacts"),
+				api.get("/users", { params: { fields: "id,name,email,role" } }),
+				api.get("/contacts", { params: { fields: "id,name,email,phone" } }),
 			]);
 			setClient(clientRes.data);
 			setUsers(usersRes.data);
@@ -44,7 +44,10 @@ export default function Tasks() {
 
 	const loadClients = async () => {
 		try {
-			const res = await api.get("/clients");
+			// dropdown only needs ids + names
+			const res = await api.get("/clients", {
+				params: { fields: "id,legal_name,dba_name" },
+			});
 			const list = res.data || [];
 			setClients(list);
 
@@ -2,6 +2,9 @@
 import { useEffect, useMemo, useState } from "react";
 import api from "../../api/client";
 
+// The audit endpoint caps a page at this many rows; more come via X-Next-Cursor
+const MAX_PAGE_SIZE = 500;
+
 const ENTITY_TYPES = [
 	{ value: "", label: "All entity types" },
 	{ value: "client", label: "Client" },
@@ -24,6 +27,9 @@ export default function AdminAudit() {
 	const [loading, setLoading] = useState(true);
 	const [error, setError] = useState("");
 	const [events, setEvents] = useState([]);
+	const [nextCursor, setNextCursor] = useState(null);
+	const [pageQuery, setPageQuery] = useState("");
+	const [loadingMore, setLoadingMore] = useState(false);
 
 	const [usersLoading, setUsersLoading] = useState(true);
 	const [users, setUsers] = useState([]);
@@ -58,7 +64,8 @@ export default function AdminAudit() {
 		if (entityType) params.set("entity_type", entityType);
 
 		const lim = Number(limit);
-		if (!Number.isNaN(lim) && lim > 0) params.set("limit", String(lim));
+		if (!Number.isNaN(lim) && lim > 0)
+			params.set("limit", String(Math.min(lim, MAX_PAGE_SIZE)));
 
 		return params.toString();
 	};
@@ -83,17 +90,39 @@ export default function AdminAudit() {
 		try {
 			const qs = buildQuery();
 			const res = await api.get(`/admin/audit${qs ? `?${qs}` : ""}`);
+			setPageQuery(qs);
 			setEvents(res.data || []);
+			setNextCursor(res.headers?.["x-next-cursor"] || null);
 		} catch (e) {
 			console.error(e);
 			setError(
 				"Failed to load audit events. (Check /admin/audit backend route)"
 			);
 			setEvents([]);
+			setNextCursor(null);
 		} finally {
 			setLoading(false);
 		}
 	};
+
+	// Next page with the filters of the last Apply, appended below what's shown
+	const loadMore = async () => {
+		if (!nextCursor) return;
+		setLoadingMore(true);
+		setError("");
+		try {
+			const params = new URLSearchParams(pageQuery);
+			params.set("cursor", nextCursor);
+			const res = await api.get(`/admin/audit?${params.toString()}`);
+			setEvents((prev) => [...prev, ...(res.data || [])]);
+			setNextCursor(res.headers?.["x-next-cursor"] || null);
+		} catch (e) {
+			console.error(e);
+			setError("Failed to load more audit events.");
+		} finally {
+			setLoadingMore(false);
+		}
+	};
 	useEffect(() => {
 		// Initial load
 		loadUsers();
@@ -213,12 +242,12 @@ export default function AdminAudit() {
 
 					<div className="space-y-1">
 						<div className="text-[11px] uppercase tracking-[0.14em] text-slate-500">
-							Limit
+							Page size
 						</div>
 						<input
 							type="number"
 							min={1}
-							max={1000}
+							max={MAX_PAGE_SIZE}
 							value={limit}
 							onChange={(e) => setLimit(e.target.value)}
 							className="w-full border border-slate-300 rounded-md px-3 py-2 text-xs focus:outline-none focus:ring-1 focus:ring-yecny-primary-soft focus:border-yecny-primary"
@@ -248,7 +277,9 @@ export default function AdminAudit() {
 			<div className="rounded-xl border border-slate-200 bg-white/80 overflow-hidden">
 				<div className="flex items-center justify-between px-4 py-3 border-b border-slate-200">
 					<div className="text-xs text-slate-600">
-						{loading ? "Loading..." : `${events.length} event(s)`}
+						{loading
+							? "Loading..."
+							: `${events.length} event(s)${nextCursor ? " (more available)" : ""}`}
 					</div>
 					<button
 						type="button"
@@ -360,6 +391,19 @@ export default function AdminAudit() {
 						</tbody>
 					</table>
 				</div>
+
+				{!loading && nextCursor && (
+					<div className="px-4 py-3 border-t border-slate-200 text-center">
+						<button
+							type="button"
+							onClick={loadMore}
+							className="px-3 py-2 rounded-md border border-slate-300 bg-white text-xs text-slate-700 hover:bg-slate-50 disabled:opacity-60"
+							disabled={loadingMore}
+						>
+							{loadingMore ? "Loading..." : "Load more"}
+						</button>
+					</div>
+				)}
 			</div>
 			<div className="text-[11px] text-slate-500">
 				Note: This is intended to be append-only. Later versions may add